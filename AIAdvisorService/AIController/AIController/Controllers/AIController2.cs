@@ -1,5 +1,6 @@
 ﻿using AIManager;
 using AIModel;
+using Microsoft.AspNetCore.Http.Features;
 using Microsoft.AspNetCore.Mvc;
 
 namespace AIConsultingServer.Controllers;
@@ -28,4 +29,19 @@ public class AIController : ControllerBase
         var answer = await _aiService.GetAnswerAsync(query);
         return Ok(answer);
     }
+
+    // Streams the answer as plain text chunks while it is generated.
+    // The request is aborted (and generation cancelled) when the client disconnects.
+    [HttpGet("AI-advice-stream/{query}")]
+    public async Task StreamAnswer(string query, CancellationToken cancellationToken)
+    {
+        Response.ContentType = "text/plain; charset=utf-8";
+        HttpContext.Features.Get<IHttpResponseBodyFeature>()?.DisableBuffering();
+
+        await foreach (var token in _aiService.StreamAnswerAsync(query, cancellationToken))
+        {
+            await Response.WriteAsync(token, cancellationToken);
+            await Response.Body.FlushAsync(cancellationToken);
+        }
+    }
 }
\ No newline at end of file
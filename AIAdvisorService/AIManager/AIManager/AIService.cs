@@ -2,6 +2,7 @@
 using Azure;
 using Microsoft.Extensions.Options;
 using System.Net.Http.Json;
+using System.Runtime.CompilerServices;
 using System.Text;
 using System.Text.Json;
 using System.Text.Json.Serialization;
@@ -58,4 +59,33 @@ public class AIService : IAIService
             return $"Error getting answer: {ex.Message}";
         }
     }
+
+    public async IAsyncEnumerable<string> StreamAnswerAsync(string query,
+        [EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        string ragPrompt;
+        string? error = null;
+        try
+        {
+            var questionEmbedding = await ollamaMistralEmbedding.QueryEmbedding(query);
+            var queryResult = await chromaDBStore.ChromaQueryGetNearestNeighbors(questionEmbedding);
+            var context = string.Join("\n", queryResult.Documents[0]);
+            ragPrompt = $"Context: {context}\nQuestion: {query}\nAnswer:";
+        }
+        catch (Exception ex)
+        {
+            ragPrompt = string.Empty;
+            error = $"Error getting answer: {ex.Message}";
+        }
+
+        // Same as GetAnswerAsync, a failure before the answer starts is returned as the answer text
+        if (error != null)
+        {
+            yield return error;
+            yield break;
+        }
+
+        await foreach (var token in ollamaMistralEmbedding.StreamAdvisorAsync(ragPrompt, cancellationToken))
+            yield return token;
+    }
 }
\ No newline at end of file
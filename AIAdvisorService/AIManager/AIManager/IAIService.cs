@@ -6,4 +6,5 @@ public interface IAIService
 {
     Task<string> EmbeddingDocumentAsync(string filePath);
     Task<string> GetAnswerAsync(string query);
+    IAsyncEnumerable<string> StreamAnswerAsync(string query, CancellationToken cancellationToken = default);
 }
\ No newline at end of file
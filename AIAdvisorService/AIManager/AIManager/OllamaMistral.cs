@@ -1,4 +1,5 @@
 ﻿using AIModel;
+using System.Runtime.CompilerServices;
 using System.Text;
 using System.Text.Json;
 using Microsoft.Extensions.Options;
@@ -109,5 +110,48 @@ internal class OllamaMistral
 
         return result?.Response ?? "No response from AI";
     }
+
+    public async IAsyncEnumerable<string> StreamAdvisorAsync(string query,
+        [EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        var answerRequest = new
+        {
+            model = "phi3:mini",
+            prompt = query,
+            stream = true
+        };
+
+        var jsonRequest = JsonSerializer.Serialize(answerRequest);
+        using var request = new HttpRequestMessage(HttpMethod.Post, $"{OllamaEndpoint}generate")
+        {
+            Content = new StringContent(jsonRequest, Encoding.UTF8, "application/json")
+        };
+
+        // Read the body as it is generated instead of waiting for the whole answer
+        using var answerResponse = await _httpClient.SendAsync(request, HttpCompletionOption.ResponseHeadersRead, cancellationToken);
+
+        if (!answerResponse.IsSuccessStatusCode)
+        {
+            throw new Exception($"Ollama API Error: {answerResponse.StatusCode}");
+        }
+
+        // Ollama streams one JSON object per line, each holding the next piece of the answer
+        using var stream = await answerResponse.Content.ReadAsStreamAsync(cancellationToken);
+        using var reader = new StreamReader(stream, Encoding.UTF8);
+        var options = new JsonSerializerOptions { PropertyNameCaseInsensitive = true };
+
+        string? line;
+        while ((line = await reader.ReadLineAsync(cancellationToken)) != null)
+        {
+            if (string.IsNullOrWhiteSpace(line))
+                continue;
+
+            var chunk = JsonSerializer.Deserialize<AIResponse>(line, options);
+            if (!string.IsNullOrEmpty(chunk?.Response))
+                yield return chunk.Response;
+            if (chunk?.Done == true)
+                yield break;
+        }
+    }
 }
 
@@ -3,6 +3,7 @@
     public class AIResponse
     {
         public string Response { get; set; } // טקסט התשובה
+        public bool Done { get; set; } // true on the last chunk of a streamed answer
     }
 
 }
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Time the chart indicators on long daily histories, computed in full and
+extended by one appended bar through the IndicatorCache
+
+Run from the ClientSide folder:
+    python benchmarks/indicators_benchmark.py [years]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.indicators import INDICATORS, IndicatorCache
+from models.records import PriceSeries
+
+
+def make_series(n_bars, rng):
+    """Random walk with OHLCV columns, one bar per day"""
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_bars)))
+    dates = (np.datetime64("1990-01-01") + np.arange(n_bars)).astype("datetime64[s]")
+    return PriceSeries("BENCH", dates, close, close, close * 1.01, close * 0.99,
+                       rng.integers(1_000, 100_000, n_bars).astype(float))
+
+
+def truncated(series, n_bars):
+    return PriceSeries(series.symbol, series.dates[:n_bars], series.close[:n_bars], series.open[:n_bars],
+                       series.high[:n_bars], series.low[:n_bars], series.volume[:n_bars])
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_bars = years * 252
+    series = make_series(n_bars + 1, np.random.default_rng(1))
+    before = truncated(series, n_bars)
+
+    print(f"{years} years, {n_bars} bars")
+    print(f"{'':<20} {'full':>12} {'+1 bar':>12}")
+    for label, spec in INDICATORS.items():
+        cache = IndicatorCache()
+        started = time.perf_counter()
+        cache.get(before, 0, spec)
+        full = time.perf_counter() - started
+        started = time.perf_counter()
+        cache.get(series, 0, spec)
+        appended = time.perf_counter() - started
+        print(f"{label:<20} {full * 1000:9.3f} ms {appended * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare the dict based history/transaction handling with the typed records,
+and whole-body JSON decoding with the streamed decode
+
+Run from the ClientSide folder:
+    python benchmarks/records_benchmark.py [points]
+"""
+import datetime
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.portfolio_analytics import analyze_transactions
+from models.records import PriceSeries, TransactionTable
+from utils.json_decode import JSON_BACKEND, loads
+
+
+def make_history(n_points):
+    """Items shaped like the gateway's stock-history response"""
+    start = datetime.datetime(2000, 1, 3)
+    price = 100.0
+    items = []
+    for i in range(n_points):
+        price *= 1.0 + random.gauss(0.0, 0.01)
+        items.append({"date": (start + datetime.timedelta(days=i)).isoformat(), "closePrice": round(price, 2)})
+    return items
+
+
+def make_transactions(n_transactions):
+    symbols = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "AMD"]
+    return [{
+        "id": i,
+        "stockSymbol": random.choice(symbols),
+        "quantity": random.randint(1, 20),
+        "price": round(random.uniform(50, 500), 2),
+        "transactionType": random.choice(["Buy", "Buy", "Sell"]),
+        "timestamp": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:00:00"
+    } for i in range(n_transactions)]
+
+
+def history_as_dicts(items):
+    """The per-point dicts the chart presenter used to build"""
+    processed = []
+    for item in items:
+        date_str = item.get("date")
+        close_price = item.get("closePrice")
+        if date_str is None or close_price is None:
+            continue
+        processed.append({"date": date_str, "price": float(close_price), "open": None,
+                          "high": None, "low": None, "close": float(close_price)})
+    processed.sort(key=lambda x: x["date"])
+    return processed
+
+
+def measure(label, fn, *args, repeat=5):
+    """Best of `repeat` runs, the memory retained by the result and the peak while running"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = fn(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<40} {best * 1000:9.2f} ms {retained / 1024:10.1f} KB {peak / 1024:10.1f} KB")
+
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    random.seed(1)
+    history = make_history(n_points)
+    transactions = make_transactions(n_points)
+
+    print(f"{n_points} points/transactions")
+    print(f"{'':<40} {'time':>12} {'retained':>13} {'peak':>13}")
+    measure("history -> list of dicts", history_as_dicts, history)
+    measure("history -> PriceSeries", PriceSeries.from_json, "AAPL", history)
+
+    body = json.dumps(history).encode()
+    chunks = [body[i:i + 64 * 1024] for i in range(0, len(body), 64 * 1024)]
+    measure("body -> json.loads -> PriceSeries", lambda b: PriceSeries.from_json("AAPL", json.loads(b)), body)
+    measure(f"body -> {JSON_BACKEND} -> PriceSeries", lambda b: PriceSeries.from_json("AAPL", loads(b)), body)
+    measure("body chunks -> streamed PriceSeries", lambda c: PriceSeries.from_stream("AAPL", iter(c)), chunks)
+
+    measure("transactions -> analysis (dicts)", lambda t: analyze_transactions(t), transactions)
+    table = TransactionTable.from_json(transactions)
+    measure("transactions -> TransactionTable", TransactionTable.from_json, transactions)
+    measure("TransactionTable -> analysis", lambda t: analyze_transactions(t), table)
+
+
+if __name__ == "__main__":
+    main()
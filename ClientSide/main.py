@@ -1,3 +1,6 @@
+import time
+START_TIME = time.perf_counter()
+
 import sys
 import os
 
@@ -7,17 +10,32 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 from PySide6.QtWidgets import QApplication
 from views.main_window import MainWindow
 
+# Run with --startup-timing (or STOCK_APP_STARTUP_TIMING=1) to print how long
+# it takes until the login view is first painted, then exit
+STARTUP_TIMING_FLAG = "--startup-timing"
+
 def main():
     """Main application entry point"""
-    app = QApplication(sys.argv)
-    
+    startup_timing = STARTUP_TIMING_FLAG in sys.argv or os.environ.get("STOCK_APP_STARTUP_TIMING") == "1"
+    argv = [arg for arg in sys.argv if arg != STARTUP_TIMING_FLAG]
+    app = QApplication(argv)
+
     # Set application style
     app.setStyle("Fusion")
-    
+
+    timer = None
+    if startup_timing:
+        from utils.startup_timer import StartupTimer
+        timer = StartupTimer(START_TIME, on_report=app.quit)
+        timer.mark("QApplication created")
+
     # Create and show main window
     window = MainWindow()
+    if timer is not None:
+        timer.mark("MainWindow created")
+        timer.watch_first_paint(window.login_view, "LoginView")
     window.show()
-    
+
     # Start application event loop
     sys.exit(app.exec())
 
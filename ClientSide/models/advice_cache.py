@@ -0,0 +1,194 @@
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+DEFAULT_ADVICE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".stock_app", "advice_cache.json")
+# Format of the saved file, files of another version were keyed differently and are ignored
+CACHE_FILE_VERSION = 3
+
+# Words that do not change what is asked ("should I buy AAPL" == "is AAPL a buy").
+# Negations and verbs like buy/sell/hold are deliberately not in here
+STOPWORDS = frozenset("""
+    a an the is are am be was were do does did i me my we our you your it its this that
+    should would could can will shall may might must please tell think what whats how
+    about to of for on in at with and or right now currently good idea
+""".split())
+
+# The AI advisor service reports failures as answer text (HTTP 200) starting with this
+ADVICE_ERROR_PREFIX = "Error getting answer:"
+
+# Each of these starts a new clause of a question, clauses keep their order
+ACTION_WORDS = frozenset(("buy", "sell", "hold"))
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9.]+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Reduce a question to its lowercase non-stopword tokens, split into clauses
+    at buy/sell/hold. Tokens are sorted within a clause, so "buy AAPL" equals
+    "AAPL buy", but clauses keep their order: "sell AAPL buy MSFT" is not
+    "buy AAPL sell MSFT". Tokens before the first action word belong to its clause.
+    """
+    tokens = (token.strip(".") for token in _TOKEN_PATTERN.findall(query.lower()))
+    clauses = [[]]
+    has_action = False
+    for token in tokens:
+        if not token or token in STOPWORDS:
+            continue
+        if token in ACTION_WORDS:
+            if has_action:
+                clauses.append([])
+            has_action = True
+        clauses[-1].append(token)
+    return " | ".join(" ".join(sorted(clause)) for clause in clauses if clause)
+
+
+def is_answer(advice: str) -> bool:
+    """False for empty answers and the error texts the advisor service returns instead of one"""
+    return isinstance(advice, str) and bool(advice.strip()) and not advice.lstrip().startswith(ADVICE_ERROR_PREFIX)
+
+
+class AdviceCache:
+    """
+    Thread-safe cache of AI advisor answers, optionally persisted as JSON
+
+    Free questions are keyed on their normalized text, history based
+    advice on symbol and date, so it is generated at most once a day.
+    Entries expire after `ttl` seconds and at most `max_entries` are
+    kept, the least recently used one is evicted first. Timestamps are
+    wall clock so they stay meaningful across sessions.
+    """
+    def __init__(self, path: Optional[str] = None, ttl: float = 6 * 3600.0, max_entries: int = 500,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (advice, created_at), ordered from least to most recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        if path is not None:
+            self._load()
+
+    @staticmethod
+    def query_key(query: str) -> str:
+        return "query:" + normalize_query(query)
+
+    @staticmethod
+    def history_key(symbol: str, date: Optional[datetime.date] = None) -> str:
+        date = date or datetime.date.today()
+        return f"history:{symbol.strip().upper()}:{date.isoformat()}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached answer, None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._clock() - entry[1] < self.ttl:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                del self._entries[key]
+                self._expired += 1
+                self._dirty = True
+            self._misses += 1
+            return None
+
+    def get_or_load(self, key: str, loader: Callable[[], str]) -> str:
+        """Get a cached answer, calling loader() to generate it when needed"""
+        advice = self.get(key)
+        if advice is None:
+            # Generate outside the lock, answers take seconds
+            advice = loader()
+            self.put(key, advice)
+        return advice
+
+    def put(self, key: str, advice: str):
+        """Store an answer, evicting least recently used entries when full, error texts are not stored"""
+        if not is_answer(advice):
+            return
+        with self._lock:
+            self._entries[key] = (advice, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            self._dirty = True
+
+    def invalidate(self, key: str = None):
+        """Remove one entry, or every entry when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._dirty = True
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss/eviction statistics"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+    def save(self):
+        """Write the cache to its file if it changed since the last save"""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = self._clock()
+            entries = [[key, advice, created_at] for key, (advice, created_at) in self._entries.items()
+                       if now - created_at < self.ttl]
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Write next to the target and swap, so a crash never leaves half a file
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FILE_VERSION, "entries": entries}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not save advice cache: {e}")
+
+    def close(self):
+        """Persist the cache"""
+        self.save()
+
+    def _load(self):
+        """Read the entries saved by a previous session, dropping expired ones"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load advice cache: {e}")
+            return
+        if data.get("version") != CACHE_FILE_VERSION:
+            return
+
+        now = self._clock()
+        with self._lock:
+            # Saved in LRU order, so the newest entries survive a smaller max_entries
+            for key, advice, created_at in data.get("entries", [])[-self.max_entries:]:
+                if now - created_at < self.ttl and is_answer(advice):
+                    self._entries[key] = (advice, created_at)
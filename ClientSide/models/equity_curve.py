@@ -0,0 +1,205 @@
+import datetime
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional
+from models.rate_limiter import Priority
+from models.records import TransactionTable, _parse_dates
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def forward_fill(values: np.ndarray, seed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Replace NaN in every column of a (days x symbols) matrix with the last value above it
+    `seed` is the row just before the matrix, it fills the leading NaN
+    """
+    if seed is not None:
+        values = np.vstack([seed, values])
+    rows = np.arange(len(values))[:, None]
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0)
+    filled = np.take_along_axis(values, last_valid, axis=0)
+    return filled[1:] if seed is not None else filled
+
+
+class EquityCurve:
+    """
+    Daily market value of a portfolio, rebuilt from its transactions and daily closes
+
+    Positions are the cumulative sum of the signed trade quantities over a
+    dense (day x symbol) matrix, valued at the closes of each day carried
+    forward over weekends and holidays. Where no close is stored yet, the
+    price of a trade that day stands in.
+
+    update() keeps the matrices: after a new trade only the rows from its
+    day onwards are recomputed, after a new day only the closes from the
+    last computed day onwards are fetched.
+    """
+    def __init__(self, stock_model, priority: Priority = Priority.PORTFOLIO):
+        self.stock_model = stock_model
+        self.priority = priority
+        self._lock = threading.Lock()
+        self.symbols: List[str] = []
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.values = np.empty(0)
+        self._flows = np.empty((0, 0))
+        self._positions = np.empty((0, 0))
+        self._closes = np.empty((0, 0))
+        self._trade_prices = np.empty((0, 0))
+        self._filled = np.empty((0, 0))
+        self._unloaded = set()
+        self._loaded_until = None
+        self._computed_rows = 0
+
+    def update(self, transactions: Any, today: Optional[datetime.date] = None) -> np.ndarray:
+        """
+        Bring the curve up to date with the transaction history (list or TransactionTable)
+        and return the daily values, aligned with `dates`
+        """
+        if not isinstance(transactions, TransactionTable):
+            transactions = TransactionTable.from_json(transactions)
+        today = np.datetime64(today or datetime.date.today(), "D")
+
+        with self._lock:
+            trade_days = _parse_dates(transactions.timestamps.tolist()).astype("datetime64[D]")
+            valid = ~np.isnat(trade_days) & (trade_days <= today)
+            if not valid.any():
+                self._reset()
+                return self.values
+
+            start = trade_days[valid].min()
+            symbols = sorted(set(transactions.symbols[valid].tolist()))
+            # Rows before this one are unchanged, everything from it on is recomputed
+            first = 0 if len(self.dates) == 0 or start != self.dates[0] else None
+            self._resize(start, today, symbols)
+
+            flows, trade_prices = self._trade_matrices(transactions, trade_days, valid)
+            changed = np.flatnonzero((flows != self._flows).any(axis=1)
+                                     | ~_same(trade_prices, self._trade_prices).all(axis=1))
+            self._flows = flows
+            self._trade_prices = trade_prices
+            if first is None:
+                # Days added since the last update are new in any case
+                first = int(changed[0]) if len(changed) else self._computed_rows
+                first = min(first, self._computed_rows)
+
+            first = min(first, self._load_closes())
+            self._recompute(first)
+            return self.values
+
+    def points(self) -> List[Dict[str, Any]]:
+        """The curve as {"date", "value"} points, as the dashboard chart takes them"""
+        with self._lock:
+            dates = np.datetime_as_string(self.dates, unit="D").tolist()
+            return [{"date": date, "value": value} for date, value in zip(dates, self.values.tolist())]
+
+    def _reset(self):
+        self.symbols = []
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.values = np.empty(0)
+        for attribute in ("_flows", "_positions", "_closes", "_trade_prices", "_filled"):
+            setattr(self, attribute, np.empty((0, 0)))
+
+    def _resize(self, start: np.datetime64, end: np.datetime64, symbols: List[str]):
+        """Re-align the stored matrices to the days start..end and the given symbols, new cells are NaN/0"""
+        dates = np.arange(start, end + _ONE_DAY, dtype="datetime64[D]")
+        if len(self.dates) and self.dates[0] == start:
+            old_rows = np.arange(min(len(self.dates), len(dates)))
+        else:
+            old_rows = np.arange(0)
+        old_columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        kept = [(j, old_columns[symbol]) for j, symbol in enumerate(symbols) if symbol in old_columns]
+        new_columns = np.array([j for j, _ in kept], dtype=int)
+        from_columns = np.array([i for _, i in kept], dtype=int)
+
+        def realign(matrix: np.ndarray, fill: float) -> np.ndarray:
+            result = np.full((len(dates), len(symbols)), fill)
+            if len(old_rows) and len(kept):
+                result[np.ix_(old_rows, new_columns)] = matrix[np.ix_(old_rows, from_columns)]
+            return result
+
+        self._flows = realign(self._flows, 0.0)
+        self._positions = realign(self._positions, 0.0)
+        self._closes = realign(self._closes, np.nan)
+        self._trade_prices = realign(self._trade_prices, np.nan)
+        self._filled = realign(self._filled, np.nan)
+        values = np.zeros(len(dates))
+        values[:len(old_rows)] = self.values[:len(old_rows)]
+        self.values = values
+        # Symbols without closes yet, every symbol after a full rebuild
+        self._unloaded = {symbol for symbol in symbols
+                          if symbol not in old_columns or not len(old_rows) or symbol in self._unloaded}
+        self._loaded_until = self.dates[len(old_rows) - 1] if len(old_rows) else None
+        self._computed_rows = len(old_rows)
+        self.dates = dates
+        self.symbols = symbols
+
+    def _trade_matrices(self, transactions: TransactionTable, trade_days: np.ndarray, valid: np.ndarray):
+        """Signed quantity traded and last trade price per (day, symbol)"""
+        column = {symbol: j for j, symbol in enumerate(self.symbols)}
+        rows = (trade_days[valid] - self.dates[0]).astype(int)
+        columns = np.array([column[symbol] for symbol in transactions.symbols[valid].tolist()], dtype=int)
+        quantity = transactions.quantity[valid]
+
+        flows = np.zeros((len(self.dates), len(self.symbols)))
+        np.add.at(flows, (rows, columns), np.where(transactions.is_sell[valid], -quantity, quantity))
+
+        # The last trade of a day sets its price: latest first, then the first of every cell
+        order = np.lexsort((transactions.timestamps[valid], rows))[::-1]
+        cells = rows[order] * len(self.symbols) + columns[order]
+        _, last = np.unique(cells, return_index=True)
+        last = order[last]
+        price = transactions.price[valid][last]
+        trade_prices = np.full(flows.shape, np.nan)
+        trade_prices[rows[last], columns[last]] = np.where(price > 0, price, np.nan)
+        return flows, trade_prices
+
+    def _load_closes(self) -> int:
+        """Fetch the closes still missing, return the first row whose closes changed"""
+        first = len(self.dates)
+        end = self.dates[-1]
+        for j, symbol in enumerate(self.symbols):
+            if symbol in self._unloaded:
+                # The whole history of a symbol new to the curve, from its first trade
+                traded = np.flatnonzero((self._flows[:, j] != 0) | ~np.isnan(self._trade_prices[:, j]))
+                from_day = self.dates[traded[0]] if len(traded) else self.dates[0]
+            elif self._loaded_until is not None:
+                # The last computed day may have been incomplete, refetch from there on
+                from_day = self._loaded_until
+            else:
+                continue
+            if from_day > end:
+                continue
+            range_days = int((end - from_day) / _ONE_DAY) + 1
+            try:
+                series = self.stock_model.get_price_series(symbol, range_days, self.priority)
+            except Exception as e:
+                print(f"Warning: Could not load closes for {symbol}: {e}")
+                continue
+
+            days = series.dates.astype("datetime64[D]")
+            inside = (days >= from_day) & (days <= end)
+            rows = (days[inside] - self.dates[0]).astype(int)
+            self._closes[rows, j] = series.close[inside]
+            self._unloaded.discard(symbol)
+            first = min(first, int((from_day - self.dates[0]) / _ONE_DAY))
+        return first
+
+    def _recompute(self, first: int):
+        """Recompute positions, carried closes and values from row `first` on"""
+        if first >= len(self.dates):
+            return
+        previous_position = self._positions[first - 1] if first > 0 else np.zeros(len(self.symbols))
+        self._positions[first:] = previous_position + np.cumsum(self._flows[first:], axis=0)
+
+        prices = np.where(np.isnan(self._closes[first:]), self._trade_prices[first:], self._closes[first:])
+        seed = self._filled[first - 1] if first > 0 else None
+        self._filled[first:] = forward_fill(prices, seed)
+
+        # Closed and short positions add nothing, neither do symbols without any price yet
+        positions = self._positions[first:]
+        self.values[first:] = np.where(positions > 0, positions * np.nan_to_num(self._filled[first:]), 0.0).sum(axis=1)
+
+
+def _same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise equality where NaN equals NaN"""
+    return (a == b) | (np.isnan(a) & np.isnan(b))
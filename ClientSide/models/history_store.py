@@ -0,0 +1,119 @@
+import datetime
+import os
+import numpy as np
+import sqlite3
+import threading
+from typing import Optional, Tuple
+from models.records import PriceSeries
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".stock_app", "history.sqlite3")
+
+
+def _nullable(column: Optional[np.ndarray], n: int) -> list:
+    """Column values for SQLite, NaN and missing columns become NULL"""
+    if column is None:
+        return [None] * n
+    # NaN is the only value not equal to itself
+    return [None if value != value else value for value in column.tolist()]
+
+
+class HistoryStore:
+    """
+    On-disk store of daily price bars keyed by (symbol, date)
+    Also remembers which date range of each symbol is fully stored,
+    so callers only need to fetch what is missing
+    """
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One connection shared by the GUI and worker threads, guarded by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_bars (
+                    symbol TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL NOT NULL,
+                    volume REAL,
+                    PRIMARY KEY (symbol, date)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    symbol TEXT PRIMARY KEY,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL
+                )
+            """)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def get_coverage(self, symbol: str) -> Optional[Tuple[datetime.date, datetime.date]]:
+        """Get the (start, end) date range fully stored for a symbol"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+        return datetime.date.fromisoformat(row[0]), datetime.date.fromisoformat(row[1])
+
+    def get_series(self, symbol: str, start_date: datetime.date, end_date: datetime.date) -> PriceSeries:
+        """Get stored bars of a symbol between two dates (inclusive) as a PriceSeries"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, open, high, low, close, volume FROM daily_bars "
+                "WHERE symbol = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (symbol, start_date.isoformat(), end_date.isoformat())
+            ).fetchall()
+        return PriceSeries.from_rows(symbol, rows)
+
+    def merge_series(self, symbol: str, series: PriceSeries,
+                     start_date: datetime.date, end_date: datetime.date):
+        """
+        Insert or replace fetched bars and record that the
+        range start_date..end_date is now fully stored
+        """
+        n = len(series)
+        rows = list(zip(
+            [symbol] * n,
+            np.datetime_as_string(series.dates, unit="D").tolist(),
+            _nullable(series.open, n),
+            _nullable(series.high, n),
+            _nullable(series.low, n),
+            series.close.tolist(),
+            _nullable(series.volume, n)
+        ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_bars (symbol, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            row = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE symbol = ?", (symbol,)
+            ).fetchone()
+            if row is not None:
+                stored_start = datetime.date.fromisoformat(row[0])
+                stored_end = datetime.date.fromisoformat(row[1])
+                # Extend the stored range only when the new range touches it
+                one_day = datetime.timedelta(days=1)
+                if start_date <= stored_end + one_day and end_date >= stored_start - one_day:
+                    start_date = min(start_date, stored_start)
+                    end_date = max(end_date, stored_end)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO coverage (symbol, start_date, end_date) VALUES (?, ?, ?)",
+                (symbol, start_date.isoformat(), end_date.isoformat())
+            )
@@ -0,0 +1,322 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from models.records import PriceSeries
+from models.resample import DAILY, TRADING_DAYS, periods_per_year
+# Block length bound of the EMA closed form: decay**-block stays below exp(_EWM_LOG_BLOCK)
+_EWM_LOG_BLOCK = 50.0
+
+# Every indicator below computes out[start:] in place, out[:start] is already valid.
+# A full computation is start=0, appending bars only computes the new tail.
+Lines = Dict[str, np.ndarray]
+
+
+def ewm(values: np.ndarray, alpha: float, previous: Optional[float] = None) -> np.ndarray:
+    """
+    Exponentially weighted mean y_t = (1 - alpha) * y_(t-1) + alpha * x_t
+    y_(-1) is `previous`, the first value when not given
+
+    Solved in closed form per block: y_j = b^(j+1) * (c + alpha * sum_(i<=j) b^-(i+1) * x_i)
+    with b = 1 - alpha and c the value before the block. Blocks are short
+    enough that b^-(i+1) cannot overflow, so there are O(n * -ln(b) / 50) of them.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    carry = values[0] if previous is None else previous
+    block = max(int(_EWM_LOG_BLOCK / -np.log(decay)), 1) if decay < 1.0 else len(values)
+    powers = decay ** np.arange(1, min(block, len(values)) + 1)
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        grow = powers[:len(chunk)]
+        out[start:start + len(chunk)] = grow * (carry + alpha * np.cumsum(chunk / grow))
+        carry = out[start + len(chunk) - 1]
+    return out
+
+
+def _rolling_sums(values: np.ndarray, window: int, start: int, n_sums: int = 1) -> Tuple[np.ndarray, ...]:
+    """
+    Sums of values (and of their squares with n_sums=2) over the `window` values
+    ending at every index from start on, NaN where the window is not full yet
+    Values are centered on the first one used, so the squares do not lose precision.
+    """
+    lo = max(start - window + 1, 0)
+    part = values[lo:]
+    centered = part - part[0] if len(part) else part
+    ends = np.arange(start, len(values)) - lo + 1
+    valid = ends - window >= 0
+    begins = np.where(valid, ends - window, 0)
+    sums = []
+    for power in range(1, n_sums + 1):
+        cumulative = np.concatenate(([0.0], np.cumsum(centered ** power)))
+        sums.append(np.where(valid, cumulative[ends] - cumulative[begins], np.nan))
+    return (part[0] if len(part) else 0.0,) + tuple(sums)
+
+
+def _rolling_mean_std(values: np.ndarray, window: int, start: int, ddof: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and standard deviation for the indices from start on"""
+    center, sums, squares = _rolling_sums(values, window, start, 2)
+    mean = sums / window
+    variance = np.maximum(squares - sums * mean, 0.0) / max(window - ddof, 1)
+    return mean + center, np.sqrt(variance)
+
+
+def sma(columns: Lines, out: Lines, start: int, window: int = 20):
+    """Simple moving average of the close"""
+    center, sums = _rolling_sums(columns["close"], window, start)
+    out["sma"][start:] = sums / window + center
+
+
+def ema(columns: Lines, out: Lines, start: int, span: int = 20):
+    """Exponential moving average of the close, seeded with the first close"""
+    previous = out["ema"][start - 1] if start > 0 else None
+    out["ema"][start:] = ewm(columns["close"][start:], 2.0 / (span + 1), previous)
+
+
+def bollinger(columns: Lines, out: Lines, start: int, window: int = 20, width: float = 2.0):
+    """Bollinger bands: moving average and +/- width population standard deviations"""
+    mean, std = _rolling_mean_std(columns["close"], window, start)
+    out["middle"][start:] = mean
+    out["upper"][start:] = mean + width * std
+    out["lower"][start:] = mean - width * std
+
+
+def rsi(columns: Lines, out: Lines, start: int, period: int = 14):
+    """Relative strength index with Wilder's smoothing, the first average is a plain mean"""
+    close = columns["close"]
+    if len(close) <= period:
+        out["rsi"][start:] = np.nan
+        return
+    if start <= period:
+        # Nothing to continue from before the first full average
+        start = 0
+        change = np.diff(close)
+        out["_gain"][:period] = np.nan
+        out["_loss"][:period] = np.nan
+        out["_gain"][period] = np.maximum(change[:period], 0.0).mean()
+        out["_loss"][period] = np.maximum(-change[:period], 0.0).mean()
+        begin = period + 1
+    else:
+        begin = start
+    change = close[begin:] - close[begin - 1:-1]
+    alpha = 1.0 / period
+    out["_gain"][begin:] = ewm(np.maximum(change, 0.0), alpha, out["_gain"][begin - 1])
+    out["_loss"][begin:] = ewm(np.maximum(-change, 0.0), alpha, out["_loss"][begin - 1])
+
+    gain = out["_gain"][start:]
+    loss = out["_loss"][start:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses in the window: maximum strength
+    out["rsi"][start:] = np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), value)
+
+
+def macd(columns: Lines, out: Lines, start: int, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram"""
+    close = columns["close"][start:]
+
+    def previous(line: str) -> Optional[float]:
+        return out[line][start - 1] if start > 0 else None
+
+    out["_fast"][start:] = ewm(close, 2.0 / (fast + 1), previous("_fast"))
+    out["_slow"][start:] = ewm(close, 2.0 / (slow + 1), previous("_slow"))
+    out["macd"][start:] = out["_fast"][start:] - out["_slow"][start:]
+    out["signal"][start:] = ewm(out["macd"][start:], 2.0 / (signal + 1), previous("signal"))
+    out["histogram"][start:] = out["macd"][start:] - out["signal"][start:]
+
+
+def vwap(columns: Lines, out: Lines, start: int):
+    """Volume weighted average price since the first bar, of the typical price when high and low are known"""
+    close = columns["close"][start:]
+    high = columns.get("high")
+    low = columns.get("low")
+    price = close
+    if high is not None and low is not None:
+        typical = (high[start:] + low[start:] + close) / 3.0
+        price = np.where(np.isnan(typical), close, typical)
+    volume = np.nan_to_num(columns["volume"][start:])
+    previous_pv = out["_pv"][start - 1] if start > 0 else 0.0
+    previous_v = out["_v"][start - 1] if start > 0 else 0.0
+    out["_pv"][start:] = previous_pv + np.cumsum(price * volume)
+    out["_v"][start:] = previous_v + np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["vwap"][start:] = np.where(out["_v"][start:] > 0, out["_pv"][start:] / out["_v"][start:], np.nan)
+
+
+def volatility(columns: Lines, out: Lines, start: int, window: int = 20, periods_per_year: float = TRADING_DAYS):
+    """Annualized rolling standard deviation of per-bar log returns, in percent"""
+    close = columns["close"]
+    # Return i is from bar i to bar i + 1, the value of bar i + 1 uses the returns up to i
+    first_return = max(start - 1, 0)
+    lo = max(first_return - window + 1, 0)
+    returns = np.log(close[lo + 1:] / close[lo:-1])
+    _, std = _rolling_mean_std(returns, window, first_return - lo, ddof=1)
+    out["volatility"][first_return + 1:] = std * np.sqrt(periods_per_year) * 100.0
+    if start == 0:
+        out["volatility"][0] = np.nan
+
+
+class IndicatorSpec:
+    """
+    One indicator with fixed parameters
+
+    `lines` are the plotted outputs, lines starting with "_" only carry
+    state for incremental updates. Overlays share the price axis, the
+    others (oscillators) are drawn against a secondary axis. Annualized
+    indicators are given the periods_per_year of the bar interval.
+    """
+    __slots__ = ("label", "function", "params", "lines", "inputs", "overlay", "annualized")
+
+    def __init__(self, label: str, function: Callable, lines: Tuple[str, ...], params: Optional[dict] = None,
+                 inputs: Tuple[str, ...] = ("close",), overlay: bool = True, annualized: bool = False):
+        self.label = label
+        self.function = function
+        self.params = params or {}
+        self.lines = lines
+        self.inputs = inputs
+        self.overlay = overlay
+        self.annualized = annualized
+
+    @property
+    def key(self) -> Hashable:
+        return self.function.__name__, tuple(sorted(self.params.items()))
+
+    def compute(self, columns: Lines, out: Optional[Lines] = None, start: int = 0, interval: str = DAILY) -> Lines:
+        """Compute all lines of bars of the given interval, or with `out` only out[start:] (out[:start] is kept)"""
+        n = len(columns["close"])
+        if out is None or start == 0:
+            out = {line: np.full(n, np.nan) for line in self.lines}
+        params = self.params
+        if self.annualized:
+            params = dict(params, periods_per_year=periods_per_year(interval))
+        self.function(columns, out, start, **params)
+        return out
+
+
+# Indicators offered on the chart, by label
+INDICATORS = OrderedDict((spec.label, spec) for spec in (
+    IndicatorSpec("SMA 20", sma, ("sma",), {"window": 20}),
+    IndicatorSpec("SMA 50", sma, ("sma",), {"window": 50}),
+    IndicatorSpec("SMA 200", sma, ("sma",), {"window": 200}),
+    IndicatorSpec("EMA 20", ema, ("ema",), {"span": 20}),
+    IndicatorSpec("Bollinger 20/2", bollinger, ("upper", "middle", "lower"), {"window": 20, "width": 2.0}),
+    IndicatorSpec("VWAP", vwap, ("vwap", "_pv", "_v"), inputs=("close", "high", "low", "volume")),
+    IndicatorSpec("RSI 14", rsi, ("rsi", "_gain", "_loss"), {"period": 14}, overlay=False),
+    IndicatorSpec("MACD 12/26/9", macd, ("macd", "signal", "histogram", "_fast", "_slow"),
+                  {"fast": 12, "slow": 26, "signal": 9}, overlay=False),
+    IndicatorSpec("Volatility 20", volatility, ("volatility",), {"window": 20}, overlay=False, annualized=True),
+))
+
+
+class _Entry:
+    """Inputs and outputs of one cached indicator computation"""
+    __slots__ = ("dates", "columns", "lines")
+
+    def __init__(self, dates: np.ndarray, columns: Lines, lines: Lines):
+        self.dates = dates
+        self.columns = columns
+        self.lines = lines
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator results per (symbol, bar interval, range, indicator)
+
+    When a series only differs from the cached one in its last bars (a new
+    trading day, the current bar updated while the market is open) only
+    the lines from the first changed bar onwards are recomputed. Results
+    are always those of a full computation on the series: a series that
+    starts at another bar (a range that moved forward) is computed anew,
+    since the indicators' warm-up would otherwise see different bars.
+    """
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._hits = 0
+        self._partial = 0
+        self._misses = 0
+
+    def get(self, series: PriceSeries, range_days: int, spec: IndicatorSpec) -> Optional[Lines]:
+        """
+        Get the plotted lines of an indicator for a series, aligned with its bars
+        None when the series lacks an input the indicator needs (e.g. volume)
+        """
+        columns = {name: getattr(series, name) for name in spec.inputs}
+        if any(columns[name] is None for name in ("close", "volume") if name in columns):
+            return None
+        if len(series) == 0:
+            return {line: np.empty(0) for line in spec.lines if not line.startswith("_")}
+
+        key = (series.symbol, series.interval, range_days, spec.key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        changed = self._match(entry, series, columns) if entry is not None else None
+        if changed is None:
+            with self._lock:
+                self._misses += 1
+            entry = _Entry(series.dates, columns, spec.compute(columns, interval=series.interval))
+        elif changed < len(entry.dates) or len(series) > len(entry.dates):
+            with self._lock:
+                self._partial += 1
+            entry = self._extend(entry, series, columns, spec, changed)
+        else:
+            with self._lock:
+                self._hits += 1
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return {line: values[:len(series)] for line, values in entry.lines.items() if not line.startswith("_")}
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Remove the entries of one symbol, or all entries"""
+        with self._lock:
+            for key in [key for key in self._entries if symbol is None or key[0] == symbol]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, incremental update and miss counts"""
+        with self._lock:
+            return {"hits": self._hits, "partial": self._partial, "misses": self._misses,
+                    "size": len(self._entries)}
+
+    @staticmethod
+    def _match(entry: _Entry, series: PriceSeries, columns: Lines) -> Optional[int]:
+        """
+        Index of the first bar where the series differs from the entry
+        None when the series does not start with the entry's first bar
+        """
+        if entry.dates[0] != series.dates[0]:
+            return None
+        overlap = min(len(entry.dates), len(series))
+        same = entry.dates[:overlap] == series.dates[:overlap]
+        for name, column in columns.items():
+            old = entry.columns[name][:overlap]
+            new = column[:overlap]
+            same &= (old == new) | (np.isnan(old) & np.isnan(new))
+        differs = np.flatnonzero(~same)
+        return int(differs[0]) if len(differs) else overlap
+
+    @staticmethod
+    def _extend(entry: _Entry, series: PriceSeries, columns: Lines, spec: IndicatorSpec, changed: int) -> _Entry:
+        """Replace the entry's bars from `changed` on with the series' bars and recompute only those"""
+        dates = np.concatenate((entry.dates[:changed], series.dates[changed:]))
+        merged = {name: np.concatenate((entry.columns[name][:changed], column[changed:]))
+                  for name, column in columns.items()}
+        lines = {}
+        for line, values in entry.lines.items():
+            lines[line] = np.concatenate((values[:changed], np.full(len(dates) - changed, np.nan)))
+        return _Entry(dates, merged, spec.compute(merged, lines, changed, series.interval))
@@ -0,0 +1,211 @@
+import datetime
+import threading
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from models.rate_limiter import Priority, RateLimitError
+
+# Symbols ranked for the dashboard's top gainers and losers. With the index proxies
+# below that is 10 history requests a day, two rounds of the free key's 5 per minute,
+# and leaves 15 of its 25 daily requests for the charts and the portfolio
+DEFAULT_UNIVERSE = ("AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA")
+
+# The gateway only serves stocks, each index is followed through an ETF tracking it
+INDEX_PROXIES = (("S&P 500", "SPY"), ("NASDAQ", "QQQ"), ("DOW", "DIA"), ("RUSSELL", "IWM"))
+
+# History fetched per symbol, enough to span a long weekend with a holiday
+CLOSES_RANGE_DAYS = 10
+
+
+def percent_change(latest: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Percent change from previous to latest, NaN where either close is missing or previous is not positive"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (latest - previous) / previous * 100.0
+    change[~(previous > 0)] = np.nan
+    return change
+
+
+def top_indices(values: np.ndarray, n: int, largest: bool = True) -> np.ndarray:
+    """
+    Indices of the n largest (or smallest) finite values, best first
+    A partial sort picks them, only those n are sorted
+    """
+    candidates = np.flatnonzero(np.isfinite(values))
+    keys = -values[candidates] if largest else values[candidates]
+    if n <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    if n < len(candidates):
+        picked = np.argpartition(keys, n - 1)[:n]
+        candidates, keys = candidates[picked], keys[picked]
+    return candidates[np.argsort(keys, kind="stable")]
+
+
+class MarketMovers:
+    """Index changes and top gainers/losers of one trading day, as the dashboard charts take them"""
+    __slots__ = ("day", "market", "gainers", "losers", "loaded", "total")
+
+    def __init__(self, day: datetime.date, market: List[Dict[str, Any]], gainers: List[Dict[str, Any]],
+                 losers: List[Dict[str, Any]], loaded: int, total: int):
+        self.day = day
+        self.market = market
+        self.gainers = gainers
+        self.losers = losers
+        self.loaded = loaded
+        self.total = total
+
+    @property
+    def complete(self) -> bool:
+        """True once the closes of every symbol were requested"""
+        return self.loaded == self.total
+
+
+class MoversEngine:
+    """
+    Computes index changes and the top gainers and losers of a symbol universe
+
+    Latest and previous closes come from the daily history through the
+    StockModel, so they share its history store and rate limiter. They are
+    requested in rounds of `batch_size` symbols at PREFETCH priority, the
+    results so far are reported after every round. Closes are kept for
+    the trading day, once all symbols are loaded refresh() needs no
+    request until the next day. A symbol whose closes could not be
+    loaded stays missing and is requested again by the next refresh.
+    Ranking runs on column arrays.
+    """
+    def __init__(self, stock_model, universe: Sequence[str] = DEFAULT_UNIVERSE,
+                 index_proxies: Sequence[Tuple[str, str]] = INDEX_PROXIES, top_n: int = 5, batch_size: int = 5,
+                 priority: Priority = Priority.PREFETCH, today: Callable[[], datetime.date] = datetime.date.today):
+        self.stock_model = stock_model
+        self.index_proxies = tuple(index_proxies)
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.priority = priority
+        self._today = today
+        # One refresh at a time, a superseded one may still be running on another thread
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._day = today()
+        self._symbols: List[str] = []
+        self._latest = np.empty(0)
+        self._previous = np.empty(0)
+        self._loaded = np.empty(0, dtype=bool)
+        self.set_universe(universe)
+
+    def set_universe(self, symbols: Sequence[str]):
+        """Set the symbols to rank, closes already loaded today are kept"""
+        universe = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+        with self._lock:
+            old = dict(zip(self._symbols, zip(self._latest, self._previous, self._loaded)))
+            self.universe = universe
+            # Index proxies first, so the market chart fills in with the first round
+            self._symbols = list(dict.fromkeys([proxy for _, proxy in self.index_proxies] + universe))
+            self._index = {symbol: i for i, symbol in enumerate(self._symbols)}
+            self._latest = np.full(len(self._symbols), np.nan)
+            self._previous = np.full(len(self._symbols), np.nan)
+            self._loaded = np.zeros(len(self._symbols), dtype=bool)
+            for symbol, (latest, previous, loaded) in old.items():
+                i = self._index.get(symbol)
+                if i is not None:
+                    self._latest[i], self._previous[i], self._loaded[i] = latest, previous, loaded
+
+    def refresh(self, progress: Optional[Callable[[MarketMovers], None]] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> MarketMovers:
+        """
+        Load the closes still missing for today and rank the universe
+        progress(movers) is called after every round but the last.
+        Stops early when cancelled or when the rate limit is exhausted,
+        the symbols left are loaded by the next refresh.
+        """
+        with self._refresh_lock:
+            self._start_day()
+            with self._lock:
+                missing = [symbol for symbol, loaded in zip(self._symbols, self._loaded) if not loaded]
+
+            for start in range(0, len(missing), self.batch_size):
+                if is_cancelled is not None and is_cancelled():
+                    break
+                try:
+                    self._load_round(missing[start:start + self.batch_size], is_cancelled)
+                except RateLimitError as e:
+                    print(f"Warning: Market movers incomplete: {e}")
+                    break
+                if progress is not None and start + self.batch_size < len(missing):
+                    progress(self.snapshot())
+            return self.snapshot()
+
+    def snapshot(self) -> MarketMovers:
+        """Rank what is loaded so far, without any request"""
+        with self._lock:
+            symbols = self._symbols
+            index = self._index
+            latest = self._latest.copy()
+            previous = self._previous.copy()
+            loaded = int(self._loaded.sum())
+            day = self._day
+            universe = np.array([index[symbol] for symbol in self.universe], dtype=int)
+
+        change = percent_change(latest, previous)
+
+        market = []
+        for name, proxy in self.index_proxies:
+            i = index[proxy]
+            if np.isfinite(change[i]):
+                market.append({"index": name, "symbol": proxy, "value": float(latest[i]),
+                               "change_percent": float(change[i])})
+
+        universe_change = change[universe]
+        gainers = universe[top_indices(np.where(universe_change > 0, universe_change, np.nan), self.top_n)]
+        losers = universe[top_indices(np.where(universe_change < 0, universe_change, np.nan), self.top_n,
+                                      largest=False)]
+        return MarketMovers(
+            day, market,
+            [self._mover(symbols, latest, change, i) for i in gainers],
+            [self._mover(symbols, latest, change, i) for i in losers],
+            loaded, len(symbols)
+        )
+
+    def invalidate(self):
+        """Forget today's closes, the next refresh loads them again"""
+        with self._lock:
+            self._loaded[:] = False
+            self._latest[:] = np.nan
+            self._previous[:] = np.nan
+
+    def _start_day(self):
+        """Drop the closes of a previous day"""
+        today = self._today()
+        if today != self._day:
+            self.invalidate()
+            with self._lock:
+                self._day = today
+
+    def _load_round(self, symbols: List[str], is_cancelled: Optional[Callable[[], bool]]):
+        """Load the latest two closes of each symbol of a round"""
+        for symbol in symbols:
+            if is_cancelled is not None and is_cancelled():
+                return
+            try:
+                close = self.stock_model.get_price_series(symbol, CLOSES_RANGE_DAYS, self.priority,
+                                                          is_cancelled=is_cancelled).close
+            except RateLimitError:
+                raise
+            except Exception as e:
+                # Left unloaded, the next refresh tries again
+                print(f"Warning: Could not load closes for {symbol}: {e}")
+                continue
+
+            close = close[~np.isnan(close)]
+            if len(close) == 0:
+                # Skipped after a cancel, or the gateway sent nothing: retried by the next refresh
+                continue
+            with self._lock:
+                i = self._index.get(symbol)
+                if i is None:
+                    # Dropped from the universe meanwhile
+                    continue
+                self._latest[i] = close[-1]
+                self._previous[i] = close[-2] if len(close) >= 2 else np.nan
+                self._loaded[i] = True
+
+    @staticmethod
+    def _mover(symbols: List[str], latest: np.ndarray, change: np.ndarray, i: int) -> Dict[str, Any]:
+        return {"symbol": symbols[i], "price": float(latest[i]), "change_percent": float(change[i])}
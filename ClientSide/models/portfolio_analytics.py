@@ -0,0 +1,176 @@
+import numpy as np
+from typing import Dict, List, Any, Optional, Union
+from models.records import TransactionTable
+
+# Positions at or below this quantity are treated as closed
+CLOSED_POSITION_EPSILON = 1e-6
+# Split long log-space running products so exp() stays far from overflow
+_LOG_CHUNK = 500.0
+
+
+class PortfolioSnapshot:
+    """
+    Per-symbol portfolio figures computed from the transaction history
+    All fields except `symbols` are NumPy arrays aligned with `symbols`
+    """
+    def __init__(self, symbols: List[str], quantity: np.ndarray, avg_price: np.ndarray,
+                 cost_basis: np.ndarray, realized_pnl: np.ndarray, current_price: np.ndarray):
+        self.symbols = symbols
+        self.quantity = quantity
+        self.avg_price = avg_price
+        self.cost_basis = cost_basis
+        self.realized_pnl = realized_pnl
+        self.current_price = current_price
+        self.market_value = quantity * current_price
+        self.unrealized_pnl = np.where(quantity > CLOSED_POSITION_EPSILON, self.market_value - cost_basis, 0.0)
+        total_value = self.market_value.sum()
+        self.weight = self.market_value / total_value if total_value > 0 else np.zeros_like(self.market_value)
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Get the figures of one symbol as a dict, None if it never traded"""
+        i = self._index.get(symbol.strip().upper())
+        if i is None:
+            return None
+        return {
+            "quantity": float(self.quantity[i]),
+            "avg_price": float(self.avg_price[i]),
+            "cost_basis": float(self.cost_basis[i]),
+            "realized_pnl": float(self.realized_pnl[i]),
+            "current_price": float(self.current_price[i]),
+            "market_value": float(self.market_value[i]),
+            "unrealized_pnl": float(self.unrealized_pnl[i]),
+            "weight": float(self.weight[i])
+        }
+
+
+def analyze_transactions(transactions: Union[List[Dict[str, Any]], TransactionTable],
+                         current_prices: Optional[Dict[str, float]] = None) -> PortfolioSnapshot:
+    """
+    Compute quantity, average price (average cost method), cost basis,
+    realized and unrealized P&L and weights for every symbol at once
+
+    The average cost recurrence is solved in closed form per position:
+    a buy adds quantity * price to the cost basis, a sell scales it by
+    the fraction of the position that is kept.
+    """
+    if not isinstance(transactions, TransactionTable):
+        transactions = TransactionTable.from_json(transactions)
+    return analyze_transaction_arrays(
+        transactions.symbols, transactions.quantity, transactions.price,
+        transactions.is_sell, transactions.timestamps, current_prices
+    )
+
+
+def analyze_transaction_arrays(raw_symbols: np.ndarray, quantity: np.ndarray, price: np.ndarray,
+                               is_sell: np.ndarray, timestamps: np.ndarray,
+                               current_prices: Optional[Dict[str, float]] = None) -> PortfolioSnapshot:
+    """Same as analyze_transactions, for transactions already held as column arrays"""
+    current_prices = {symbol.upper(): price for symbol, price in (current_prices or {}).items()}
+    if len(raw_symbols) == 0:
+        empty = np.zeros(0)
+        return PortfolioSnapshot([], empty, empty, empty, empty, empty)
+
+    symbols, codes = np.unique(raw_symbols, return_inverse=True)
+
+    # Chronological order inside each symbol, server order breaks ties
+    order = np.lexsort((np.arange(len(raw_symbols)), timestamps, codes))
+    codes = codes[order]
+    quantity = quantity[order]
+    price = price[order]
+    is_sell = is_sell[order]
+    n = len(order)
+
+    symbol_start = np.ones(n, dtype=bool)
+    symbol_start[1:] = codes[1:] != codes[:-1]
+
+    # Running position per symbol
+    signed_quantity = np.where(is_sell, -quantity, quantity)
+    position = _grouped_cumsum(signed_quantity, symbol_start)
+    previous_position = position - signed_quantity
+    closed = position <= CLOSED_POSITION_EPSILON
+
+    # A new position (segment) starts on the first transaction of a symbol
+    # or right after the position was closed
+    segment_start = symbol_start.copy()
+    segment_start[1:] |= closed[:-1]
+
+    # Cost basis recurrence: C_k = a_k * C_(k-1) + b_k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        keep_ratio = np.where(previous_position > CLOSED_POSITION_EPSILON, position / previous_position, 1.0)
+    keep_ratio = np.where(is_sell & ~closed, np.clip(keep_ratio, 1e-300, 1.0), 1.0)
+    added_cost = np.where(is_sell, 0.0, quantity * price)
+    cost_basis = _solve_linear_recurrence(np.log(keep_ratio), added_cost, segment_start)
+    cost_basis[closed] = 0.0
+
+    # Average price held before each transaction, used for realized P&L on sells
+    previous_cost = np.zeros(n)
+    previous_cost[1:] = cost_basis[:-1]
+    previous_cost[segment_start] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous_avg = np.where(previous_position > CLOSED_POSITION_EPSILON, previous_cost / previous_position, 0.0)
+    sold_quantity = np.minimum(quantity, np.maximum(previous_position, 0.0))
+    realized = np.where(is_sell, sold_quantity * (price - previous_avg), 0.0)
+
+    # Final state of every symbol is its last transaction
+    symbol_end = np.flatnonzero(np.append(symbol_start[1:], True))
+    final_position = np.where(closed[symbol_end], 0.0, position[symbol_end])
+    final_cost = cost_basis[symbol_end]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_price = np.where(final_position > CLOSED_POSITION_EPSILON, final_cost / final_position, 0.0)
+    realized_pnl = np.bincount(codes, weights=realized, minlength=len(symbols))
+    last_price = np.array([float(current_prices.get(symbol, 0.0)) for symbol in symbols])
+
+    return PortfolioSnapshot(list(symbols), final_position, avg_price, final_cost, realized_pnl, last_price)
+
+
+def _grouped_cumsum(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Inclusive cumulative sum that restarts at every group start
+
+    Done as a log-step segmented scan instead of one global cumsum, so a
+    group with large values cannot cost precision in the groups after it.
+    """
+    result = values.astype(float)
+    group = np.cumsum(group_start)
+    step = 1
+    while step < len(result):
+        same_group = group[step:] == group[:-step]
+        result[step:] = result[step:] + np.where(same_group, result[:-step], 0.0)
+        step *= 2
+    return result
+
+
+def _solve_linear_recurrence(log_a: np.ndarray, b: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Solve x_k = a_k * x_(k-1) + b_k with x = 0 before every group start,
+    given log(a_k) <= 0
+
+    x_k = sum_j b_j * exp(L_k - L_j) with L the running sum of log(a).
+    Groups are cut into chunks whose L spans less than _LOG_CHUNK so the
+    exp() terms cannot overflow; the rare chunk that continues a group
+    receives the previous chunk's final value as a carry.
+    """
+    n = len(b)
+    running_log = _grouped_cumsum(log_a, group_start)
+    chunk_id = np.floor(-running_log / _LOG_CHUNK)
+    chunk_start = group_start.copy()
+    chunk_start[1:] |= chunk_id[1:] != chunk_id[:-1]
+
+    # Reference log at the start of every chunk (value before its first element)
+    start_index = np.maximum.accumulate(np.where(chunk_start, np.arange(n), 0))
+    reference = running_log[start_index] - log_a[start_index]
+
+    weighted = b * np.exp(reference - running_log)
+    x = np.exp(running_log - reference) * _grouped_cumsum(weighted, chunk_start)
+
+    # Carry values into chunks that continue the previous chunk's group
+    continued = np.flatnonzero(chunk_start & ~group_start)
+    if len(continued):
+        chunk_starts = np.flatnonzero(chunk_start)
+        chunk_ends = np.append(chunk_starts[1:], n)
+        end_of = dict(zip(chunk_starts, chunk_ends))
+        for start in continued:
+            end = end_of[start]
+            x[start:end] += x[start - 1] * np.exp(running_log[start:end] - reference[start:end])
+    return x
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class QuoteCache:
+    """
+    Thread-safe in-memory cache for current quotes
+
+    Entries are fresh for `ttl` seconds. For another `stale_ttl` seconds
+    an expired entry is still returned while it is reloaded in the
+    background (stale-while-revalidate). At most `max_entries` entries
+    are kept, the least recently used one is evicted first.
+    """
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, stale_ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, fetched_at), ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._refreshing = set()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Get a cached value, calling loader() to fetch it when needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = self._clock() - fetched_at
+                if age < self.ttl:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._stale_hits += 1
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._revalidate, args=(key, loader), daemon=True).start()
+                    return value
+            self._misses += 1
+
+        # Load outside the lock so other keys are not blocked by the network
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def get_many(self, keys: List[Hashable], loader: Callable[[List[Hashable]], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """
+        Get several cached values at once
+        loader(missing_keys) is called once for all keys that are not cached
+        and returns the values it could load as a dict
+        """
+        values = {}
+        missing = []
+        stale = []
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value, fetched_at = entry
+                    age = now - fetched_at
+                    if age < self.ttl:
+                        self._hits += 1
+                        self._entries.move_to_end(key)
+                        values[key] = value
+                        continue
+                    if age < self.ttl + self.stale_ttl:
+                        self._stale_hits += 1
+                        self._entries.move_to_end(key)
+                        values[key] = value
+                        if key not in self._refreshing:
+                            self._refreshing.add(key)
+                            stale.append(key)
+                        continue
+                self._misses += 1
+                missing.append(key)
+
+        if stale:
+            threading.Thread(target=self._revalidate_many, args=(stale, loader), daemon=True).start()
+
+        if missing:
+            for key, value in loader(missing).items():
+                self.put(key, value)
+                values[key] = value
+        return values
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable = None):
+        """Remove one entry, or every entry when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction statistics"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries)
+            }
+
+    def _revalidate_many(self, keys: List[Hashable], loader: Callable[[List[Hashable]], Dict[Hashable, Any]]):
+        """Reload several stale entries in the background with one loader call"""
+        try:
+            for key, value in loader(keys).items():
+                self.put(key, value)
+        except Exception as e:
+            print(f"Warning: Could not refresh cached quotes {keys}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(keys)
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Any]):
+        """Reload a stale entry in the background"""
+        try:
+            self.put(key, loader())
+        except Exception as e:
+            # Keep serving the stale value until it expires
+            print(f"Warning: Could not refresh cached quote {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional
+
+
+class Priority(IntEnum):
+    """Order in which queued requests get the quota, lowest first"""
+    CHART = 0
+    PORTFOLIO = 1
+    PREFETCH = 2
+
+
+class RateLimitError(Exception):
+    """Raised when a request would have to wait longer than the limiter's max_wait"""
+    pass
+
+
+class RateLimit:
+    """Requests allowed per minute and per day for one endpoint family (None = unlimited)"""
+    __slots__ = ("per_minute", "per_day")
+
+    def __init__(self, per_minute: Optional[float] = None, per_day: Optional[float] = None):
+        self.per_minute = per_minute
+        self.per_day = per_day
+
+
+# Every market-data request ends in one AlphaVantage call per symbol. These are
+# the free API key quotas, raise them with configure() for a premium key
+DEFAULT_RATE_LIMITS = {
+    "market-data": RateLimit(per_minute=5, per_day=25)
+}
+
+
+class _TokenBucket:
+    """Token bucket of `capacity` tokens refilled at `rate` tokens per second"""
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, period: float, now: float):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available, cost must not exceed the capacity"""
+        missing = cost - self.tokens
+        return max(missing, 0.0) / self.rate
+
+
+class _Family:
+    """Buckets and waiting queue of one endpoint family"""
+    def __init__(self, limit: RateLimit, now: float):
+        self.buckets = []
+        if limit.per_minute:
+            self.buckets.append(_TokenBucket(limit.per_minute, 60.0, now))
+        if limit.per_day:
+            self.buckets.append(_TokenBucket(limit.per_day, 86400.0, now))
+        # (priority, arrival) of every waiting request, the head gets the next tokens
+        self.queue = []
+
+
+class RateLimiter:
+    """
+    Client-side token bucket rate limiter, shared by every presenter through StockModel
+
+    acquire() blocks the calling (worker) thread until the family has
+    quota left. Waiting requests are served by priority, then in arrival
+    order, so the visible chart is not stuck behind background work.
+    A request that would wait longer than max_wait raises RateLimitError
+    instead of queueing for hours once the daily quota is spent.
+    """
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None, max_wait: float = 120.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_wait = max_wait
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._arrivals = itertools.count()
+        self._families: Dict[str, _Family] = {}
+        self._waits = 0
+        self._rejected = 0
+        for family, limit in (DEFAULT_RATE_LIMITS if limits is None else limits).items():
+            self.configure(family, limit.per_minute, limit.per_day)
+
+    def configure(self, family: str, per_minute: Optional[float] = None, per_day: Optional[float] = None):
+        """Set the limits of an endpoint family, None for no limit"""
+        with self._condition:
+            old = self._families.get(family)
+            new = _Family(RateLimit(per_minute, per_day), self._clock())
+            if old is not None:
+                new.queue = old.queue
+            self._families[family] = new
+            self._condition.notify_all()
+
+    def max_cost(self, family: str) -> Optional[float]:
+        """Largest cost a single acquire() of the family can ever be granted, None when unlimited"""
+        with self._condition:
+            state = self._families.get(family)
+            if state is None or not state.buckets:
+                return None
+            return min(bucket.capacity for bucket in state.buckets)
+
+    def acquire(self, family: str, cost: float = 1, priority: Priority = Priority.PORTFOLIO):
+        """
+        Wait until `cost` requests of the family may be sent, then use up the quota
+        A cost above max_cost() could never be served and raises RateLimitError right away
+        """
+        with self._condition:
+            state = self._families.get(family)
+            if state is None or not state.buckets:
+                return
+            capacity = min(bucket.capacity for bucket in state.buckets)
+            if cost > capacity:
+                self._rejected += 1
+                raise RateLimitError(
+                    f"{cost:g} requests at once exceed the {family} limit of {capacity:g}, split them up"
+                )
+            entry = (int(priority), next(self._arrivals))
+            heapq.heappush(state.queue, entry)
+            waited = False
+            try:
+                while True:
+                    # The family may have been reconfigured while waiting
+                    state = self._families[family]
+                    now = self._clock()
+                    for bucket in state.buckets:
+                        bucket.refill(now)
+                    if state.queue[0] == entry:
+                        wait = max((bucket.wait_time(cost) for bucket in state.buckets), default=0.0)
+                        if wait <= 0:
+                            for bucket in state.buckets:
+                                bucket.tokens -= cost
+                            return
+                        if wait > self.max_wait:
+                            self._rejected += 1
+                            raise RateLimitError(
+                                f"Rate limit for {family} reached, next request possible in {wait:.0f}s"
+                            )
+                    else:
+                        # Behind a higher priority or earlier request, woken when it is served
+                        wait = None
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    self._condition.wait(wait)
+            finally:
+                queue = self._families[family].queue
+                queue.remove(entry)
+                heapq.heapify(queue)
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get wait/reject counters and the remaining tokens and queue length per family"""
+        with self._condition:
+            now = self._clock()
+            families = {}
+            for family, state in self._families.items():
+                for bucket in state.buckets:
+                    bucket.refill(now)
+                families[family] = {
+                    "queued": len(state.queue),
+                    "tokens": [round(bucket.tokens, 2) for bucket in state.buckets]
+                }
+            return {"waits": self._waits, "rejected": self._rejected, "families": families}
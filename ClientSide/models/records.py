@@ -0,0 +1,256 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from utils.json_decode import iter_array_batches, loads, msgspec
+
+# Optional bar fields of the gateway's stock-history items, by PriceSeries attribute
+OPTIONAL_BAR_FIELDS = (("open", "openPrice"), ("high", "highPrice"), ("low", "lowPrice"), ("volume", "volume"))
+
+
+if msgspec is not None:
+    class _HistoryBar(msgspec.Struct):
+        """Schema of one stock-history item, decoded without building a dict"""
+        date: str
+        closePrice: float
+        openPrice: Optional[float] = None
+        highPrice: Optional[float] = None
+        lowPrice: Optional[float] = None
+        volume: Optional[float] = None
+
+    _history_batch_decoder = msgspec.json.Decoder(List[_HistoryBar])
+
+
+def _optional_column(values: List[Any]) -> Optional[np.ndarray]:
+    """float64 column with NaN for None, None when no value is set"""
+    if all(value is None for value in values):
+        return None
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def _bar_columns(items: List[Any], raw: Optional[bytes] = None) -> Tuple[List[str], np.ndarray, Dict[str, Optional[np.ndarray]]]:
+    """
+    Split decoded stock-history items into (date strings, close, optional columns)
+    Items without a date or close price are skipped, optional columns
+    no item has are None. `raw` are the JSON bytes the items came from,
+    a field whose name does not occur in them is not looked up at all.
+    """
+    # Fast path for the usual all-valid batch, a missing close price shows up as NaN
+    try:
+        dates = [item["date"] for item in items]
+        close = np.array([item["closePrice"] for item in items], dtype=float)
+        valid = items if None not in dates and not np.isnan(close).any() else None
+    except (KeyError, TypeError, ValueError):
+        valid = None
+
+    if valid is None:
+        valid = [item for item in items
+                 if isinstance(item, dict) and item.get("date") is not None and item.get("closePrice") is not None]
+        for item in items:
+            if not isinstance(item, dict) or item.get("date") is None or item.get("closePrice") is None:
+                print(f"Warning: Skipping invalid data point: {item}")
+        dates = [item["date"] for item in valid]
+        close = np.array([item["closePrice"] for item in valid], dtype=float)
+
+    optional = {}
+    for attribute, key in OPTIONAL_BAR_FIELDS:
+        if raw is not None and b'"' + key.encode() + b'"' not in raw:
+            optional[attribute] = None
+        else:
+            optional[attribute] = _optional_column([item.get(key) for item in valid])
+    return dates, close, optional
+
+
+def _decode_bar_batch(data: bytes) -> Tuple[List[str], np.ndarray, Dict[str, Optional[np.ndarray]]]:
+    """Decode the bytes of a stock-history item array straight into columns, see _bar_columns"""
+    if msgspec is not None:
+        try:
+            bars = _history_batch_decoder.decode(data)
+        except msgspec.ValidationError:
+            # Some item does not match the schema, let _bar_columns sort them out
+            pass
+        else:
+            optional = {attribute: _optional_column([getattr(bar, key) for bar in bars])
+                        for attribute, key in OPTIONAL_BAR_FIELDS}
+            return [bar.date for bar in bars], np.array([bar.closePrice for bar in bars], dtype=float), optional
+    return _bar_columns(loads(data), data)
+
+
+def _parse_dates(date_strings: List[str]) -> np.ndarray:
+    """
+    Parse ISO date strings into datetime64[s], NaT where a string does not parse
+    All strings are parsed at once, one by one only when the batch fails
+    """
+    try:
+        return np.array(date_strings, dtype="datetime64[s]")
+    except ValueError:
+        dates = np.full(len(date_strings), np.datetime64("NaT"), dtype="datetime64[s]")
+        for i, date_str in enumerate(date_strings):
+            try:
+                dates[i] = np.datetime64(date_str, "s")
+            except ValueError:
+                print(f"Warning: Could not parse date string: {date_str}")
+        return dates
+
+
+class PriceSeries:
+    """
+    Price history of one symbol as column arrays (struct of arrays), oldest first
+
+    `dates` holds datetime64[s] values in the gateway's local time, `close`
+    float64 prices. open/high/low/volume are float64 arrays with NaN for
+    missing values, or None when no bar of the series has them.
+    `interval` is the bar length: "1D" for daily bars, else see models.resample.
+    """
+    __slots__ = ("symbol", "dates", "close", "open", "high", "low", "volume", "interval")
+
+    def __init__(self, symbol: str, dates: np.ndarray, close: np.ndarray, open: Optional[np.ndarray] = None,
+                 high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                 volume: Optional[np.ndarray] = None, interval: str = "1D"):
+        self.symbol = symbol
+        self.interval = interval
+        self.dates = dates
+        self.close = close
+        self.open = open
+        self.high = high
+        self.low = low
+        self.volume = volume
+
+    @classmethod
+    def empty(cls, symbol: str, interval: str = "1D") -> "PriceSeries":
+        return cls(symbol, np.empty(0, dtype="datetime64[s]"), np.empty(0), interval=interval)
+
+    @classmethod
+    def from_json(cls, symbol: str, items: Any) -> "PriceSeries":
+        """
+        Build a series straight from decoded stock-history items ({"date", "closePrice", ...})
+        Items without a date or close price are skipped
+        """
+        if not isinstance(items, list):
+            return cls.empty(symbol)
+
+        date_strings, close, optional = _bar_columns(items)
+        return cls(symbol, _parse_dates(date_strings), close, **optional)._sorted()
+
+    @classmethod
+    def from_stream(cls, symbol: str, chunks: Iterable[bytes]) -> "PriceSeries":
+        """
+        Build a series from the raw stock-history body, decoded batch by batch as the chunks arrive
+        Every batch goes straight into column arrays, the whole list of items is never built
+        """
+        dates = []
+        close = []
+        optional = {attribute: [] for attribute, _ in OPTIONAL_BAR_FIELDS}
+        for batch_dates, batch_close, batch_optional in iter_array_batches(chunks, _decode_bar_batch):
+            # Parsed per batch so the date strings of the whole response are never held
+            dates.append(_parse_dates(batch_dates))
+            close.append(batch_close)
+            for attribute, column in batch_optional.items():
+                optional[attribute].append(column)
+
+        if not close:
+            return cls.empty(symbol)
+        columns = {}
+        for attribute, batches in optional.items():
+            if any(column is not None for column in batches):
+                columns[attribute] = np.concatenate([
+                    np.full(len(batch_close), np.nan) if column is None else column
+                    for column, batch_close in zip(batches, close)
+                ])
+        return cls(symbol, np.concatenate(dates), np.concatenate(close), **columns)._sorted()
+
+    @classmethod
+    def from_rows(cls, symbol: str, rows: Sequence[tuple]) -> "PriceSeries":
+        """Build a series from (date, open, high, low, close, volume) rows, None for missing values"""
+        if not rows:
+            return cls.empty(symbol)
+        dates, open_prices, high_prices, low_prices, close, volume = zip(*rows)
+        columns = {}
+        for attribute, values in (("open", open_prices), ("high", high_prices),
+                                  ("low", low_prices), ("volume", volume)):
+            column = np.array(values, dtype=float)
+            columns[attribute] = None if np.isnan(column).all() else column
+        return cls(symbol, _parse_dates(list(dates)), np.array(close, dtype=float), **columns)._sorted()
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the column arrays"""
+        return sum(column.nbytes for column in self._columns().values())
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        columns = {"dates": self.dates, "close": self.close}
+        for attribute, _ in OPTIONAL_BAR_FIELDS:
+            column = getattr(self, attribute)
+            if column is not None:
+                columns[attribute] = column
+        return columns
+
+    def _sorted(self) -> "PriceSeries":
+        """Drop unparsable dates and order by date (stable, the API is usually sorted already)"""
+        valid = ~np.isnat(self.dates)
+        if valid.all() and (len(self.dates) < 2 or (self.dates[1:] >= self.dates[:-1]).all()):
+            return self
+        order = np.flatnonzero(valid)
+        order = order[np.argsort(self.dates[order], kind="stable")]
+        for attribute, column in self._columns().items():
+            setattr(self, attribute, column[order])
+        return self
+
+
+class Holding:
+    """One portfolio position with its current valuation"""
+    __slots__ = ("symbol", "quantity", "avg_price", "current_price", "total_value", "realized_pnl", "unrealized_pnl")
+
+    def __init__(self, symbol: str, quantity: float, avg_price: float = 0.0, current_price: float = 0.0,
+                 total_value: float = 0.0, realized_pnl: float = 0.0, unrealized_pnl: float = 0.0):
+        self.symbol = symbol
+        self.quantity = quantity
+        self.avg_price = avg_price
+        self.current_price = current_price
+        self.total_value = total_value
+        self.realized_pnl = realized_pnl
+        self.unrealized_pnl = unrealized_pnl
+
+    @classmethod
+    def from_json(cls, item: Any) -> Optional["Holding"]:
+        """Build a holding from a decoded holdings item, None when it has no symbol or quantity"""
+        if not isinstance(item, dict):
+            return None
+        symbol = item.get("stockSymbol")
+        quantity = item.get("quantity")
+        if not symbol or quantity is None:
+            return None
+        return cls(symbol, float(quantity), avg_price=float(item.get("avg_price") or 0.0))
+
+
+class TransactionTable:
+    """
+    Transaction history as column arrays (struct of arrays), in server order
+    The columns are what analyze_transaction_arrays works on
+    """
+    __slots__ = ("symbols", "quantity", "price", "is_sell", "timestamps")
+
+    def __init__(self, symbols: np.ndarray, quantity: np.ndarray, price: np.ndarray,
+                 is_sell: np.ndarray, timestamps: np.ndarray):
+        self.symbols = symbols
+        self.quantity = quantity
+        self.price = price
+        self.is_sell = is_sell
+        self.timestamps = timestamps
+
+    @classmethod
+    def from_json(cls, items: Iterable[Any]) -> "TransactionTable":
+        """Build the table from decoded transactions, skipping items without a symbol or quantity"""
+        valid = [item for item in (items if isinstance(items, list) else [])
+                 if isinstance(item, dict) and item.get("stockSymbol") and item.get("quantity") is not None]
+        return cls(
+            np.array([str(item["stockSymbol"]).strip().upper() for item in valid], dtype=str),
+            np.array([item["quantity"] for item in valid], dtype=float),
+            np.array([item.get("price") or 0.0 for item in valid], dtype=float),
+            np.array([str(item.get("transactionType", "")).lower() == "sell" for item in valid], dtype=bool),
+            np.array([item.get("timestamp") or "" for item in valid], dtype=str)
+        )
+
+    def __len__(self) -> int:
+        return len(self.quantity)
@@ -0,0 +1,106 @@
+import re
+import numpy as np
+from typing import Tuple
+from models.records import PriceSeries
+
+# Bar intervals: "1D" daily, "<N>D" N calendar days, "1W" weeks from Monday, "1M" calendar months
+DAILY = "1D"
+WEEKLY = "1W"
+MONTHLY = "1M"
+
+_INTERVAL_PATTERN = re.compile(r"(\d+)([DWM])")
+
+# Trading days per year, the number of daily bars in a year
+TRADING_DAYS = 252
+
+# Longest range (in days) still charted with daily bars, longer ranges use weekly bars
+DAILY_RANGE_DAYS = 365
+
+
+def interval_for_range(range_days: int) -> str:
+    """Bar interval that keeps a chart of range_days days at a readable number of bars"""
+    return DAILY if range_days <= DAILY_RANGE_DAYS else WEEKLY
+
+
+def periods_per_year(interval: str) -> float:
+    """Bars of the interval in a year, annualizes per-bar statistics"""
+    count, unit = _parse_interval(interval)
+    if unit == "M":
+        return 12.0 / count
+    if unit == "W":
+        return 52.0 / count
+    # Daily bars are trading days, longer day buckets count calendar days
+    return TRADING_DAYS if count == 1 else 365.25 / count
+
+
+def bucket_keys(dates: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Bucket number of every date, equal for dates that fall into the same bar
+    Buckets are anchored on fixed calendar boundaries (weeks start on Monday,
+    N-day buckets count from 1970-01-01), so appending bars never moves them.
+    """
+    count, unit = _parse_interval(interval)
+    if unit == "M":
+        return dates.astype("datetime64[M]").astype(np.int64) // count
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    if unit == "W":
+        # 1970-01-01 was a Thursday, shift so that buckets start on Monday
+        return (days + 3) // (7 * count)
+    return days // count
+
+
+def bucket_starts(keys: np.ndarray, interval: str) -> np.ndarray:
+    """First day of every bucket returned by bucket_keys, as datetime64[D]"""
+    count, unit = _parse_interval(interval)
+    if unit == "M":
+        return (keys * count).astype("datetime64[M]").astype("datetime64[D]")
+    if unit == "W":
+        return (keys * 7 * count - 3).astype("datetime64[D]")
+    return (keys * count).astype("datetime64[D]")
+
+
+def resample(series: PriceSeries, interval: str) -> PriceSeries:
+    """
+    Aggregate daily bars into bars of the given interval
+
+    Every bar has the open of the bucket's first bar, the highest high, the
+    lowest low, the close of its last bar and the summed volume. It is dated
+    by the first day of its bucket, so the still open newest bar keeps its
+    date while new days update it. Single missing opens/highs/lows fall
+    back to the close, columns the daily series does not have stay None.
+    """
+    if interval == series.interval:
+        return series
+    if len(series) == 0:
+        return PriceSeries.empty(series.symbol, interval)
+
+    keys = bucket_keys(series.dates, interval)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.append(starts[1:], len(keys)) - 1
+
+    close = series.close
+    columns = {}
+    if series.open is not None:
+        columns["open"] = _or_close(series.open, close)[starts]
+    if series.high is not None:
+        columns["high"] = np.maximum.reduceat(_or_close(series.high, close), starts)
+    if series.low is not None:
+        columns["low"] = np.minimum.reduceat(_or_close(series.low, close), starts)
+    if series.volume is not None:
+        columns["volume"] = np.add.reduceat(np.nan_to_num(series.volume), starts)
+
+    dates = bucket_starts(keys[starts], interval).astype(series.dates.dtype)
+    return PriceSeries(series.symbol, dates, close[ends], interval=interval, **columns)
+
+
+def _parse_interval(interval: str) -> Tuple[int, str]:
+    """Count and unit of an interval, e.g. 2 and "W" for 2W"""
+    match = _INTERVAL_PATTERN.fullmatch(interval)
+    if match is None:
+        raise ValueError(f"Unknown bar interval: {interval}")
+    return int(match.group(1)), match.group(2)
+
+
+def _or_close(column: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """The column with the close where it has no value"""
+    return np.where(np.isnan(column), close, column)
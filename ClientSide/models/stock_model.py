@@ -1,30 +1,187 @@
-from typing import Dict, List, Any, Optional
+import datetime
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from utils.api_client import ApiClient
+from models.history_store import HistoryStore
+from models.quote_cache import QuoteCache
+from models.advice_cache import AdviceCache
+from models.records import PriceSeries
+from models.resample import DAILY, resample
+from models.rate_limiter import Priority, RateLimiter, RateLimitError
+
+# Endpoint family of every request that ends at the market data provider
+MARKET_DATA = "market-data"
 
 class StockModel:
     """
     Model class for stock data
     Handles business logic related to stocks
     """
-    def __init__(self, api_client: ApiClient):
+    def __init__(self, api_client: ApiClient, history_store: Optional[HistoryStore] = None,
+                 quote_cache: Optional[QuoteCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 advice_cache: Optional[AdviceCache] = None):
         self.api_client = api_client
+        # Keeps market data requests within the provider's quota, only requests that
+        # actually go to the network (cache and store misses) take a token
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Shared by every presenter, repeated quotes within the TTL never reach the gateway
+        self.quote_cache = quote_cache or QuoteCache()
+        # Local daily bar store, history requests go to the gateway only for missing dates
+        self.history_store = history_store
+        # Answers to equivalent questions are generated once, the default cache is not persisted
+        self.advice_cache = advice_cache or AdviceCache()
         
-    def get_current_stock_data(self, symbol: str) -> Dict[str, Any]:
+    def get_current_stock_data(self, symbol: str, priority: Priority = Priority.PORTFOLIO) -> Dict[str, Any]:
         """Get current stock data for a symbol"""
-        return self.api_client.get_current_stock_data(symbol)
+        symbol = symbol.strip().upper()
+
+        def load():
+            self.rate_limiter.acquire(MARKET_DATA, 1, priority)
+            return self.api_client.get_current_stock_data(symbol)
+
+        return self.quote_cache.get(symbol, load)
     
-    def get_stock_history(self, symbol: str, range_days: int) -> List[Dict[str, Any]]:
-        """Get stock history for a symbol and range"""
-        return self.api_client.get_stock_history(symbol, range_days)
+    def get_current_stock_data_many(self, symbols: List[str],
+                                    priority: Priority = Priority.PORTFOLIO) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Get current prices for several symbols with as few gateway requests as the rate limit allows
+        Returns (symbol -> price, symbol -> error message)
+        """
+        # Normalize and de-duplicate while keeping the caller's order
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+        errors = {}
+
+        def load(missing_symbols):
+            # The gateway looks every symbol of a batch up separately, so a batch
+            # takes one token per symbol and may not exceed the limiter's capacity
+            max_cost = self.rate_limiter.max_cost(MARKET_DATA)
+            chunk_size = len(missing_symbols) if max_cost is None else max(int(max_cost), 1)
+            prices = {}
+            for start in range(0, len(missing_symbols), chunk_size):
+                chunk = missing_symbols[start:start + chunk_size]
+                try:
+                    self.rate_limiter.acquire(MARKET_DATA, len(chunk), priority)
+                except RateLimitError as e:
+                    if not prices:
+                        raise
+                    # Keep the prices loaded so far, the rest is reported per symbol
+                    errors.update((symbol, str(e)) for symbol in missing_symbols[start:])
+                    break
+                chunk_prices, batch_errors = self.api_client.get_current_stock_data_many(chunk)
+                prices.update(chunk_prices)
+                errors.update(batch_errors)
+            return prices
+
+        prices = self.quote_cache.get_many(symbols, load)
+        return prices, errors
+
+    def get_price_series(self, symbol: str, range_days: int, priority: Priority = Priority.CHART,
+                         is_cancelled: Optional[Callable[[], bool]] = None, interval: str = DAILY) -> PriceSeries:
+        """
+        Get stock history for a symbol and range as column arrays
+        Bars of other intervals than daily (see models.resample) are aggregated from the daily bars.
+        Once is_cancelled() is True nothing is downloaded anymore, an empty series is returned
+        """
+        return resample(self._get_daily_series(symbol, range_days, priority, is_cancelled), interval)
+
+    def _get_daily_series(self, symbol: str, range_days: int, priority: Priority,
+                          is_cancelled: Optional[Callable[[], bool]]) -> PriceSeries:
+        """Daily bars of the last range_days days, from the history store where possible"""
+        symbol = symbol.strip().upper()
+        if self.history_store is None:
+            return self._fetch_price_series(symbol, range_days, priority, is_cancelled)
+
+        today = datetime.date.today()
+        # The gateway returns the bars of the last range_days days, today included
+        start_date = today - datetime.timedelta(days=max(range_days, 1) - 1)
+
+        fetch_days = self._missing_history_days(symbol, start_date, today)
+        if fetch_days:
+            series = self._fetch_price_series(symbol, fetch_days, priority, is_cancelled)
+            if len(series):
+                fetch_start = today - datetime.timedelta(days=fetch_days - 1)
+                self.history_store.merge_series(symbol, series, fetch_start, today)
+            elif is_cancelled is not None and is_cancelled():
+                return series
+            elif not self.history_store.get_coverage(symbol):
+                # Nothing stored to fall back on, behave like the plain API call
+                return series
+
+        return self.history_store.get_series(symbol, start_date, today)
+
+    def _fetch_price_series(self, symbol: str, range_days: int, priority: Priority,
+                            is_cancelled: Optional[Callable[[], bool]] = None) -> PriceSeries:
+        """Download the bars of the last range_days days, decoded while the response streams in"""
+        if is_cancelled is not None and is_cancelled():
+            return PriceSeries.empty(symbol)
+        self.rate_limiter.acquire(MARKET_DATA, 1, priority)
+        # The wait for the quota may have outlived the request
+        if is_cancelled is not None and is_cancelled():
+            return PriceSeries.empty(symbol)
+        try:
+            return PriceSeries.from_stream(symbol, self.api_client.stream_stock_history(symbol, range_days))
+        except ValueError as e:
+            print(f"Error decoding stock history: {str(e)}")
+            return PriceSeries.empty(symbol)
+
+    def _missing_history_days(self, symbol: str, start_date: datetime.date, today: datetime.date) -> int:
+        """
+        Get the range (in days back from today) that has to be fetched
+        so that start_date..today is fully stored, 0 when nothing is missing
+        """
+        coverage = self.history_store.get_coverage(symbol)
+        if coverage is None:
+            return (today - start_date).days + 1
+
+        stored_start, stored_end = coverage
+        if stored_start > start_date:
+            # Older bars are missing. The gateway can only serve "the last N days",
+            # so the whole range is requested and merged over what is stored
+            return (today - start_date).days + 1
+        if stored_end < today:
+            # Only the tail is missing, refetch from the last stored day onwards
+            return (today - stored_end).days + 1
+        return 0
     
-    def get_stock_weekly_history(self, symbol: str, range_days: int, interval: int) -> List[Dict[str, Any]]:
-        """Get stock weekly history for a symbol, range, and interval"""
-        return self.api_client.get_stock_weekly_history(symbol, range_days, interval)
+    def get_stock_weekly_history(self, symbol: str, range_days: int, interval: int,
+                                 priority: Priority = Priority.CHART) -> PriceSeries:
+        """
+        Get weekly bars for a symbol and range, every bar spanning `interval` weeks
+        Aggregated locally from the daily bars, the gateway's weekly endpoint only
+        picks every Nth daily row
+        """
+        return self.get_price_series(symbol, range_days, priority, interval=f"{max(interval, 1)}W")
     
     def get_ai_advice(self, query: str) -> str:
         """Get AI advice based on query"""
-        return self.api_client.get_ai_advice(query)
+        return self.advice_cache.get_or_load(
+            AdviceCache.query_key(query), lambda: self.api_client.get_ai_advice(query)
+        )
+    
+    def stream_ai_advice(self, query: str) -> Iterator[str]:
+        """
+        Get AI advice based on query as text chunks while it is generated
+        A cached answer is returned as a single chunk
+        """
+        key = AdviceCache.query_key(query)
+        cached = self.advice_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        stream = self.api_client.stream_ai_advice(query)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            stream.close()
+        # Not reached when the caller stopped reading, partial answers are not cached
+        self.advice_cache.put(key, "".join(chunks))
     
     def get_history_based_advice(self, stock_symbol: str) -> str:
-        """Get AI advice based on stock history"""
-        return self.api_client.get_history_based_advice(stock_symbol)
+        """Get AI advice based on stock history, at most one generation per symbol and day"""
+        return self.advice_cache.get_or_load(
+            AdviceCache.history_key(stock_symbol),
+            lambda: self.api_client.get_history_based_advice(stock_symbol)
+        )
@@ -1,5 +1,6 @@
 from PySide6.QtCore import QObject, Signal, Slot
 from typing import Dict, Any
+from utils.task_runner import TaskRunner
 
 class AIAdvisorPresenter(QObject):
     """
@@ -14,37 +15,81 @@ class AIAdvisorPresenter(QObject):
         super().__init__()
         self.view = view
         self.model = model
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.view.set_busy)
         
         # Connect view signals to presenter slots
         self.view.advice_requested.connect(self.get_advice)
         self.view.history_advice_requested.connect(self.get_history_based_advice)
+        self.view.cancel_requested.connect(self.cancel_advice)
+
+        # True once the first streamed chunk replaced the placeholder text
+        self._stream_started = False
         
     @Slot(str)
     def get_advice(self, query: str):
-        """Handle general advice request"""
+        """Handle general advice request, the answer is shown while it is generated"""
+        self._stream_started = False
+        self.task_runner.submit(
+            self._stream_advice, query,
+            on_progress=self._on_advice_chunk,
+            on_result=self._on_advice_streamed,
+            on_error=lambda error_message: self._on_advice_failed(f"Failed to get advice: {error_message}", error_message)
+        )
+
+    @Slot()
+    def cancel_advice(self):
+        """Stop the advice request in progress, keeping what was already shown"""
+        self.task_runner.cancel_all()
+        if self._stream_started:
+            self.view.append_advice(" [stopped]")
+        else:
+            self.view.display_advice("Request cancelled.")
+
+    def _stream_advice(self, query: str, progress, is_cancelled) -> str:
+        """Read the streamed answer, forwarding every chunk (runs on a worker thread)"""
+        chunks = []
+        stream = self.model.stream_ai_advice(query)
         try:
-            advice = self.model.get_ai_advice(query)
-            
-            # Display advice
+            for chunk in stream:
+                if is_cancelled():
+                    break
+                chunks.append(chunk)
+                progress(chunk)
+        finally:
+            # Closes the connection, which also stops generation upstream
+            stream.close()
+        return "".join(chunks)
+
+    def _on_advice_chunk(self, chunk: str):
+        """Show the next piece of a streamed answer"""
+        if not self._stream_started:
+            self._stream_started = True
+            self.view.display_advice("")
+        self.view.append_advice(chunk)
+
+    def _on_advice_streamed(self, advice: str):
+        """Finish a streamed answer"""
+        if not self._stream_started:
             self.view.display_advice(advice)
-            self.advice_received.emit(advice)
-            
-        except Exception as e:
-            error_message = str(e)
-            self.advice_failed.emit(error_message)
-            self.view.show_error(f"Failed to get advice: {error_message}")
+        self.advice_received.emit(advice)
     
     @Slot(str)
     def get_history_based_advice(self, stock_symbol: str):
         """Handle stock history based advice request"""
-        try:
-            advice = self.model.get_history_based_advice(stock_symbol)
-            
-            # Display advice
-            self.view.display_advice(advice)
-            self.advice_received.emit(advice)
-            
-        except Exception as e:
-            error_message = str(e)
-            self.advice_failed.emit(error_message)
-            self.view.show_error(f"Failed to get advice for {stock_symbol}: {error_message}")
+        self.task_runner.submit(
+            self.model.get_history_based_advice, stock_symbol,
+            on_result=self._on_advice_received,
+            on_error=lambda error_message: self._on_advice_failed(
+                f"Failed to get advice for {stock_symbol}: {error_message}", error_message)
+        )
+
+    def _on_advice_received(self, advice: str):
+        """Display advice returned by the model"""
+        self.view.display_advice(advice)
+        self.advice_received.emit(advice)
+
+    def _on_advice_failed(self, display_message: str, error_message: str):
+        """Report a failed advice request"""
+        self.advice_failed.emit(error_message)
+        self.view.show_error(display_message)
@@ -1,5 +1,8 @@
 from PySide6.QtCore import QObject, Signal, Slot
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
+from utils.task_runner import TaskRunner
+from models.movers import MarketMovers, MoversEngine
+from models.equity_curve import EquityCurve
 
 class DashboardPresenter(QObject):
     """
@@ -10,96 +13,88 @@ class DashboardPresenter(QObject):
     dashboard_updated = Signal()
     dashboard_update_failed = Signal(str)
     
-    def __init__(self, view, stock_model, portfolio_model):
+    def __init__(self, view, stock_model, portfolio_model, movers_engine: Optional[MoversEngine] = None,
+                 equity_curve: Optional[EquityCurve] = None):
         super().__init__()
         self.view = view
         self.stock_model = stock_model
         self.portfolio_model = portfolio_model
+        # Index changes and top movers, computed once per trading day
+        self.movers_engine = movers_engine or MoversEngine(stock_model)
+        # Daily portfolio value, kept between refreshes so only its tail is recomputed
+        self.equity_curve = equity_curve or EquityCurve(stock_model)
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.view.set_busy)
         
         # Connect view signals to presenter slots
         self.view.refresh_requested.connect(self.update_dashboard)
         
-        # Initial dashboard update
-        self.update_dashboard()
-        
     @Slot()
     def update_dashboard(self):
         """Update all dashboard charts"""
+        # Only the latest refresh is applied to the view
+        self.task_runner.cancel_all()
+        # Movers already loaded today are shown at once, their refresh follows the portfolio
+        self._on_movers(self.movers_engine.snapshot())
+        self.task_runner.submit(
+            self._get_portfolio_data,
+            on_result=self._on_portfolio_data,
+            on_error=self._on_portfolio_error
+        )
+
+    def _refresh_movers(self):
+        """Load the closes still missing for the movers, after the portfolio got its quota"""
+        self.task_runner.submit(
+            self._load_movers,
+            on_result=self._on_movers_loaded,
+            on_error=self._on_dashboard_error,
+            on_progress=self._on_movers
+        )
+
+    def _load_movers(self, progress: Callable[[MarketMovers], None],
+                     is_cancelled: Callable[[], bool]) -> MarketMovers:
+        """Refresh the index changes and movers (runs on a worker thread)"""
+        return self.movers_engine.refresh(progress=progress, is_cancelled=is_cancelled)
+
+    def _on_portfolio_data(self, data: List[Dict[str, Any]]):
+        """Show the portfolio chart, then start on the movers"""
+        try:
+            self.view.update_portfolio_chart(data)
+        except Exception as e:
+            self._on_dashboard_error(str(e))
+        self._refresh_movers()
+
+    def _on_portfolio_error(self, error_message: str):
+        """The movers are refreshed even when the portfolio failed"""
+        self._on_dashboard_error(error_message)
+        self._refresh_movers()
+
+    def _on_movers(self, movers: MarketMovers):
+        """Show the index changes and movers ranked so far"""
+        self.view.update_market_chart(movers.market)
+        self.view.update_gainers_chart(movers.gainers)
+        self.view.update_losers_chart(movers.losers)
+
+    def _on_movers_loaded(self, movers: MarketMovers):
+        """Apply the final movers, the dashboard is complete"""
         try:
-            # Update market chart
-            market_data = self._get_market_data()
-            self.view.update_market_chart(market_data)
-            
-            # Update portfolio chart
-            portfolio_data = self._get_portfolio_data()
-            self.view.update_portfolio_chart(portfolio_data)
-            
-            # Update gainers chart
-            gainers_data = self._get_gainers_data()
-            self.view.update_gainers_chart(gainers_data)
-            
-            # Update losers chart
-            losers_data = self._get_losers_data()
-            self.view.update_losers_chart(losers_data)
-            
+            self._on_movers(movers)
             self.dashboard_updated.emit()
-            
+
         except Exception as e:
-            error_message = str(e)
-            self.dashboard_update_failed.emit(error_message)
-            # We don't show error in view here as it might be disruptive during initial load
-    
-    def _get_market_data(self):
-        """Get market indices data"""
-        # This would normally fetch data from the API
-        # For demonstration, we'll use mock data
-        return [
-            {"index": "S&P 500", "value": 4200.5, "change_percent": 0.8},
-            {"index": "NASDAQ", "value": 14100.2, "change_percent": 1.2},
-            {"index": "DOW", "value": 34500.7, "change_percent": 0.5},
-            {"index": "RUSSELL", "value": 2300.1, "change_percent": -0.3}
-        ]
-    
-    def _get_portfolio_data(self):
-        """Get portfolio historical data"""
-        # This would normally fetch data from the API
-        # For demonstration, we'll use mock data
-        import datetime
-        
-        today = datetime.datetime.now()
-        data = []
-        
-        for i in range(30):
-            date = today - datetime.timedelta(days=i)
-            value = 10000 + (30 - i) * 100  # Simple increasing value
-            
-            data.append({
-                "date": date.isoformat(),
-                "value": value
-            })
-            
-        return data
-    
-    def _get_gainers_data(self):
-        """Get top gainers data"""
-        # This would normally fetch data from the API
-        # For demonstration, we'll use mock data
-        return [
-            {"symbol": "AAPL", "price": 150.25, "change_percent": 5.2},
-            {"symbol": "MSFT", "price": 290.50, "change_percent": 4.8},
-            {"symbol": "AMZN", "price": 3400.75, "change_percent": 4.3},
-            {"symbol": "GOOGL", "price": 2800.30, "change_percent": 3.9},
-            {"symbol": "TSLA", "price": 750.80, "change_percent": 3.5}
-        ]
+            self._on_dashboard_error(str(e))
+
+    def _on_dashboard_error(self, error_message: str):
+        """Handle a failed dashboard update"""
+        self.dashboard_update_failed.emit(error_message)
+        # We don't show error in view here as it might be disruptive during initial load
     
-    def _get_losers_data(self):
-        """Get top losers data"""
-        # This would normally fetch data from the API
-        # For demonstration, we'll use mock data
-        return [
-            {"symbol": "META", "price": 320.15, "change_percent": -5.2},
-            {"symbol": "NFLX", "price": 550.40, "change_percent": -4.8},
-            {"symbol": "INTC", "price": 45.60, "change_percent": -4.3},
-            {"symbol": "AMD", "price": 110.25, "change_percent": -3.9},
-            {"symbol": "NVDA", "price": 220.70, "change_percent": -3.5}
-        ]
+    def _get_portfolio_data(self) -> List[Dict[str, Any]]:
+        """Get the daily portfolio value since the first transaction"""
+        email = self.portfolio_model.api_client.user_email
+        password = self.portfolio_model.api_client.user_password
+        if not email or not password:
+            return []
+        transactions = self.portfolio_model.get_user_transactions(email, password)
+        self.equity_curve.update(transactions)
+        return self.equity_curve.points()
@@ -1,5 +1,6 @@
 from PySide6.QtCore import QObject, Signal, Slot
 from typing import Dict, Any
+from utils.task_runner import TaskRunner
 
 class LoginPresenter(QObject):
     """
@@ -16,6 +17,8 @@ class LoginPresenter(QObject):
         super().__init__()
         self.view = view
         self.model = model
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.view.set_busy)
         
         # Connect view signals to presenter slots
         self.view.login_button.clicked.connect(self.login)
@@ -41,11 +44,9 @@ class LoginPresenter(QObject):
             self.view.show_error("Please enter your password")
             return
         
-        try:
-            self.model.login(email, password)
-        except Exception as e:
-            # Error will be handled by on_login_failed via signal
-            pass
+        # Errors are reported by the model through login_failed,
+        # which is delivered to on_login_failed on the GUI thread
+        self.task_runner.submit(self.model.login, email, password)
     
     @Slot()
     def register(self):
@@ -61,11 +62,8 @@ class LoginPresenter(QObject):
             self.view.show_error("Please enter your password")
             return
         
-        try:
-            self.model.register(email, password)
-        except Exception as e:
-            # Error will be handled by on_registration_failed via signal
-            pass
+        # Errors are reported by the model through registration_failed
+        self.task_runner.submit(self.model.register, email, password)
     
     @Slot(dict)
     def on_login_successful(self, user_data: Dict[str, Any]):
@@ -1,5 +1,9 @@
 from PySide6.QtCore import QObject, Signal, Slot
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
+from utils.task_runner import TaskRunner
+from models.portfolio_analytics import analyze_transactions
+from models.records import Holding, TransactionTable
 
 class PortfolioPresenter(QObject):
     """
@@ -12,15 +16,15 @@ class PortfolioPresenter(QObject):
     transaction_successful = Signal()
     transaction_failed = Signal(str)
     
-    def __init__(self, view, model, user_model):
+    def __init__(self, view, model, user_model, stock_model):
         super().__init__()
         self.view = view
         self.model = model # PortfolioModel
         self.user_model = user_model # UserModel
-        # Need access to StockModel to get current prices
-        # Assuming StockModel is accessible via PortfolioModel or passed separately
-        # For now, let's assume it's accessible via self.model.api_client (if StockModel uses the same client)
-        # A better approach might be to inject StockModel directly
+        self.stock_model = stock_model # StockModel, current prices go through its quote cache
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.view.set_busy)
+        self._refresh_task = None
         
         # Connect view signals to presenter slots
         self.view.buy_stock_requested.connect(self.buy_stock)
@@ -30,149 +34,151 @@ class PortfolioPresenter(QObject):
     @Slot()
     def update_portfolio(self):
         """Update portfolio data using email/password and fetch current prices"""
+        if not self.user_model.is_logged_in:
+            self.portfolio_update_failed.emit("User not logged in")
+            self.view.show_error("Please log in to view your portfolio")
+            return
+        
+        # Get user credentials from ApiClient
+        email = self.model.api_client.user_email
+        password = self.model.api_client.user_password
+        
+        if not email or not password:
+             self.portfolio_update_failed.emit("User credentials not found")
+             self.view.show_error("Could not retrieve user credentials. Please log in again.")
+             return
+
+        # Only the latest refresh is applied to the view
+        if self._refresh_task is not None:
+            self.task_runner.cancel(self._refresh_task)
+        self._refresh_task = self.task_runner.submit(
+            self._load_portfolio, email, password,
+            on_result=self._on_portfolio_loaded,
+            on_error=self._on_portfolio_error
+        )
+
+    def _load_portfolio(self, email: str, password: str):
+        """Fetch holdings, current prices and transactions (runs on a worker thread)"""
+        # 1. Get user holdings (symbol, quantity)
+        holdings_raw = self.model.get_user_holdings(email, password)
+        
+        if not isinstance(holdings_raw, list):
+            raise Exception("Invalid holdings data received from API.")
+
+        holdings = []
+        for item in holdings_raw:
+            holding = Holding.from_json(item)
+            if holding is None:
+                print(f"Warning: Skipping invalid holding data: {item}")
+                continue
+            holdings.append(holding)
+
+        # 2. Fetch all current prices in one batch request while the
+        #    transactions are fetched on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            transactions_future = executor.submit(self.model.get_user_transactions, email, password)
+            symbols = [holding.symbol for holding in holdings]
+            current_prices = self._fetch_current_prices(symbols)
+
+            # 3. Get user transactions (assuming structure is okay)
+            transactions = transactions_future.result()
+
+        # 4. Cost basis, average price and P&L for every symbol from the transaction history
+        snapshot = analyze_transactions(TransactionTable.from_json(transactions), current_prices)
+
+        total_portfolio_value = 0.0
+
+        for holding in holdings:
+            holding.current_price = current_prices.get(holding.symbol.strip().upper(), 0.0) # Default to 0 if price fetch failed
+            analytics = snapshot.get(holding.symbol)
+
+            # 5. Calculate total value for the holding
+            holding.total_value = holding.quantity * holding.current_price
+            total_portfolio_value += holding.total_value
+
+            if analytics:
+                holding.avg_price = analytics["avg_price"]
+                holding.realized_pnl = analytics["realized_pnl"]
+                holding.unrealized_pnl = holding.total_value - holding.quantity * holding.avg_price
+
+        return holdings, total_portfolio_value, transactions
+
+    def _on_portfolio_loaded(self, result):
+        """Update view with enriched holdings and transactions"""
+        holdings, total_portfolio_value, transactions = result
         try:
-            if not self.user_model.is_logged_in:
-                self.portfolio_update_failed.emit("User not logged in")
-                self.view.show_error("Please log in to view your portfolio")
-                return
-            
-            # Get user credentials from ApiClient
-            email = self.model.api_client.user_email
-            password = self.model.api_client.user_password
-            
-            if not email or not password:
-                 self.portfolio_update_failed.emit("User credentials not found")
-                 self.view.show_error("Could not retrieve user credentials. Please log in again.")
-                 return
-                
-            # 1. Get user holdings (symbol, quantity)
-            holdings_raw = self.model.get_user_holdings(email, password)
-            
-            if not isinstance(holdings_raw, list):
-                self.portfolio_update_failed.emit("Invalid holdings data received from API.")
-                self.view.show_error("Received invalid holdings data.")
-                return
-
-            enriched_holdings = []
-            total_portfolio_value = 0.0
-
-            # 2. Fetch current price for each holding
-            for holding in holdings_raw:
-                symbol = holding.get("stockSymbol")
-                quantity = holding.get("quantity")
-                
-                if not symbol or quantity is None:
-                    print(f"Warning: Skipping invalid holding data: {holding}")
-                    continue
-
-                try:
-                    # Use the api_client (shared instance) to get current price
-                    current_price_response = self.model.api_client.get_current_stock_data(symbol)
-                    # Assuming the response is the price directly (e.g., 210.555)
-                    current_price = float(current_price_response) 
-                except Exception as price_error:
-                    print(f"Warning: Could not fetch current price for {symbol}: {price_error}")
-                    current_price = 0.0 # Default to 0 if price fetch fails
-
-                # 3. Calculate total value for the holding
-                total_value_item = quantity * current_price
-                total_portfolio_value += total_value_item
-
-                # Add enriched data to the list
-                enriched_holdings.append({
-                    "stockSymbol": symbol,
-                    "quantity": quantity,
-                    "avg_price": holding.get("avg_price", 0.0), # Keep avg_price if available, else 0
-                    "current_price": current_price,
-                    "total_value": total_value_item
-                })
-
-            # 4. Get user transactions (assuming structure is okay)
-            transactions = self.model.get_user_transactions(email, password)
-            
-            # 5. Update view with enriched holdings and transactions
-            self.view.update_portfolio(enriched_holdings, total_portfolio_value)
+            self.view.update_portfolio(holdings, total_portfolio_value)
             self.view.update_transactions(transactions)
             
             self.portfolio_updated.emit()
-            
+
         except Exception as e:
-            error_message = str(e)
-            self.portfolio_update_failed.emit(error_message)
-            self.view.show_error(f"Failed to update portfolio: {error_message}")
+            self._on_portfolio_error(str(e))
+
+    def _on_portfolio_error(self, error_message: str):
+        """Handle a failed portfolio update"""
+        self.portfolio_update_failed.emit(error_message)
+        self.view.show_error(f"Failed to update portfolio: {error_message}")
     
+    def _fetch_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch current prices of all symbols, failed symbols are left out"""
+        try:
+            prices, errors = self.stock_model.get_current_stock_data_many(symbols)
+        except Exception as price_error:
+            print(f"Warning: Could not fetch current prices: {price_error}")
+            return {}
+        for symbol, error in errors.items():
+            print(f"Warning: Could not fetch current price for {symbol}: {error}")
+        return prices
+
     @Slot(str, float)
     def buy_stock(self, symbol: str, quantity: float):
         """Handle buy stock request using email and password"""
-        try:
-            if not self.user_model.is_logged_in:
-                self.transaction_failed.emit("User not logged in")
-                self.view.show_error("Please log in to buy stocks")
-                return
-            
-            # Get user credentials from ApiClient
-            email = self.model.api_client.user_email
-            password = self.model.api_client.user_password
-            
-            if not email or not password:
-                 self.transaction_failed.emit("User credentials not found")
-                 self.view.show_error("Could not retrieve user credentials. Please log in again.")
-                 return
-                
-            # Create transaction using email and password
-            result = self.model.create_transaction_by_email(
-                email,
-                password,
-                symbol,
-                quantity,
-                "Buy"
-            )
-            
-            # Update portfolio after transaction
-            self.update_portfolio()
-            
-            self.transaction_successful.emit()
-            self.view.show_success(f"Successfully bought {quantity} shares of {symbol}")
-            
-        except Exception as e:
-            error_message = str(e)
-            self.transaction_failed.emit(error_message)
-            self.view.show_error(f"Failed to buy stock: {error_message}")
+        self._submit_transaction(symbol, quantity, "Buy")
     
     @Slot(str, float)
     def sell_stock(self, symbol: str, quantity: float):
         """Handle sell stock request using email and password"""
-        try:
-            if not self.user_model.is_logged_in:
-                self.transaction_failed.emit("User not logged in")
-                self.view.show_error("Please log in to sell stocks")
-                return
-                
-            # Get user credentials from ApiClient
-            email = self.model.api_client.user_email
-            password = self.model.api_client.user_password
-            
-            if not email or not password:
-                 self.transaction_failed.emit("User credentials not found")
-                 self.view.show_error("Could not retrieve user credentials. Please log in again.")
-                 return
-                
-            # Create transaction using email and password
-            result = self.model.create_transaction_by_email(
-                email,
-                password,
-                symbol,
-                quantity,
-                "Sell"
-            )
-            
+        self._submit_transaction(symbol, quantity, "Sell")
+
+    def _submit_transaction(self, symbol: str, quantity: float, transaction_type: str):
+        """Create a Buy/Sell transaction on a worker thread"""
+        action = "buy" if transaction_type == "Buy" else "sell"
+
+        if not self.user_model.is_logged_in:
+            self.transaction_failed.emit("User not logged in")
+            self.view.show_error(f"Please log in to {action} stocks")
+            return
+        
+        # Get user credentials from ApiClient
+        email = self.model.api_client.user_email
+        password = self.model.api_client.user_password
+        
+        if not email or not password:
+             self.transaction_failed.emit("User credentials not found")
+             self.view.show_error("Could not retrieve user credentials. Please log in again.")
+             return
+
+        def on_success(result):
             # Update portfolio after transaction
             self.update_portfolio()
             
             self.transaction_successful.emit()
-            self.view.show_success(f"Successfully sold {quantity} shares of {symbol}")
-            
-        except Exception as e:
-            error_message = str(e)
+            past_tense = "bought" if transaction_type == "Buy" else "sold"
+            self.view.show_success(f"Successfully {past_tense} {quantity} shares of {symbol}")
+
+        def on_failure(error_message):
             self.transaction_failed.emit(error_message)
-            self.view.show_error(f"Failed to sell stock: {error_message}")
+            self.view.show_error(f"Failed to {action} stock: {error_message}")
+
+        # Create transaction using email and password
+        self.task_runner.submit(
+            self.model.create_transaction_by_email,
+            email,
+            password,
+            symbol,
+            quantity,
+            transaction_type,
+            on_result=on_success,
+            on_error=on_failure
+        )
@@ -1,5 +1,10 @@
 from PySide6.QtCore import QObject, Signal, Slot
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
+from utils.task_runner import TaskRunner
+from utils.request_scheduler import LatestRequestScheduler
+from models.records import PriceSeries
+from models.indicators import INDICATORS, IndicatorCache
+from models.resample import interval_for_range
 
 class StockChartPresenter(QObject):
     """
@@ -14,54 +19,105 @@ class StockChartPresenter(QObject):
         super().__init__()
         self.view = view
         self.model = model
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.view.set_busy)
+        # Scrolling or typing through the symbols only loads the one the user stops at
+        self.scheduler = LatestRequestScheduler(self.task_runner, delay_ms=300, parent=self)
+        # Indicator lines per (symbol, range, indicator), new bars only extend them
+        self.indicator_cache = IndicatorCache()
+        # (price series, range days) on screen, indicators toggled later are computed from it
+        self._shown = None
+        self.view.set_indicator_choices(list(INDICATORS))
 
         # Connect view signals to presenter slots
         self.view.refresh_button.clicked.connect(self.update_chart)
-        self.view.symbol_combo.currentIndexChanged.connect(self.update_chart)
-        self.view.range_combo.currentIndexChanged.connect(self.update_chart)
-
-        # Initial chart update
-        self.update_chart()
+        self.view.symbol_combo.currentIndexChanged.connect(self.schedule_chart_update)
+        self.view.range_combo.currentIndexChanged.connect(self.schedule_chart_update)
+        self.view.indicators_menu.triggered.connect(self.update_indicators)
+        self.view.chart_type_combo.currentIndexChanged.connect(self.update_chart_type)
 
     @Slot()
     def update_chart(self):
-        """Update the chart with current settings"""
-        try:
-            symbol = self.view.symbol_combo.currentText()
-            range_text = self.view.range_combo.currentText()
-
-            # Convert range text to days
-            range_days = self._get_range_days(range_text)
+        """Update the chart with current settings right away"""
+        self._request_chart(immediate=True)
 
-            # Get stock history data with improved error handling
-            try:
-                stock_history = self.model.get_stock_history(symbol, range_days)
-
-                # Check if we got valid data
-                if not stock_history or not isinstance(stock_history, list):
-                    self.view.show_error(f"No valid data received for {symbol}")
-                    self.view.clear_chart()
-                    return
+    @Slot()
+    def schedule_chart_update(self):
+        """Update the chart once the selection has settled"""
+        self._request_chart(immediate=False)
+
+    def _request_chart(self, immediate: bool):
+        symbol = self.view.symbol_combo.currentText()
+        range_text = self.view.range_combo.currentText()
+
+        # Convert range text to days
+        range_days = self._get_range_days(range_text)
+        # Long ranges are charted with weekly bars, built from the stored daily history
+        interval = interval_for_range(range_days)
+
+        # A symbol shown before is back on screen at once, the request below only adds what changed
+        self.view.show_cached_symbol(symbol.strip().upper(), range_days, interval)
+
+        # A newer selection supersedes any request still in flight
+        self.scheduler.schedule(
+            (symbol.strip().upper(), range_days, interval), self._load_chart_data, symbol, range_days, interval,
+            on_result=lambda chart_data: self._on_chart_data(symbol, range_days, chart_data),
+            on_error=self._on_chart_error,
+            immediate=immediate
+        )
+
+    def _load_chart_data(self, symbol: str, range_days: int, interval: str,
+                         is_cancelled: Optional[Callable[[], bool]] = None) -> PriceSeries:
+        """Fetch stock history as a price series with bars of the given interval (runs on a worker thread)"""
+        return self.model.get_price_series(symbol, range_days, is_cancelled=is_cancelled, interval=interval)
 
-                # Process data for chart based on the new structure
-                chart_data = self._process_data_for_chart(stock_history)
+    @Slot()
+    def update_chart_type(self):
+        """Redraw the loaded series as the selected chart type, no data is fetched"""
+        self.view.set_chart_type(self.view.chart_type_combo.currentText())
+        self.update_indicators()
 
-                # Display as line chart only (candlestick removed)
-                self.view.update_line_chart(chart_data)
+    @Slot()
+    def update_indicators(self):
+        """Draw the selected indicators over the price series on screen"""
+        if self._shown is None:
+            return
+        series, range_days = self._shown
+        lines = []
+        for label in self.view.selected_indicators():
+            spec = INDICATORS[label]
+            result = self.indicator_cache.get(series, range_days, spec)
+            if result is None:
+                print(f"Warning: {label} needs data {series.symbol} does not have")
+                continue
+            for line, values in result.items():
+                lines.append((label if len(result) == 1 else f"{label} {line}", values, spec.overlay))
+        self.view.set_overlays(series, lines)
+
+    def _on_chart_data(self, symbol: str, range_days: int, series: PriceSeries):
+        """Display the loaded price series"""
+        if len(series) == 0:
+            self._shown = None
+            self.view.show_error(f"No valid data received for {symbol}")
+            self.view.clear_chart()
+            return
 
-                self.chart_updated.emit()
+        try:
+            self.view.update_price_chart(series)
+            self._shown = (series, range_days)
+            self.update_indicators()
 
-            except Exception as e:
-                error_message = str(e)
-                self.chart_update_failed.emit(error_message)
-                self.view.show_error(f"Failed to update chart: {error_message}")
-                self.view.clear_chart()
+            self.chart_updated.emit()
 
         except Exception as e:
-            error_message = str(e)
-            self.chart_update_failed.emit(error_message)
-            self.view.show_error(f"Failed to update chart: {error_message}")
-            self.view.clear_chart()
+            self._on_chart_error(str(e))
+
+    def _on_chart_error(self, error_message: str):
+        """Handle a failed chart update"""
+        self._shown = None
+        self.chart_update_failed.emit(error_message)
+        self.view.show_error(f"Failed to update chart: {error_message}")
+        self.view.clear_chart()
 
     def _get_range_days(self, range_text: str) -> int:
         """Convert range text to number of days"""
@@ -77,45 +133,9 @@ class StockChartPresenter(QObject):
             return 180
         elif range_text == "1 Year":
             return 365
+        elif range_text == "2 Years":
+            return 730
+        elif range_text == "3 Years":
+            return 1095
         else:
             return 30  # Default to 1 month
-
-    def _process_data_for_chart(self, stock_history: list) -> list:
-        """Process stock history data (date, closePrice) for chart display"""
-        processed_data = []
-
-        if not stock_history or not isinstance(stock_history, list):
-            # Handle empty or invalid data
-            print("Warning: Received empty or invalid stock history data.")
-            return []
-
-        for item in stock_history:
-            # Adapt to the actual API response structure: date, closePrice
-            if not isinstance(item, dict):
-                print(f"Warning: Skipping invalid data point: {item}")
-                continue
-
-            date_str = item.get("date")
-            close_price = item.get("closePrice")
-
-            if date_str is None or close_price is None:
-                print(f"Warning: Skipping invalid data point: {item}")
-                continue
-
-            # Convert date string to datetime object if needed by chart view
-            # Assuming chart view expects ISO format string for date
-            processed_item = {
-                "date": date_str, # Keep as string, chart view will handle parsing
-                "price": float(close_price), # Use 'price' key for consistency in line chart view
-                # OHLC data is not available
-                "open": None,
-                "high": None,
-                "low": None,
-                "close": float(close_price) # Keep close price if needed elsewhere
-            }
-            processed_data.append(processed_item)
-
-        # Sort data by date ascending if necessary (API might already do this)
-        processed_data.sort(key=lambda x: x["date"])
-
-        return processed_data
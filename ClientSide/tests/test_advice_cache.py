@@ -0,0 +1,31 @@
+from models.advice_cache import AdviceCache
+
+
+def ask(cache, query, calls):
+    """Answer a question through the cache, recording every generation"""
+    def load():
+        calls.append(query)
+        return f"answer to {query}"
+    return cache.get_or_load(AdviceCache.query_key(query), load)
+
+
+def test_rephrased_question_shares_one_entry():
+    cache, calls = AdviceCache(), []
+    first = ask(cache, "should I buy AAPL", calls)
+    assert ask(cache, "is AAPL a buy", calls) == first
+    assert calls == ["should I buy AAPL"]
+
+
+def test_swapped_actions_are_separate_entries():
+    cache, calls = AdviceCache(), []
+    ask(cache, "sell AAPL buy MSFT", calls)
+    ask(cache, "buy AAPL sell MSFT", calls)
+    assert calls == ["sell AAPL buy MSFT", "buy AAPL sell MSFT"]
+
+
+def test_service_errors_are_not_cached():
+    cache = AdviceCache()
+    key = AdviceCache.query_key("should I buy AAPL")
+    assert cache.get_or_load(key, lambda: "Error getting answer: connection refused").startswith("Error")
+    assert cache.get_or_load(key, lambda: "Hold for now.") == "Hold for now."
+    assert cache.get(key) == "Hold for now."
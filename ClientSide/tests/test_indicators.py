@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from models.indicators import INDICATORS, IndicatorCache
+from models.records import PriceSeries
+
+N_BARS = 400
+
+
+def make_series(start, stop, close_override=None):
+    """Bars start..stop of one fixed random walk with OHLCV columns"""
+    rng = np.random.default_rng(7)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, N_BARS + 10)))
+    volume = rng.integers(1_000, 100_000, N_BARS + 10).astype(float)
+    if close_override is not None:
+        index, value = close_override
+        close[index] = value
+    dates = (np.datetime64("2020-01-01") + np.arange(N_BARS + 10)).astype("datetime64[s]")
+    window = slice(start, stop)
+    return PriceSeries("TEST", dates[window], close[window], close[window], close[window] * 1.01,
+                       close[window] * 0.99, volume[window])
+
+
+def assert_same_lines(actual, expected):
+    assert actual.keys() == expected.keys()
+    for line in expected:
+        np.testing.assert_allclose(actual[line], expected[line], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("label", list(INDICATORS))
+def test_shifted_window_matches_fresh_computation(label):
+    spec = INDICATORS[label]
+    cache = IndicatorCache()
+    cache.get(make_series(0, N_BARS), 365, spec)
+
+    shifted = make_series(5, N_BARS + 5)
+    assert_same_lines(cache.get(shifted, 365, spec), IndicatorCache().get(shifted, 365, spec))
+
+
+@pytest.mark.parametrize("label", list(INDICATORS))
+def test_appended_bars_are_computed_incrementally(label):
+    spec = INDICATORS[label]
+    cache = IndicatorCache()
+    cache.get(make_series(0, N_BARS), 365, spec)
+
+    appended = make_series(0, N_BARS + 3)
+    assert_same_lines(cache.get(appended, 365, spec), IndicatorCache().get(appended, 365, spec))
+    assert cache.stats()["partial"] == 1
+
+
+@pytest.mark.parametrize("label", list(INDICATORS))
+def test_updated_last_bar_matches_fresh_computation(label):
+    spec = INDICATORS[label]
+    cache = IndicatorCache()
+    cache.get(make_series(0, N_BARS), 365, spec)
+
+    updated = make_series(0, N_BARS, close_override=(N_BARS - 1, 123.0))
+    assert_same_lines(cache.get(updated, 365, spec), IndicatorCache().get(updated, 365, spec))
+
+
+def test_volatility_is_annualized_by_bar_interval():
+    spec = INDICATORS["Volatility 20"]
+    daily = make_series(0, N_BARS)
+    weekly = PriceSeries(daily.symbol, daily.dates, daily.close, interval="1W")
+    ratio = IndicatorCache().get(daily, 365, spec)["volatility"] / IndicatorCache().get(weekly, 365, spec)["volatility"]
+    np.testing.assert_allclose(ratio[~np.isnan(ratio)], np.sqrt(252 / 52))
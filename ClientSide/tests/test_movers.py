@@ -0,0 +1,55 @@
+import datetime
+
+import numpy as np
+
+from models.movers import MoversEngine
+from models.records import PriceSeries
+
+
+class FakeStockModel:
+    """Daily closes per symbol, symbols in `failing` raise like an unreachable gateway"""
+    def __init__(self, closes):
+        self.closes = closes
+        self.failing = set()
+        self.requests = []
+
+    def get_price_series(self, symbol, range_days, priority=None, is_cancelled=None):
+        self.requests.append(symbol)
+        if symbol in self.failing:
+            raise ConnectionError("gateway unreachable")
+        close = np.array(self.closes.get(symbol, []), dtype=float)
+        dates = (np.datetime64("2025-03-03") + np.arange(len(close))).astype("datetime64[s]")
+        return PriceSeries(symbol, dates, close)
+
+
+def make_engine(model):
+    return MoversEngine(model, universe=("AAA", "BBB"), index_proxies=(("INDEX", "IDX"),),
+                        today=lambda: datetime.date(2025, 3, 5))
+
+
+def test_failed_symbols_are_retried_by_the_next_refresh():
+    model = FakeStockModel({"IDX": [100, 101], "AAA": [10, 12], "BBB": [20, 15]})
+    model.failing = {"BBB"}
+    engine = make_engine(model)
+
+    movers = engine.refresh()
+    assert not movers.complete
+    assert [mover["symbol"] for mover in movers.losers] == []
+
+    model.failing.clear()
+    model.requests.clear()
+    movers = engine.refresh()
+    assert model.requests == ["BBB"]
+    assert movers.complete
+    assert [mover["symbol"] for mover in movers.losers] == ["BBB"]
+
+
+def test_empty_history_is_not_marked_loaded():
+    model = FakeStockModel({"IDX": [100, 101], "AAA": [10, 12]})
+    engine = make_engine(model)
+
+    assert engine.refresh().loaded == 2
+    model.closes["BBB"] = [20, 15]
+    model.requests.clear()
+    assert engine.refresh().complete
+    assert model.requests == ["BBB"]
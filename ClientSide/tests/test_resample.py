@@ -0,0 +1,43 @@
+import numpy as np
+
+from models.records import PriceSeries
+from models.resample import MONTHLY, WEEKLY, resample
+
+
+def trading_days(first, count):
+    """Weekdays from `first` on, as a daily bar series would have them"""
+    days = np.datetime64(first) + np.arange(count * 2)
+    weekdays = (days.astype(np.int64) + 3) % 7
+    return days[weekdays < 5][:count].astype("datetime64[s]")
+
+
+def test_open_week_keeps_its_date_as_days_are_added():
+    dates = trading_days("2025-01-06", 40)
+    close = np.arange(40, dtype=float)
+    before = resample(PriceSeries("TEST", dates[:-1], close[:-1]), WEEKLY)
+    after = resample(PriceSeries("TEST", dates, close), WEEKLY)
+
+    assert len(before) == len(after)
+    np.testing.assert_array_equal(before.dates, after.dates)
+    assert after.close[-1] == close[-1]
+
+
+def test_bars_aggregate_their_bucket():
+    dates = trading_days("2025-01-06", 10)
+    close = np.arange(10, dtype=float) + 100
+    series = PriceSeries("TEST", dates, close, close - 1, close + 2, close - 2, np.ones(10))
+    weekly = resample(series, WEEKLY)
+
+    np.testing.assert_array_equal(weekly.dates.astype("datetime64[D]"),
+                                  np.array(["2025-01-06", "2025-01-13"], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(weekly.open, [99, 104])
+    np.testing.assert_array_equal(weekly.high, [106, 111])
+    np.testing.assert_array_equal(weekly.low, [98, 103])
+    np.testing.assert_array_equal(weekly.close, [104, 109])
+    np.testing.assert_array_equal(weekly.volume, [5, 5])
+
+
+def test_monthly_bars_start_on_the_first():
+    monthly = resample(PriceSeries("TEST", trading_days("2025-01-15", 40), np.ones(40)), MONTHLY)
+    np.testing.assert_array_equal(monthly.dates.astype("datetime64[D]"),
+                                  np.array(["2025-01-01", "2025-02-01", "2025-03-01"], dtype="datetime64[D]"))
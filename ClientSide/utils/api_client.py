@@ -1,18 +1,240 @@
 import requests
-import json
-from typing import Dict, Any, Optional, List, Union
+import codecs
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from typing import Callable, Dict, Any, Iterator, Optional, List, Tuple, Union
+from utils.json_decode import DECODE_ERRORS, loads
+from utils.metrics import RequestMetrics, RequestRecord
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+# (connect, read) timeouts in seconds, by endpoint template prefix (first match wins)
+DEFAULT_TIMEOUT = (3.05, 15.0)
+ENDPOINT_TIMEOUTS = [
+    # Advice is generated by a local LLM and can take minutes
+    ("/api/AIAdvisor/", (3.05, 300.0)),
+    ("/api/StockData/stock-history/", (3.05, 30.0)),
+    ("/api/StockData/stock-weekly-history", (3.05, 30.0))
+]
+
+# Upstream service behind each gateway route, every upstream has its own circuit breaker
+GATEWAY_UPSTREAM = "gateway"
+ENDPOINT_UPSTREAMS = [
+    ("/api/StockData/", "market-data"),
+    ("/api/AIAdvisor/", "ai-advisor"),
+    ("/api/StockManagement/", "stock-management"),
+    ("/api/User/", "user")
+]
+
+# Connection timings of the request currently sent by each thread
+_connection_timing = threading.local()
+
+
+class _TimedConnectionMixin:
+    """
+    Resolves the host itself so the DNS lookup and the TCP connect
+    of a new connection can be timed separately
+    """
+    def _new_conn(self):
+        started = time.perf_counter()
+        host = self._dns_host
+        try:
+            addresses = list(dict.fromkeys(
+                info[4][0] for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+            ))
+        except OSError:
+            # Let urllib3 resolve again and raise its usual error
+            addresses = [host]
+        resolved = time.perf_counter()
+
+        try:
+            for i, address in enumerate(addresses):
+                # Connect to the resolved address, like create_connection tries each one in turn
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+        timing = getattr(_connection_timing, "current", None)
+        if timing is not None:
+            timing.dns = resolved - started
+            timing.connect = time.perf_counter() - resolved
+        return sock
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps track of the connection pools it hands out
+    so the number of new vs. reused connections can be reported
+    """
+    def __init__(self, *args, **kwargs):
+        self._pools = set()
+        self._pools_lock = threading.Lock()
+        # Counters carried over from pools that were closed on idle expiry
+        self._retired_requests = 0
+        self._retired_connections = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+    def _track(self, pool):
+        with self._pools_lock:
+            self._pools.add(pool)
+        return pool
+
+    def get_connection_with_tls_context(self, *args, **kwargs):
+        return self._track(super().get_connection_with_tls_context(*args, **kwargs))
+
+    def get_connection(self, *args, **kwargs):
+        # Used by requests < 2.32
+        return self._track(super().get_connection(*args, **kwargs))
+
+    def close_pools(self):
+        """Close every pooled connection, keeping the counters"""
+        with self._pools_lock:
+            for pool in self._pools:
+                self._retired_requests += pool.num_requests
+                self._retired_connections += pool.num_connections
+            self._pools.clear()
+        self.poolmanager.clear()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Get request / connection counters for all pools"""
+        with self._pools_lock:
+            requests_sent = self._retired_requests + sum(pool.num_requests for pool in self._pools)
+            connections_opened = self._retired_connections + sum(pool.num_connections for pool in self._pools)
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(requests_sent - connections_opened, 0)
+        }
+
+
+class _InFlightRequest:
+    """A GET request in progress whose outcome is shared with identical callers"""
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
 
 class ApiClient:
     """
     API Client for the Gateway API
     Handles all API requests to the gateway server
+
+    All requests go through one pooled keep-alive session. Use close()
+    (or the client as a context manager) to release the connections.
     """
-    def __init__(self, base_url: str = "http://localhost:9000"):
+    def __init__(self, base_url: str = "http://localhost:9000",
+                 pool_connections: int = 4, pool_maxsize: int = 64,
+                 pool_block: bool = False, keepalive_timeout: float = 60.0):
+        """
+        pool_connections: number of per-host pools to keep
+        pool_maxsize: maximum kept-alive connections per host
+        pool_block: block instead of opening extra connections when a host's pool is exhausted
+        keepalive_timeout: seconds of inactivity after which pooled connections are dropped
+        """
         self.base_url = base_url
         self.token = None
         self.user_id = None
         self.user_email = None
         self.user_password = None # Note: Storing password in memory is not ideal for production
+
+        self.keepalive_timeout = keepalive_timeout
+        self.pool_maxsize = pool_maxsize
+        self._adapter = _PooledAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block)
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._last_used = time.monotonic()
+        self._idle_lock = threading.Lock()
+
+        # Identical GET requests in flight share one underlying request
+        self._in_flight: Dict[tuple, _InFlightRequest] = {}
+        self._in_flight_lock = threading.Lock()
+        self.coalesced_requests = 0
+
+        # Idempotent GETs are retried, and failing upstreams are cut off by their breaker.
+        # Connection failures count against the gateway itself, 502/503/504 and read
+        # timeouts against the upstream service behind the route
+        self.retry_policy = RetryPolicy()
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name)
+            for name in [GATEWAY_UPSTREAM] + [upstream for _, upstream in ENDPOINT_UPSTREAMS]
+        }
+
+        # Every sent request is reported to the hooks, metrics collects per-endpoint timings
+        self.metrics = RequestMetrics()
+        self._request_hooks: List[Callable[[RequestRecord], None]] = [self.metrics.record]
+
+    def add_request_hook(self, hook: Callable[[RequestRecord], None]):
+        """Call hook(record) after every request sent (from the sending thread)"""
+        self._request_hooks.append(hook)
+
+    def remove_request_hook(self, hook: Callable[[RequestRecord], None]):
+        """Stop calling a hook added with add_request_hook"""
+        self._request_hooks.remove(hook)
+
+    def add_breaker_listener(self, listener: Callable[[str, str, str], None]):
+        """Call listener(upstream, old_state, new_state) when any circuit breaker changes state"""
+        for breaker in self.breakers.values():
+            breaker.add_listener(listener)
+
+    def close(self):
+        """Close the HTTP session and all pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def connection_reuse_count(self) -> int:
+        """Number of requests that were served over an already open connection"""
+        return self._adapter.connection_stats()["connections_reused"]
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Get pooled connection statistics (requests, connections opened, connections reused)"""
+        return self._adapter.connection_stats()
     
     def set_token(self, token: str):
         """Set authentication token after login"""
@@ -44,17 +266,185 @@ class ApiClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
     
+    def _expire_idle_connections(self):
+        """Drop pooled connections that have been idle longer than the keep-alive timeout"""
+        with self._idle_lock:
+            now = time.monotonic()
+            idle = now - self._last_used
+            self._last_used = now
+        if self.keepalive_timeout is not None and idle > self.keepalive_timeout:
+            self._adapter.close_pools()
+
+    def _request(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, sharing the response of an identical GET already in flight
+        endpoint is the URL template the request is reported under in the metrics
+        """
+        if method.upper() != "GET" or kwargs.get("stream"):
+            return self._send(method, url, endpoint, **kwargs)
+
+        params = kwargs.get("params")
+        key = (method.upper(), url, tuple(sorted(params.items())) if isinstance(params, dict) else params)
+        with self._in_flight_lock:
+            call = self._in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._in_flight[key] = _InFlightRequest()
+            else:
+                self.coalesced_requests += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = self._send(method, url, endpoint, **kwargs)
+            return call.response
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def _send(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session and report its timings
+        GETs are retried with backoff on connection errors, timeouts and 502/503/504
+        """
+        self._expire_idle_connections()
+        kwargs.setdefault("headers", self._get_headers())
+        endpoint = endpoint or urlsplit(url).path
+        kwargs.setdefault("timeout", self._timeout_for(endpoint))
+        gateway = self.breakers[GATEWAY_UPSTREAM]
+        upstream = self.breakers.get(self._upstream_for(endpoint))
+        attempts = self.retry_policy.max_attempts if method.upper() == "GET" else 1
+
+        record = RequestRecord(method.upper(), endpoint)
+        _connection_timing.current = record
+        started = time.perf_counter()
+        try:
+            response = None
+            last_error = None
+            for attempt in range(attempts):
+                if attempt > 0:
+                    record.retries += 1
+                    time.sleep(self.retry_policy.delay(attempt - 1))
+                try:
+                    response = self._send_once(method, url, kwargs, gateway, upstream)
+                except CircuitOpenError:
+                    # A retry found the circuit opened by the previous attempts,
+                    # report what actually went wrong
+                    if response is not None:
+                        break
+                    if last_error is not None:
+                        raise last_error
+                    raise
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt == attempts - 1:
+                        raise
+                    last_error = e
+                    continue
+                if response.status_code not in self.retry_policy.retry_statuses or attempt == attempts - 1:
+                    break
+                response.close()
+
+            record.status = response.status_code
+            record.ttfb = response.elapsed.total_seconds()
+            if kwargs.get("stream"):
+                record.bytes = int(response.headers.get("Content-Length") or 0)
+            else:
+                record.bytes = len(response.content)
+            return response
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.total = time.perf_counter() - started
+            _connection_timing.current = None
+            self._report(record)
+
+    def _send_once(self, method: str, url: str, kwargs: dict, gateway: CircuitBreaker,
+                   upstream: Optional[CircuitBreaker]) -> requests.Response:
+        """Send one attempt, recording its outcome in the circuit breakers"""
+        breakers = [gateway] if upstream is None else [gateway, upstream]
+        allowed = []
+        try:
+            for breaker in breakers:
+                breaker.before_call()
+                allowed.append(breaker)
+        except CircuitOpenError:
+            for breaker in allowed:
+                breaker.release()
+            raise
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.ConnectionError:
+            # Includes connect timeouts, the gateway could not be reached
+            gateway.record_failure()
+            if upstream is not None:
+                upstream.release()
+            raise
+        except requests.Timeout:
+            # The gateway accepted the request but the service behind it did not answer,
+            # without a breaker for that service the timeout counts against the gateway
+            if upstream is not None:
+                gateway.record_success()
+                upstream.record_failure()
+            else:
+                gateway.record_failure()
+            raise
+        except Exception:
+            for breaker in breakers:
+                breaker.release()
+            raise
+
+        gateway.record_success()
+        if upstream is not None:
+            if response.status_code in self.retry_policy.retry_statuses:
+                upstream.record_failure()
+            else:
+                upstream.record_success()
+        return response
+
+    def _timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """(connect, read) timeout for an endpoint template"""
+        for prefix, timeout in ENDPOINT_TIMEOUTS:
+            if endpoint.startswith(prefix):
+                return timeout
+        return DEFAULT_TIMEOUT
+
+    @staticmethod
+    def _upstream_for(endpoint: str) -> Optional[str]:
+        """Name of the upstream service behind an endpoint template"""
+        for prefix, upstream in ENDPOINT_UPSTREAMS:
+            if endpoint.startswith(prefix):
+                return upstream
+        return None
+
+    def _report(self, record: RequestRecord):
+        """Pass a request record to every hook, a failing hook must not fail the request"""
+        for hook in list(self._request_hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                print(f"Warning: Request hook failed: {e}")
+
     def _handle_response(self, response: requests.Response) -> Any:
         """Handle API response and return data or raise exception"""
         if response.status_code >= 200 and response.status_code < 300:
             try:
-                return response.json()
-            except json.JSONDecodeError:
+                return loads(response.content)
+            except DECODE_ERRORS:
                 return response.text
         else:
             error_message = f"API Error: {response.status_code}"
             try:
-                error_data = response.json()
+                error_data = loads(response.content)
                 if isinstance(error_data, dict) and "message" in error_data:
                     error_message = f"{error_message} - {error_data['message']}"
                 elif isinstance(error_data, str):
@@ -71,7 +461,7 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/User/V2/Registration", json=data)
         return self._handle_response(response)
     
     def login_user(self, email: str, password: str) -> Any:
@@ -81,7 +471,7 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/User/V2/Login", json=data)
         result = self._handle_response(response)
         
         # Only store credentials if login was successful
@@ -110,7 +500,7 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/User/V2/UserId", json=data)
         result = self._handle_response(response)
         # Assuming the response contains user ID information
         if isinstance(result, dict) and "userId" in result:
@@ -127,7 +517,7 @@ class ApiClient:
         }
         if new_email:
             data["newEmail"] = new_email
-        response = requests.put(url, headers=self._get_headers(), json=data)
+        response = self._request("PUT", url, endpoint="/api/User/V2/UpdatePassword", json=data)
         # Update stored credentials if email changed
         if new_email:
             self.set_user_credentials(new_email, new_password)
@@ -142,33 +532,106 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.delete(url, headers=self._get_headers(), params=params)
+        response = self._request("DELETE", url, endpoint="/api/User/V2/DeleteUser", params=params)
         return self._handle_response(response)
     
     # AIAdvisor API endpoints
     def get_ai_advice(self, query: str) -> Any:
         """Get AI advice based on query"""
         url = f"{self.base_url}/api/AIAdvisor/AIadvice/{query}"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._request("GET", url, endpoint="/api/AIAdvisor/AIadvice/{query}")
         return self._handle_response(response)
     
+    def stream_ai_advice(self, query: str) -> Iterator[str]:
+        """
+        Get AI advice based on query as text chunks while it is generated
+        Closing the iterator early drops the connection, which cancels generation
+        """
+        url = f"{self.base_url}/api/AIAdvisor/AIadvice-stream/{query}"
+        endpoint = "/api/AIAdvisor/AIadvice-stream/{query}"
+        started = time.perf_counter()
+        response = self._request("GET", url, endpoint=endpoint, stream=True)
+        if response.status_code in (404, 405):
+            # Gateway without the streaming route, deliver the whole answer at once
+            response.close()
+            yield self.get_ai_advice(query)
+            return
+
+        try:
+            if response.status_code >= 300:
+                self._handle_response(response)
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            first = True
+            for chunk in response.iter_content(chunk_size=None):
+                text = decoder.decode(chunk)
+                if not text:
+                    continue
+                if first:
+                    first = False
+                    self.metrics.observe("GET", endpoint, "ttft", time.perf_counter() - started)
+                yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+            self.metrics.observe("GET", endpoint, "stream", time.perf_counter() - started)
+        finally:
+            response.close()
+
     def get_history_based_advice(self, stock_symbol: str) -> Any:
         """Get AI advice based on stock history"""
         url = f"{self.base_url}/api/AIAdvisor/based-history-advice/{stock_symbol}"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._request("GET", url, endpoint="/api/AIAdvisor/based-history-advice/{stock_symbol}")
         return self._handle_response(response)
     
     # StockData API endpoints
     def get_current_stock_data(self, symbol: str) -> Any:
         """Get current stock data for a symbol"""
         url = f"{self.base_url}/api/StockData/current-data/{symbol}"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._request("GET", url, endpoint="/api/StockData/current-data/{symbol}")
         return self._handle_response(response)
     
+    def get_current_stock_data_many(self, symbols: List[str]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Get current prices for several symbols in one request
+        Returns (symbol -> price, symbol -> error message)
+        """
+        if not symbols:
+            return {}, {}
+        url = f"{self.base_url}/api/StockData/current-data"
+        params = {"symbols": ",".join(symbols)}
+        response = self._request("GET", url, endpoint="/api/StockData/current-data", params=params)
+        if response.status_code in (404, 405):
+            # Gateway without the batch route, fall back to one request per symbol
+            return self._get_current_stock_data_each(symbols)
+
+        result = self._handle_response(response)
+        if not isinstance(result, dict):
+            raise Exception("Invalid batch price response from server")
+        prices = {symbol: float(price) for symbol, price in (result.get("prices") or {}).items()}
+        errors = dict(result.get("errors") or {})
+        return prices, errors
+
+    def _get_current_stock_data_each(self, symbols: List[str]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """Get current prices with one concurrent request per symbol"""
+        def fetch(symbol):
+            try:
+                return symbol, float(self.get_current_stock_data(symbol)), None
+            except Exception as e:
+                return symbol, None, str(e)
+
+        prices, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=min(len(symbols), self.pool_maxsize)) as executor:
+            for symbol, price, error in executor.map(fetch, symbols):
+                if error is None:
+                    prices[symbol] = price
+                else:
+                    errors[symbol] = error
+        return prices, errors
+    
     def get_stock_history(self, symbol: str, range_days: int) -> Any:
         """Get stock history for a symbol and range"""
         url = f"{self.base_url}/api/StockData/stock-history/{symbol}/{range_days}"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._request("GET", url, endpoint="/api/StockData/stock-history/{symbol}/{range_days}")
         try:
             return self._handle_response(response)
         except Exception as e:
@@ -177,6 +640,24 @@ class ApiClient:
             # Return empty list instead of raising exception
             return []
     
+    def stream_stock_history(self, symbol: str, range_days: int) -> Iterator[bytes]:
+        """
+        Get the raw stock-history body in chunks as it arrives, for incremental decoding
+        Yields nothing when the gateway answers with an error
+        """
+        url = f"{self.base_url}/api/StockData/stock-history/{symbol}/{range_days}"
+        response = self._request("GET", url, endpoint="/api/StockData/stock-history/{symbol}/{range_days}", stream=True)
+        try:
+            if response.status_code >= 300:
+                try:
+                    self._handle_response(response)
+                except Exception as e:
+                    print(f"Error fetching stock history: {str(e)}")
+                return
+            yield from response.iter_content(chunk_size=64 * 1024)
+        finally:
+            response.close()
+    
     def get_stock_weekly_history(self, symbol: str, range_days: int, interval: int) -> Any:
         """Get stock weekly history for a symbol, range, and interval"""
         url = f"{self.base_url}/api/StockData/stock-weekly-history"
@@ -185,7 +666,7 @@ class ApiClient:
             "range": range_days,
             "interval": interval
         }
-        response = requests.get(url, headers=self._get_headers(), params=params)
+        response = self._request("GET", url, endpoint="/api/StockData/stock-weekly-history", params=params)
         try:
             return self._handle_response(response)
         except Exception as e:
@@ -206,7 +687,7 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/StockManagement/holding", json=data)
         return self._handle_response(response)
     
     def get_user_transactions(self, email: Optional[str] = None, password: Optional[str] = None) -> Any:
@@ -220,7 +701,7 @@ class ApiClient:
             "email": email,
             "password": password
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/StockManagement/transactions", json=data)
         return self._handle_response(response)
     
     def create_transaction(self, client_id: int, stock_symbol: str, quantity: float, transaction_type: str) -> Any:
@@ -232,7 +713,7 @@ class ApiClient:
             "quantity": quantity,
             "transactionType": transaction_type
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/StockManagement/transaction", json=data)
         return self._handle_response(response)
     
     def create_transaction_by_email(self, email: str, password: str, stock_symbol: str, 
@@ -246,5 +727,5 @@ class ApiClient:
             "quantity": quantity,
             "transactionType": transaction_type
         }
-        response = requests.post(url, headers=self._get_headers(), json=data)
+        response = self._request("POST", url, endpoint="/api/StockManagement/transactionByEmail", json=data)
         return self._handle_response(response)
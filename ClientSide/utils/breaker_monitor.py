@@ -0,0 +1,36 @@
+from typing import List
+from PySide6.QtCore import QObject, Signal
+from utils.resilience import CLOSED
+
+
+class BreakerMonitor(QObject):
+    """
+    Re-emits the ApiClient's circuit breaker changes as Qt signals
+    Breakers change state on worker threads, the signals are delivered
+    on the thread this object lives in (the GUI thread).
+    """
+
+    # upstream name, new state ("closed", "open" or "half_open")
+    state_changed = Signal(str, str)
+    # names of the upstreams whose circuit is not closed, empty when all are healthy
+    degraded_changed = Signal(object)
+    # Internal hop so the state bookkeeping also runs on the GUI thread
+    _breaker_changed = Signal(str, str)
+
+    def __init__(self, api_client, parent=None):
+        super().__init__(parent)
+        self._states = {name: breaker.state for name, breaker in api_client.breakers.items()}
+        self._breaker_changed.connect(self._on_breaker_changed)
+        api_client.add_breaker_listener(lambda name, old_state, new_state: self._breaker_changed.emit(name, new_state))
+
+    @property
+    def degraded_upstreams(self) -> List[str]:
+        return sorted(name for name, state in self._states.items() if state != CLOSED)
+
+    def _on_breaker_changed(self, name: str, state: str):
+        was_degraded = self.degraded_upstreams
+        self._states[name] = state
+        self.state_changed.emit(name, state)
+        degraded = self.degraded_upstreams
+        if degraded != was_degraded:
+            self.degraded_changed.emit(degraded)
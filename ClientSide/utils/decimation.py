@@ -0,0 +1,51 @@
+import numpy as np
+from typing import Tuple
+
+
+def min_max_decimate(x: np.ndarray, y: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most ~2 * n_buckets points by keeping the
+    minimum and maximum of every bucket (in x order), plus the first
+    and last point. Peaks survive, which keeps a line chart visually
+    identical at one bucket per pixel.
+    """
+    n = len(x)
+    if n_buckets <= 0 or n <= 2 * n_buckets:
+        return x, y
+
+    bucket_size = int(np.ceil(n / n_buckets))
+    n_buckets = int(np.ceil(n / bucket_size))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    offsets = np.arange(n_buckets) * bucket_size
+    min_index = offsets + np.nanargmin(buckets, axis=1)
+    max_index = offsets + np.nanargmax(buckets, axis=1)
+
+    keep = np.unique(np.concatenate(([0, n - 1], min_index, max_index)))
+    return x[keep], y[keep]
+
+
+def ohlc_aggregate(x: np.ndarray, bars: np.ndarray, max_bars: int, first_index: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge runs of consecutive (open, high, low, close) bars until about
+    max_bars remain. A run keeps its first open, highest high, lowest low
+    and last close and sits at the middle of its x span. Runs start at
+    multiples of the run length counted from the full series (the slice
+    starts at `first_index`), so panning keeps the same runs.
+    """
+    n = len(x)
+    if max_bars <= 0 or n <= max_bars:
+        return x, bars
+
+    step = int(np.ceil(n / max_bars))
+    starts = np.unique(np.concatenate(([0], np.arange((-first_index) % step, n, step))))
+    ends = np.append(starts[1:], n) - 1
+
+    merged = np.empty((len(starts), 4))
+    merged[:, 0] = bars[starts, 0]
+    merged[:, 1] = np.maximum.reduceat(bars[:, 1], starts)
+    merged[:, 2] = np.minimum.reduceat(bars[:, 2], starts)
+    merged[:, 3] = bars[ends, 3]
+    return (x[starts] + x[ends]) / 2, merged
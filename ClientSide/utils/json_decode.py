@@ -0,0 +1,134 @@
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Fastest available decoder: msgspec, then orjson, then the standard library
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    loads: Callable[[bytes], Any] = msgspec.json.Decoder().decode
+    DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+elif orjson is not None:
+    JSON_BACKEND = "orjson"
+    loads = orjson.loads
+    DECODE_ERRORS = (ValueError,)
+else:
+    JSON_BACKEND = "json"
+    loads = json.loads
+    DECODE_ERRORS = (ValueError,)
+
+# A string, or an array item without nested arrays/objects: a flat object or a scalar.
+# Written as "unrolled loops" (normal* (special normal*)*): the parts start with
+# different characters, so the regex engine never backtracks more than one item
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_FLAT_ITEM = rb'(?:\{[^{}\[\]"]*(?:' + _STRING + rb'[^{}\[\]"]*)*\}|' + _STRING + rb'|[^\s,\[\]{}"]+)'
+# Complete items, each followed by its comma
+_FLAT_RUN = re.compile(rb'(?:\s*' + _FLAT_ITEM + rb'\s*,)+')
+# The array's last item (if any) and its closing bracket
+_ARRAY_END = re.compile(rb'\s*(' + _FLAT_ITEM + rb')?\s*\]')
+# Strings (skipped whole, they may contain brackets and commas), structural
+# characters, or an opening quote whose string is not complete yet
+_TOKEN_PATTERN = re.compile(_STRING + rb'|[\[\]{},]|"')
+
+
+def iter_array_batches(chunks: Iterable[bytes], decode: Callable[[bytes], Any] = loads) -> Iterator[List[Any]]:
+    """
+    Decode a top-level JSON array incrementally, yielding its items in batches
+
+    Runs of complete items are decoded with one decode() call on the bytes
+    "[item, item, ...]", so the per-item work stays inside the decoder.
+    Only the current chunk and an incomplete item are buffered, the array
+    is never held as a whole, neither as bytes nor as Python objects.
+    `decode` turns such bytes into a list, e.g. a typed decoder.
+
+    An empty body yields nothing, anything else that is not a complete
+    JSON array raises ValueError.
+    """
+    buffer = b""
+    # Start of the next item, None until the opening bracket was read
+    position = None
+    finished = False
+    received = False
+    for chunk in chunks:
+        if finished or not chunk:
+            continue
+        buffer += chunk
+        received = received or bool(chunk.strip())
+
+        if position is None:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            if stripped[:1] != b"[":
+                raise ValueError("Response is not a JSON array")
+            position = len(buffer) - len(stripped) + 1
+
+        # Fast path for arrays of objects: cut after the last "}," and decode up to there.
+        # That only parses when the cut is between two top-level items (a cut inside a
+        # string or a nested object leaves it unterminated), otherwise scan below
+        split = buffer.rfind(b"},", position)
+        if split >= position:
+            try:
+                batch = decode(b"[" + buffer[position:split + 1] + b"]")
+            except DECODE_ERRORS:
+                pass
+            else:
+                yield batch
+                position = split + 2
+
+        while True:
+            run = _FLAT_RUN.match(buffer, position)
+            if run is not None:
+                yield decode(b"[" + buffer[position:run.end() - 1] + b"]")
+                position = run.end()
+                continue
+            end = _ARRAY_END.match(buffer, position)
+            if end is not None:
+                if end.group(1) is not None:
+                    yield decode(b"[" + end.group(1) + b"]")
+                finished = True
+                break
+            # A nested item, or the next item is not complete yet
+            item_end = _nested_item_end(buffer, position)
+            if item_end is None:
+                break
+            yield decode(b"[" + buffer[position:item_end] + b"]")
+            position = item_end + 1
+            if buffer[item_end:position] == b"]":
+                finished = True
+                break
+
+        # Drop what was already decoded
+        buffer = buffer[position:]
+        position = 0
+
+    if received and not finished:
+        raise ValueError("Incomplete JSON array")
+
+
+def _nested_item_end(buffer: bytes, position: int) -> Optional[int]:
+    """Index of the comma or bracket that ends the item starting at position, None while it is incomplete"""
+    depth = 0
+    for match in _TOKEN_PATTERN.finditer(buffer, position):
+        token = match.group()
+        if token == b'"':
+            # The string continues in the next chunk
+            return None
+        if token in (b"[", b"{"):
+            depth += 1
+        elif token in (b"]", b"}"):
+            if depth == 0:
+                return match.start()
+            depth -= 1
+        elif token == b"," and depth == 0:
+            return match.start()
+    return None
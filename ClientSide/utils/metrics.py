@@ -0,0 +1,193 @@
+import bisect
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+# Upper bounds (seconds) of the latency buckets: 1 ms to ~2 min, each 25% wider
+# than the previous one, so quantiles are within ~12% of the true value
+LATENCY_BUCKETS = tuple(0.001 * 1.25 ** i for i in range(53))
+QUANTILES = (0.5, 0.95, 0.99)
+PHASES = ("dns", "connect", "ttfb", "total")
+# Phases observed after the request returned, for streamed responses
+STREAM_PHASES = ("ttft", "stream")
+
+
+class RequestRecord:
+    """Timing and size of one request sent by the ApiClient"""
+    __slots__ = ("method", "endpoint", "status", "bytes", "dns", "connect", "ttfb", "total", "retries", "error")
+
+    def __init__(self, method: str, endpoint: str, status: int = 0, bytes: int = 0,
+                 dns: Optional[float] = None, connect: Optional[float] = None,
+                 ttfb: Optional[float] = None, total: float = 0.0, retries: int = 0,
+                 error: Optional[str] = None):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status
+        self.bytes = bytes
+        # dns and connect are only set when the request opened a new connection
+        self.dns = dns
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+        self.retries = retries
+        self.error = error
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram, its memory does not grow with the
+    number of samples. Quantiles are interpolated inside the bucket.
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One extra slot for samples above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0..1), None without samples"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                value = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(max(value, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {"count": self.count, "mean": self.sum / self.count if self.count else None, "max": self.max}
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}"] = self.quantile(q)
+        return summary
+
+
+class _EndpointStats:
+    """Aggregated records of one endpoint"""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.retries = 0
+        self.statuses: Dict[int, int] = {}
+        self.phases = {phase: LatencyHistogram() for phase in PHASES + STREAM_PHASES}
+
+    def add(self, record: RequestRecord):
+        self.count += 1
+        self.bytes += record.bytes
+        self.retries += record.retries
+        if record.error is not None or record.status >= 400:
+            self.errors += 1
+        self.statuses[record.status] = self.statuses.get(record.status, 0) + 1
+        for phase in PHASES:
+            value = getattr(record, phase)
+            if value is not None:
+                self.phases[phase].add(value)
+
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint request metrics
+    Endpoints are keyed by method and URL template, e.g.
+    "GET /api/StockData/current-data/{symbol}", so every symbol
+    shares one histogram.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointStats] = {}
+
+    def record(self, record: RequestRecord):
+        """Add one request, usable directly as an ApiClient request hook"""
+        with self._lock:
+            self._stats(record.method, record.endpoint).add(record)
+
+    def observe(self, method: str, endpoint: str, phase: str, seconds: float):
+        """
+        Add a timing measured while a streamed response is read
+        ("ttft" = time to first token, "stream" = until the last one)
+        """
+        with self._lock:
+            self._stats(method, endpoint).phases[phase].add(seconds)
+
+    def _stats(self, method: str, endpoint: str) -> "_EndpointStats":
+        key = f"{method} {endpoint}"
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    def reset(self):
+        """Forget every recorded request"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-endpoint counters and latency summaries (seconds)"""
+        with self._lock:
+            return {
+                key: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "bytes": stats.bytes,
+                    "retries": stats.retries,
+                    "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+                    **{phase: histogram.summary() for phase, histogram in stats.phases.items()}
+                }
+                for key, stats in sorted(self._endpoints.items())
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export the snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "stock_app_api") -> str:
+        """Export the metrics in the Prometheus text exposition format"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines: List[str] = [
+                f"# HELP {prefix}_requests_total Requests sent per endpoint and status",
+                f"# TYPE {prefix}_requests_total counter"
+            ]
+            for key, stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{prefix}_requests_total{{{_labels(key)},status="{status}"}} {count}')
+
+            for name, attribute, help_text in (("response_bytes_total", "bytes", "Response bytes received"),
+                                               ("retries_total", "retries", "Retried attempts")):
+                lines.append(f"# HELP {prefix}_{name} {help_text} per endpoint")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for key, stats in endpoints:
+                    lines.append(f"{prefix}_{name}{{{_labels(key)}}} {getattr(stats, attribute)}")
+
+            lines.append(f"# HELP {prefix}_request_duration_seconds Request phase durations per endpoint")
+            lines.append(f"# TYPE {prefix}_request_duration_seconds summary")
+            for key, stats in endpoints:
+                for phase, histogram in stats.phases.items():
+                    if histogram.count == 0:
+                        continue
+                    labels = f'{_labels(key)},phase="{phase}"'
+                    for q in QUANTILES:
+                        lines.append(f'{prefix}_request_duration_seconds{{{labels},quantile="{q}"}} {histogram.quantile(q):.6f}')
+                    lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                    lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: str) -> str:
+    method, endpoint = key.split(" ", 1)
+    endpoint = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",endpoint="{endpoint}"'
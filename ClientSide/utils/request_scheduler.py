@@ -0,0 +1,121 @@
+from typing import Any, Callable, Hashable, Optional
+from PySide6.QtCore import QObject, QTimer
+from utils.task_runner import Task, TaskRunner
+
+
+class LatestRequestScheduler(QObject):
+    """
+    Debounces requests coming from fast changing inputs (combo boxes, spin boxes)
+    and runs only the latest one on a TaskRunner (latest wins)
+
+    A request is sent once its input has been quiet for `delay_ms`. Sending it
+    cancels the previous one: removed from the queue when it has not started,
+    its result dropped when it has. The request function is given
+    is_cancelled= so it can skip the network call once it is stale.
+    Requests are identified by a key, a request for what is already pending
+    or in flight is not sent again.
+    """
+    def __init__(self, task_runner: TaskRunner, delay_ms: int = 300, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.task_runner = task_runner
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._dispatch)
+        self._pending = None
+        self._pending_key: Optional[Hashable] = None
+        self._task: Optional[Task] = None
+        self._task_key: Optional[Hashable] = None
+        # Bumped for every sent request, a request is stale once it changed
+        self._generation = 0
+        self._sent = 0
+        self._superseded = 0
+
+    @property
+    def has_pending(self) -> bool:
+        """True while a request waits for its input to settle"""
+        return self._pending is not None
+
+    def schedule(self, key: Hashable, fn: Callable, *args, on_result: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[str], None]] = None, immediate: bool = False):
+        """
+        Send fn(*args, is_cancelled=...) once the input has been quiet for the delay
+        With immediate, send it right away, even when the same key is in flight
+        """
+        if not immediate:
+            if key == self._pending_key:
+                # Same request again, only the wait starts over
+                self._timer.start()
+                return
+            if key == self._task_key and self._task is not None:
+                # Back to what is already loading, whatever was chosen in between is dropped
+                self._clear_pending()
+                return
+
+        if self._pending is not None:
+            self._superseded += 1
+        self._pending = (fn, args, on_result, on_error)
+        self._pending_key = key
+        if immediate:
+            self._timer.stop()
+            self._dispatch()
+        else:
+            self._timer.start()
+
+    def cancel(self):
+        """Drop the pending request and cancel the one in flight"""
+        self._clear_pending()
+        self._cancel_task()
+
+    def stats(self) -> dict:
+        """Get the number of sent and superseded (never sent or cancelled) requests"""
+        return {"sent": self._sent, "superseded": self._superseded}
+
+    def _dispatch(self):
+        """Send the pending request, superseding the one in flight"""
+        if self._pending is None:
+            return
+        fn, args, on_result, on_error = self._pending
+        key = self._pending_key
+        self._clear_pending()
+        if self._cancel_task():
+            self._superseded += 1
+
+        self._generation += 1
+        generation = self._generation
+
+        def is_cancelled() -> bool:
+            # Read from the worker thread, an int comparison needs no lock
+            return generation != self._generation
+
+        self._sent += 1
+        self._task_key = key
+        self._task = self.task_runner.submit(
+            fn, *args, is_cancelled=is_cancelled,
+            on_result=lambda result: self._deliver(generation, on_result, result),
+            on_error=lambda error_message: self._deliver(generation, on_error, error_message)
+        )
+
+    def _deliver(self, generation: int, callback: Optional[Callable[[Any], None]], value: Any):
+        """Pass a result on unless a newer request was sent in the meantime"""
+        if generation != self._generation:
+            return
+        self._task = None
+        self._task_key = None
+        if callback is not None:
+            callback(value)
+
+    def _cancel_task(self) -> bool:
+        """Cancel the request in flight, True when there was one"""
+        if self._task is None:
+            return False
+        self.task_runner.cancel(self._task)
+        self._generation += 1
+        self._task = None
+        self._task_key = None
+        return True
+
+    def _clear_pending(self):
+        self._timer.stop()
+        self._pending = None
+        self._pending_key = None
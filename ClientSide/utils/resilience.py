@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+from typing import Callable, List
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while its upstream's circuit is open"""
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Service '{name}' is unavailable, retrying in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: the delay before retry n
+    is random between 0 and min(max_delay, base_delay * 2^n)
+    """
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0,
+                 retry_statuses=(502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt (0 based)"""
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream service
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls fail fast with CircuitOpenError. After reset_timeout seconds
+    it goes half-open and lets half_open_max_calls probe calls through:
+    a successful probe closes it, a failed one opens it again.
+
+    Every call allowed by before_call() must end with exactly one of
+    record_success(), record_failure() or release().
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._listeners: List[Callable[[str, str, str], None]] = []
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def add_listener(self, listener: Callable[[str, str, str], None]):
+        """Call listener(name, old_state, new_state) on every state change"""
+        self._listeners.append(listener)
+
+    def before_call(self):
+        """Allow a call or raise CircuitOpenError"""
+        with self._lock:
+            if self._state == OPEN:
+                waited = self._clock() - self._opened_at
+                if waited < self.reset_timeout:
+                    raise CircuitOpenError(self.name, self.reset_timeout - waited)
+                change = self._set_state(HALF_OPEN)
+            else:
+                change = None
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes += 1
+        self._notify(change)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+            change = self._set_state(CLOSED)
+        self._notify(change)
+
+    def record_failure(self):
+        with self._lock:
+            change = None
+            if self._state == HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+                self._opened_at = self._clock()
+                change = self._set_state(OPEN)
+            else:
+                self._failures += 1
+                if self._state == CLOSED and self._failures >= self.failure_threshold:
+                    self._opened_at = self._clock()
+                    change = self._set_state(OPEN)
+        self._notify(change)
+
+    def release(self):
+        """End an allowed call that neither succeeded nor failed"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+
+    def _set_state(self, state: str):
+        """Change state (lock held), returns the change to notify or None"""
+        if state == self._state:
+            return None
+        old_state, self._state = self._state, state
+        if state != HALF_OPEN:
+            self._probes = 0
+        return old_state, state
+
+    def _notify(self, change):
+        if change is None:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(self.name, change[0], change[1])
+            except Exception as e:
+                print(f"Warning: Circuit breaker listener failed: {e}")
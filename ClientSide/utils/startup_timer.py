@@ -0,0 +1,41 @@
+import time
+from typing import Callable, List, Optional, Tuple
+from PySide6.QtCore import QObject, QEvent
+
+
+class StartupTimer(QObject):
+    """
+    Records how long startup phases take, measured from process start,
+    and reports the time until a watched widget is first painted
+    """
+    def __init__(self, start_time: float, on_report: Optional[Callable[[], None]] = None):
+        super().__init__()
+        self.start_time = start_time
+        self.on_report = on_report
+        self.marks: List[Tuple[str, float]] = []
+        self._watched_name = None
+
+    def mark(self, name: str):
+        """Record that a phase ended now"""
+        self.marks.append((name, time.perf_counter() - self.start_time))
+
+    def watch_first_paint(self, widget, name: str):
+        """Mark and report when the widget receives its first paint event"""
+        self._watched_name = name
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self._watched_name is not None:
+            watched.removeEventFilter(self)
+            self.mark(f"{self._watched_name} first paint")
+            self._watched_name = None
+            self.report()
+        return False
+
+    def report(self):
+        """Print every recorded phase"""
+        print("Startup timing (ms since process start):")
+        for name, elapsed in self.marks:
+            print(f"  {name:<30} {elapsed * 1000:8.1f}")
+        if self.on_report is not None:
+            self.on_report()
@@ -0,0 +1,154 @@
+import itertools
+from typing import Any, Callable, Dict, Optional, Tuple
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class TaskSignals(QObject):
+    """
+    Signals emitted by a Task from its worker thread
+    Every signal carries the task id so the runner can route it
+    """
+    result = Signal(int, object)
+    error = Signal(int, str)
+    finished = Signal(int)
+    progress = Signal(int, object)
+
+
+class Task(QRunnable):
+    """
+    A unit of blocking work (usually a model call) executed on a QThreadPool
+    """
+    def __init__(self, task_id: int, fn: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        # The runner keeps the task alive until it finishes, Qt must not delete it
+        self.setAutoDelete(False)
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.signals = TaskSignals()
+
+    def cancel(self):
+        """Mark the task as cancelled, its result will be dropped"""
+        self.cancelled = True
+
+    def is_cancelled(self) -> bool:
+        """Lets a long running function stop early"""
+        return self.cancelled
+
+    def report_progress(self, value: Any):
+        """Send a partial result to the GUI thread while the task is running"""
+        if not self.cancelled:
+            self.signals.progress.emit(self.task_id, value)
+
+    def run(self):
+        """Run the task function and report the outcome through signals"""
+        try:
+            if not self.cancelled:
+                result = self.fn(*self.args, **self.kwargs)
+                self.signals.result.emit(self.task_id, result)
+        except Exception as e:
+            self.signals.error.emit(self.task_id, str(e))
+        finally:
+            self.signals.finished.emit(self.task_id)
+
+
+class TaskRunner(QObject):
+    """
+    Runs blocking calls off the GUI thread and delivers their results
+    back on the GUI thread through the given callbacks
+
+    Each presenter owns a runner so that busy_changed reflects the
+    work of a single view.
+    """
+
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None, thread_pool: Optional[QThreadPool] = None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._ids = itertools.count(1)
+        self._tasks: Dict[int, Tuple[Task, Optional[Callable], Optional[Callable]]] = {}
+        self._progress_callbacks: Dict[int, Callable[[Any], None]] = {}
+        # Cancelled tasks that are still running, kept alive until they finish
+        self._cancelled_running: Dict[int, Task] = {}
+
+    @property
+    def is_busy(self) -> bool:
+        """True while any task of this runner is queued or running"""
+        return bool(self._tasks)
+
+    def submit(self, fn: Callable, *args, on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[str], None]] = None,
+               on_progress: Optional[Callable[[Any], None]] = None, **kwargs) -> Task:
+        """
+        Run fn(*args, **kwargs) on the thread pool
+        With on_progress, fn is also given progress= (a callable delivering partial
+        results to on_progress) and is_cancelled= so it can stop when cancelled
+        """
+        task = Task(next(self._ids), fn, args, kwargs)
+        task.signals.result.connect(self._on_result)
+        task.signals.error.connect(self._on_error)
+        task.signals.finished.connect(self._on_finished)
+        if on_progress is not None:
+            task.kwargs["progress"] = task.report_progress
+            task.kwargs["is_cancelled"] = task.is_cancelled
+            self._progress_callbacks[task.task_id] = on_progress
+            task.signals.progress.connect(self._on_progress)
+
+        was_busy = self.is_busy
+        self._tasks[task.task_id] = (task, on_result, on_error)
+        if not was_busy:
+            self.busy_changed.emit(True)
+
+        self.thread_pool.start(task)
+        return task
+
+    def cancel(self, task: Task):
+        """
+        Cancel a task, removing it from the queue if it has not started yet
+        A running task no longer counts as busy, its outcome is dropped
+        """
+        task.cancel()
+        if task.task_id not in self._tasks:
+            return
+        running = not self.thread_pool.tryTake(task)
+        self._on_finished(task.task_id)
+        if running:
+            self._cancelled_running[task.task_id] = task
+
+    def cancel_all(self):
+        """Cancel every pending task of this runner"""
+        for task, _, _ in list(self._tasks.values()):
+            self.cancel(task)
+
+    @Slot(int, object)
+    def _on_result(self, task_id: int, result: Any):
+        entry = self._tasks.get(task_id)
+        if entry is None or entry[0].cancelled:
+            return
+        if entry[1] is not None:
+            entry[1](result)
+
+    @Slot(int, str)
+    def _on_error(self, task_id: int, error_message: str):
+        entry = self._tasks.get(task_id)
+        if entry is None or entry[0].cancelled:
+            return
+        if entry[2] is not None:
+            entry[2](error_message)
+
+    @Slot(int, object)
+    def _on_progress(self, task_id: int, value: Any):
+        entry = self._tasks.get(task_id)
+        if entry is None or entry[0].cancelled:
+            return
+        self._progress_callbacks[task_id](value)
+
+    @Slot(int)
+    def _on_finished(self, task_id: int):
+        self._cancelled_running.pop(task_id, None)
+        self._progress_callbacks.pop(task_id, None)
+        if self._tasks.pop(task_id, None) is not None and not self._tasks:
+            self.busy_changed.emit(False)
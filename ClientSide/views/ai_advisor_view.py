@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QLineEdit, QMessageBox
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QTextCursor
 
 
 class AIAdvisorView(QWidget):
@@ -8,6 +8,7 @@ class AIAdvisorView(QWidget):
 
     advice_requested = Signal(str)
     history_advice_requested = Signal(str)
+    cancel_requested = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -66,10 +67,18 @@ class AIAdvisorView(QWidget):
         main_layout.addLayout(stock_layout)
 
         # Section: Advice result
+        advice_header_layout = QHBoxLayout()
         advice_display_label = QLabel("AI Advice")
         advice_display_label.setFont(QFont("Poppins", 13, QFont.Bold))
         advice_display_label.setStyleSheet("color: #DDDDDD;")
-        main_layout.addWidget(advice_display_label)
+        advice_header_layout.addWidget(advice_display_label)
+        advice_header_layout.addStretch()
+        # Stops an answer that is still being generated
+        self.cancel_button = QPushButton("Stop")
+        self.cancel_button.clicked.connect(self.cancel_requested.emit)
+        self.cancel_button.setVisible(False)
+        advice_header_layout.addWidget(self.cancel_button)
+        main_layout.addLayout(advice_header_layout)
 
         self.advice_display = QTextEdit()
         self.advice_display.setReadOnly(True)
@@ -134,10 +143,31 @@ class AIAdvisorView(QWidget):
         self.advice_display.setText(f"Analyzing {symbol}...")
         self.history_advice_requested.emit(symbol)
 
+    def set_busy(self, busy):
+        """Disable the request buttons while advice is being generated"""
+        self.query_button.setEnabled(not busy)
+        self.stock_button.setEnabled(not busy)
+        self.cancel_button.setVisible(busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+
     def display_advice(self, advice):
         """Display AI advice"""
         self.advice_display.setText(advice)
 
+    def append_advice(self, text):
+        """Append a streamed piece of advice"""
+        scrollbar = self.advice_display.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        cursor = self.advice_display.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        # Follow the text as it grows unless the user scrolled up to read
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
     def show_error(self, message):
         """Show error message"""
         QMessageBox.critical(self, "Error", message)
@@ -3,6 +3,7 @@ from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QFont, QColor, QPainter
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis, QBarSeries, QBarSet, QBarCategoryAxis
 import datetime
+import math
 
 class DashboardView(QWidget):
     """Dashboard view component for displaying overview of market and portfolio"""
@@ -126,26 +127,21 @@ class DashboardView(QWidget):
         
     def update_market_chart(self, data):
         """Update market overview chart with indices data"""
-        self.market_chart.removeAllSeries()
+        self._clear_chart(self.market_chart)
         
         # Create bar series
         series = QBarSeries()
         
-        # Create bar sets for different indices
-        indices = ["S&P 500", "NASDAQ", "DOW", "RUSSELL"]
+        # One bar set per index, indices without data yet are left out
         colors = [QColor(0, 128, 255), QColor(255, 128, 0), QColor(0, 192, 0), QColor(192, 0, 192)]
+        values = []
         
-        for i, index_name in enumerate(indices):
-            # Mock data for demonstration
-            if not data or i >= len(data):
-                value = (i + 1) * 0.5  # Mock percentage change
-            else:
-                value = data[i].get('change_percent', (i + 1) * 0.5)
-                
-            bar_set = QBarSet(index_name)
-            bar_set.setColor(colors[i])
-            bar_set.append(value)
+        for i, item in enumerate(data or []):
+            bar_set = QBarSet(item['index'])
+            bar_set.setColor(colors[i % len(colors)])
+            bar_set.append(item['change_percent'])
             series.append(bar_set)
+            values.append(abs(item['change_percent']))
         
         self.market_chart.addSeries(series)
         
@@ -156,7 +152,8 @@ class DashboardView(QWidget):
         series.attachAxis(axis_x)
         
         axis_y = QValueAxis()
-        axis_y.setRange(-3, 3)  # Range for percentage change
+        bound = max(3, math.ceil(max(values, default=0)))
+        axis_y.setRange(-bound, bound)  # Range for percentage change
         axis_y.setLabelFormat("%.1f%%")
         self.market_chart.addAxis(axis_y, Qt.AlignLeft)
         series.attachAxis(axis_y)
@@ -167,7 +164,7 @@ class DashboardView(QWidget):
         
     def update_portfolio_chart(self, data):
         """Update portfolio performance chart with historical value data"""
-        self.portfolio_chart.removeAllSeries()
+        self._clear_chart(self.portfolio_chart)
         
         # Create line series
         series = QLineSeries()
@@ -179,31 +176,19 @@ class DashboardView(QWidget):
         min_x = float('inf')
         max_x = float('-inf')
         
-        # Mock data for demonstration if no real data
-        if not data or not isinstance(data, list):
-            today = datetime.datetime.now()
-            for i in range(30):
-                date = today - datetime.timedelta(days=i)
-                timestamp = date.timestamp() * 1000  # Convert to milliseconds
-                value = 10000 + i * 100  # Mock portfolio value
-                
-                series.append(timestamp, value)
-                
-                min_y = min(min_y, value)
-                max_y = max(max_y, value)
-                min_x = min(min_x, timestamp)
-                max_x = max(max_x, timestamp)
-        else:
-            for point in data:
-                timestamp = datetime.datetime.fromisoformat(point['date']).timestamp() * 1000
-                value = point['value']
-                
-                series.append(timestamp, value)
-                
-                min_y = min(min_y, value)
-                max_y = max(max_y, value)
-                min_x = min(min_x, timestamp)
-                max_x = max(max_x, timestamp)
+        if not data:
+            return
+        
+        for point in data:
+            timestamp = datetime.datetime.fromisoformat(point['date']).timestamp() * 1000
+            value = point['value']
+            
+            series.append(timestamp, value)
+            
+            min_y = min(min_y, value)
+            max_y = max(max_y, value)
+            min_x = min(min_x, timestamp)
+            max_x = max(max_x, timestamp)
         
         self.portfolio_chart.addSeries(series)
         
@@ -234,7 +219,7 @@ class DashboardView(QWidget):
         
     def update_gainers_chart(self, data):
         """Update top gainers chart"""
-        self.gainers_chart.removeAllSeries()
+        self._clear_chart(self.gainers_chart)
         
         # Create bar series
         series = QBarSeries()
@@ -246,20 +231,9 @@ class DashboardView(QWidget):
         # Categories for x-axis
         categories = []
         
-        # Mock data for demonstration if no real data
-        if not data or not isinstance(data, list):
-            symbols = ["AAPL", "MSFT", "AMZN", "GOOGL", "TSLA"]
-            values = [5.2, 4.8, 4.3, 3.9, 3.5]
-            
-            for value in values:
-                bar_set.append(value)
-                
-            for symbol in symbols:
-                categories.append(symbol)
-        else:
-            for item in data:
-                bar_set.append(item['change_percent'])
-                categories.append(item['symbol'])
+        for item in data or []:
+            bar_set.append(item['change_percent'])
+            categories.append(item['symbol'])
         
         series.append(bar_set)
         self.gainers_chart.addSeries(series)
@@ -271,14 +245,15 @@ class DashboardView(QWidget):
         series.attachAxis(axis_x)
         
         axis_y = QValueAxis()
-        axis_y.setRange(0, 10)  # Range for percentage gain
+        top = max((abs(item['change_percent']) for item in data or []), default=0)
+        axis_y.setRange(0, max(10, math.ceil(top)))  # Range for percentage gain
         axis_y.setLabelFormat("%.1f%%")
         self.gainers_chart.addAxis(axis_y, Qt.AlignLeft)
         series.attachAxis(axis_y)
         
     def update_losers_chart(self, data):
         """Update top losers chart"""
-        self.losers_chart.removeAllSeries()
+        self._clear_chart(self.losers_chart)
         
         # Create bar series
         series = QBarSeries()
@@ -290,20 +265,9 @@ class DashboardView(QWidget):
         # Categories for x-axis
         categories = []
         
-        # Mock data for demonstration if no real data
-        if not data or not isinstance(data, list):
-            symbols = ["FB", "NFLX", "INTC", "AMD", "NVDA"]
-            values = [-5.2, -4.8, -4.3, -3.9, -3.5]
-            
-            for value in values:
-                bar_set.append(abs(value))  # Use absolute value for display
-                
-            for symbol in symbols:
-                categories.append(symbol)
-        else:
-            for item in data:
-                bar_set.append(abs(item['change_percent']))  # Use absolute value for display
-                categories.append(item['symbol'])
+        for item in data or []:
+            bar_set.append(abs(item['change_percent']))  # Use absolute value for display
+            categories.append(item['symbol'])
         
         series.append(bar_set)
         self.losers_chart.addSeries(series)
@@ -315,7 +279,19 @@ class DashboardView(QWidget):
         series.attachAxis(axis_x)
         
         axis_y = QValueAxis()
-        axis_y.setRange(0, 10)  # Range for percentage loss
+        top = max((abs(item['change_percent']) for item in data or []), default=0)
+        axis_y.setRange(0, max(10, math.ceil(top)))  # Range for percentage loss
         axis_y.setLabelFormat("%.1f%%")
         self.losers_chart.addAxis(axis_y, Qt.AlignLeft)
         series.attachAxis(axis_y)
+
+    def _clear_chart(self, chart):
+        """Remove the series and axes of a previous update"""
+        chart.removeAllSeries()
+        for axis in chart.axes():
+            chart.removeAxis(axis)
+
+    def set_busy(self, busy):
+        """Show a loading state while dashboard data is being fetched"""
+        self.refresh_button.setEnabled(not busy)
+        self.refresh_button.setText("Refreshing..." if busy else "Refresh Dashboard")
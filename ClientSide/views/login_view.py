@@ -114,6 +114,16 @@ class LoginView(QWidget):
         main_layout.addWidget(left_widget, 2)
         main_layout.addWidget(right_widget, 1)
 
+    def set_busy(self, busy):
+        """Disable the form while a login/registration request is running"""
+        self.login_button.setEnabled(not busy)
+        self.register_button.setEnabled(not busy)
+        self.status_label.setText("Please wait..." if busy else "")
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+
     def clear_inputs(self):
         """Clear input fields"""
         self.email_input.clear()
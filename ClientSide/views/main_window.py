@@ -1,22 +1,23 @@
-from PySide6.QtWidgets import QMainWindow, QStackedWidget, QMessageBox, QVBoxLayout, QWidget
+import os
+from PySide6.QtWidgets import QMainWindow, QStackedWidget, QMessageBox, QVBoxLayout, QWidget, QDockWidget, QLabel
 from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QIcon, QFont
+from PySide6.QtGui import QIcon, QFont, QKeySequence, QShortcut
 
 from views.login_view import LoginView
-from views.stock_chart_view import StockChartView
-from views.portfolio_view import PortfolioView
-from views.ai_advisor_view import AIAdvisorView
-from views.dashboard_view import DashboardView
 from views.navigation_bar import NavigationBar
 from models.user_model import UserModel
 from models.stock_model import StockModel
 from models.portfolio_model import PortfolioModel
+from models.history_store import HistoryStore
+from models.advice_cache import AdviceCache, DEFAULT_ADVICE_CACHE_PATH
+from models.movers import MoversEngine
+from models.equity_curve import EquityCurve
 from presenters.login_presenter import LoginPresenter
-from presenters.stock_chart_presenter import StockChartPresenter
-from presenters.portfolio_presenter import PortfolioPresenter
-from presenters.ai_advisor_presenter import AIAdvisorPresenter
-from presenters.dashboard_presenter import DashboardPresenter
 from utils.api_client import ApiClient
+from utils.breaker_monitor import BreakerMonitor
+
+# The other views and presenters (and QtCharts with them) are imported
+# when their view is shown for the first time, see _ensure_view
 
 class MainWindow(QMainWindow):
     """Main application window"""
@@ -27,12 +28,21 @@ class MainWindow(QMainWindow):
         self.setup_models()
         self.setup_ui()
         self.setup_presenters()
+
+        # Show degraded mode in the status bar while an upstream's circuit is open
+        self.degraded_label = None
+        self.breaker_monitor = BreakerMonitor(self.api_client, self)
+        self.breaker_monitor.degraded_changed.connect(self.on_degraded_changed)
         
     def setup_models(self):
         """Initialize model classes"""
         self.user_model = UserModel(self.api_client)
-        self.stock_model = StockModel(self.api_client)
+        self.history_store = HistoryStore()
+        self.advice_cache = AdviceCache(DEFAULT_ADVICE_CACHE_PATH)
+        self.stock_model = StockModel(self.api_client, self.history_store, advice_cache=self.advice_cache)
         self.portfolio_model = PortfolioModel(self.api_client)
+        self.movers_engine = MoversEngine(self.stock_model)
+        self.equity_curve = EquityCurve(self.stock_model)
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -73,42 +83,101 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.main_layout.addWidget(self.stacked_widget, 1)
         
-        # Create views
+        # Create the login view, the other views are created on first use
         self.login_view = LoginView()
-        self.dashboard_view = DashboardView()
-        self.stock_chart_view = StockChartView()
-        self.portfolio_view = PortfolioView()
-        self.ai_advisor_view = AIAdvisorView()
-        
-        # Add views to stacked widget
         self.stacked_widget.addWidget(self.login_view)
-        self.stacked_widget.addWidget(self.dashboard_view)
-        self.stacked_widget.addWidget(self.stock_chart_view)
-        self.stacked_widget.addWidget(self.portfolio_view)
-        self.stacked_widget.addWidget(self.ai_advisor_view)
+        self.dashboard_view = None
+        self.stock_chart_view = None
+        self.portfolio_view = None
+        self.ai_advisor_view = None
         
         # Show login view initially
         self.stacked_widget.setCurrentWidget(self.login_view)
+
+        # Optional request metrics panel, toggled with F12
+        self.metrics_dock = None
+        QShortcut(QKeySequence("F12"), self, activated=self.toggle_metrics_panel)
+        if os.environ.get("STOCK_APP_DEBUG_PANEL") == "1":
+            self.toggle_metrics_panel()
         
     def setup_presenters(self):
         """Initialize presenter classes"""
         self.login_presenter = LoginPresenter(self.login_view, self.user_model)
-        self.dashboard_presenter = DashboardPresenter(self.dashboard_view, self.stock_model, self.portfolio_model)
-        self.stock_chart_presenter = StockChartPresenter(self.stock_chart_view, self.stock_model)
-        self.portfolio_presenter = PortfolioPresenter(self.portfolio_view, self.portfolio_model, self.user_model)
-        self.ai_advisor_presenter = AIAdvisorPresenter(self.ai_advisor_view, self.stock_model)
+        self.dashboard_presenter = None
+        self.stock_chart_presenter = None
+        self.portfolio_presenter = None
+        self.ai_advisor_presenter = None
         
         # Connect login presenter signals
         self.login_presenter.login_successful.connect(self.on_login_successful)
+
+    def _ensure_view(self, view_name):
+        """
+        Create a view and its presenter the first time it is shown
+        Returns True if the view was created by this call
+        """
+        if view_name == "dashboard" and self.dashboard_view is None:
+            from views.dashboard_view import DashboardView
+            from presenters.dashboard_presenter import DashboardPresenter
+            self.dashboard_view = DashboardView()
+            self.dashboard_presenter = DashboardPresenter(self.dashboard_view, self.stock_model, self.portfolio_model,
+                                                         self.movers_engine, self.equity_curve)
+            self.stacked_widget.addWidget(self.dashboard_view)
+        elif view_name == "chart" and self.stock_chart_view is None:
+            from views.stock_chart_view import StockChartView
+            from presenters.stock_chart_presenter import StockChartPresenter
+            self.stock_chart_view = StockChartView()
+            self.stock_chart_presenter = StockChartPresenter(self.stock_chart_view, self.stock_model)
+            self.stacked_widget.addWidget(self.stock_chart_view)
+        elif view_name == "portfolio" and self.portfolio_view is None:
+            from views.portfolio_view import PortfolioView
+            from presenters.portfolio_presenter import PortfolioPresenter
+            self.portfolio_view = PortfolioView()
+            self.portfolio_presenter = PortfolioPresenter(self.portfolio_view, self.portfolio_model, self.user_model, self.stock_model)
+            self.stacked_widget.addWidget(self.portfolio_view)
+        elif view_name == "advisor" and self.ai_advisor_view is None:
+            from views.ai_advisor_view import AIAdvisorView
+            from presenters.ai_advisor_presenter import AIAdvisorPresenter
+            self.ai_advisor_view = AIAdvisorView()
+            self.ai_advisor_presenter = AIAdvisorPresenter(self.ai_advisor_view, self.stock_model)
+            self.stacked_widget.addWidget(self.ai_advisor_view)
+        else:
+            return False
+        return True
         
+    @Slot()
+    def toggle_metrics_panel(self):
+        """Show or hide the debug panel with live per-endpoint latency"""
+        if self.metrics_dock is None:
+            from views.metrics_panel import MetricsPanel
+            self.metrics_dock = QDockWidget("Request Metrics", self)
+            self.metrics_dock.setWidget(MetricsPanel(self.api_client.metrics))
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.metrics_dock)
+            return
+        self.metrics_dock.setVisible(not self.metrics_dock.isVisible())
+
+    @Slot(object)
+    def on_degraded_changed(self, upstreams):
+        """Show which services are unavailable, hide the notice once all recovered"""
+        if self.degraded_label is None:
+            self.degraded_label = QLabel()
+            self.degraded_label.setStyleSheet("color: #ff6b6b; padding: 2px 8px;")
+            self.statusBar().addPermanentWidget(self.degraded_label)
+        if upstreams:
+            self.degraded_label.setText(f"Degraded mode - unavailable: {', '.join(upstreams)}")
+            self.degraded_label.setVisible(True)
+        else:
+            self.degraded_label.setVisible(False)
+            self.statusBar().showMessage("All services available again", 5000)
+
     @Slot()
     def on_login_successful(self):
         """Handle successful login"""
         # Show navigation bar
         self.navigation_bar.setVisible(True)
         
-        # Switch to dashboard view
-        self.stacked_widget.setCurrentWidget(self.dashboard_view)
+        # Switch to dashboard view, its first data is loaded only now
+        self.show_view("dashboard")
         
     @Slot()
     def logout(self):
@@ -130,6 +199,7 @@ class MainWindow(QMainWindow):
         
     def show_view(self, view_name):
         """Show a specific view"""
+        created = self._ensure_view(view_name)
         if view_name == "login":
             self.stacked_widget.setCurrentWidget(self.login_view)
         elif view_name == "dashboard":
@@ -138,6 +208,9 @@ class MainWindow(QMainWindow):
             self.dashboard_presenter.update_dashboard()
         elif view_name == "chart":
             self.stacked_widget.setCurrentWidget(self.stock_chart_view)
+            # Load the initial chart when the view is first shown
+            if created:
+                self.stock_chart_presenter.update_chart()
         elif view_name == "portfolio":
             self.stacked_widget.setCurrentWidget(self.portfolio_view)
             # Refresh portfolio data when showing the view
@@ -146,3 +219,10 @@ class MainWindow(QMainWindow):
             self.stacked_widget.setCurrentWidget(self.ai_advisor_view)
         else:
             raise ValueError(f"Unknown view: {view_name}")
+
+    def closeEvent(self, event):
+        """Release pooled API connections when the window closes"""
+        self.api_client.close()
+        self.history_store.close()
+        self.advice_cache.close()
+        super().closeEvent(event)
@@ -0,0 +1,103 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QLabel
+from PySide6.QtCore import Qt, QTimer
+
+COLUMNS = ["Endpoint", "Requests", "Errors", "Retries", "TTFB p50", "TTFT p50", "p50", "p95", "p99", "Max", "KB"]
+
+
+def _ms(value):
+    return "-" if value is None else f"{value * 1000:.0f} ms"
+
+
+class MetricsPanel(QWidget):
+    """Debug panel showing live per-endpoint request latency from RequestMetrics"""
+
+    def __init__(self, metrics, parent=None, refresh_ms=1000):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(refresh_ms)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(QLabel("Latency is the total request time unless noted"))
+        buttons_layout.addStretch()
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.on_reset_clicked)
+        self.export_json_button = QPushButton("Export JSON")
+        self.export_json_button.clicked.connect(lambda: self.export("json"))
+        self.export_prometheus_button = QPushButton("Export Prometheus")
+        self.export_prometheus_button.clicked.connect(lambda: self.export("prom"))
+        buttons_layout.addWidget(self.reset_button)
+        buttons_layout.addWidget(self.export_json_button)
+        buttons_layout.addWidget(self.export_prometheus_button)
+        layout.addLayout(buttons_layout)
+
+    def showEvent(self, event):
+        # Only poll the metrics while the panel is visible
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Reload the table from the current metrics"""
+        snapshot = self.metrics.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (endpoint, stats) in enumerate(snapshot.items()):
+            total = stats["total"]
+            values = [
+                endpoint,
+                str(stats["count"]),
+                str(stats["errors"]),
+                str(stats["retries"]),
+                _ms(stats["ttfb"]["p50"]),
+                _ms(stats["ttft"]["p50"]),
+                _ms(total["p50"]),
+                _ms(total["p95"]),
+                _ms(total["p99"]),
+                _ms(total["max"]),
+                f"{stats['bytes'] / 1024:.1f}"
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column > 0:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+
+    def on_reset_clicked(self):
+        """Clear the recorded metrics"""
+        self.metrics.reset()
+        self.refresh()
+
+    def export(self, file_format):
+        """Save the metrics as JSON or Prometheus text"""
+        if file_format == "json":
+            path, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "metrics.json", "JSON (*.json)")
+            content = self.metrics.to_json()
+        else:
+            path, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "metrics.prom", "Prometheus text (*.prom *.txt)")
+            content = self.metrics.to_prometheus()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
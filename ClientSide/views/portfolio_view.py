@@ -1,7 +1,32 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QSplitter, QMessageBox, QGridLayout, QComboBox, QDoubleSpinBox, QSizePolicy, QSpacerItem
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QHeaderView, QSplitter, QMessageBox, QGridLayout, QComboBox, QDoubleSpinBox, QSizePolicy, QSpacerItem
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QPainter
 from PySide6.QtCharts import QChart, QChartView, QPieSeries
+from views.table_models import ColumnTableModel, TableColumn, TableFilterProxyModel
+
+HOLDING_COLUMNS = [
+    TableColumn("symbol", "Symbol", searchable=True),
+    TableColumn("quantity", "Quantity", "number"),
+    TableColumn("avg_price", "Avg. Price", "money"),
+    TableColumn("current_price", "Current Price", "money"),
+    TableColumn("total_value", "Total Value", "money")
+]
+
+TRANSACTION_COLUMNS = [
+    TableColumn("timestamp", "Date"),
+    TableColumn("stockSymbol", "Symbol", searchable=True),
+    TableColumn("transactionType", "Type", searchable=True),
+    TableColumn("quantity", "Quantity", "number"),
+    TableColumn("price", "Price", "money")
+]
+
+
+def _transaction_key(transaction):
+    """Identify a transaction across refreshes"""
+    if transaction.get('id') is not None:
+        return transaction['id']
+    return (transaction.get('timestamp'), transaction.get('stockSymbol'), transaction.get('transactionType'),
+            transaction.get('quantity'), transaction.get('price'))
 
 class PortfolioView(QWidget):
     """Portfolio view component for displaying user's stock holdings and transactions"""
@@ -25,12 +50,12 @@ class PortfolioView(QWidget):
                 color: #e0e0e0;
                 font-family: 'Segoe UI', sans-serif;
             }
-            QTableWidget, QHeaderView::section {
+            QTableView, QHeaderView::section {
                 background-color: #2c2c2c;
                 color: #e0e0e0;
                 gridline-color: #444;
             }
-            QTableWidget QTableCornerButton::section {
+            QTableView QTableCornerButton::section {
                 background-color: #2c2c2c;
             }
             QLineEdit, QComboBox, QDoubleSpinBox, QTextEdit {
@@ -81,10 +106,8 @@ class PortfolioView(QWidget):
         portfolio_header.setFont(portfolio_font)
         left_layout.addWidget(portfolio_header)
 
-        self.portfolio_table = QTableWidget()
-        self.portfolio_table.setColumnCount(5)
-        self.portfolio_table.setHorizontalHeaderLabels(["Symbol", "Quantity", "Avg. Price", "Current Price", "Total Value"])
-        self.portfolio_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.holdings_model = ColumnTableModel(HOLDING_COLUMNS, lambda holding: holding.symbol, self)
+        self.portfolio_table = self._create_table(self.holdings_model)
         left_layout.addWidget(self.portfolio_table)
 
         # Transactions table
@@ -93,12 +116,18 @@ class PortfolioView(QWidget):
         transactions_font.setPointSize(12)
         transactions_font.setBold(True)
         transactions_header.setFont(transactions_font)
-        left_layout.addWidget(transactions_header)
-
-        self.transactions_table = QTableWidget()
-        self.transactions_table.setColumnCount(5)
-        self.transactions_table.setHorizontalHeaderLabels(["Date", "Symbol", "Type", "Quantity", "Price"])
-        self.transactions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        transactions_header_layout = QHBoxLayout()
+        transactions_header_layout.addWidget(transactions_header)
+        transactions_header_layout.addStretch()
+        self.transactions_filter = QLineEdit()
+        self.transactions_filter.setPlaceholderText("Filter by symbol or type")
+        self.transactions_filter.setFixedWidth(200)
+        transactions_header_layout.addWidget(self.transactions_filter)
+        left_layout.addLayout(transactions_header_layout)
+
+        self.transactions_model = ColumnTableModel(TRANSACTION_COLUMNS, _transaction_key, self)
+        self.transactions_table = self._create_table(self.transactions_model)
+        self.transactions_filter.textChanged.connect(self.transactions_table.model().set_filter_text)
         left_layout.addWidget(self.transactions_table)
 
         # Right side - Pie chart
@@ -177,50 +206,53 @@ class PortfolioView(QWidget):
 
         main_layout.addLayout(field_layout)
 
+    def _create_table(self, source_model):
+        """Create a sortable, filterable table view over a column table model"""
+        proxy = TableFilterProxyModel(self)
+        proxy.setSourceModel(source_model)
+        table = QTableView()
+        table.setModel(proxy)
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Keep the server order until a column header is clicked
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        return table
+
     def update_portfolio(self, holdings, total_portfolio_value):
         """Update the portfolio table and chart"""
-        self.portfolio_table.setRowCount(0)
         pie_series = QPieSeries()
 
         if not isinstance(holdings, list):
             self.show_error("Invalid holdings data received.")
             holdings = []
 
-        for i, holding in enumerate(holdings):
-            self.portfolio_table.insertRow(i)
-            symbol = holding.get('stockSymbol', 'N/A')
-            quantity = holding.get('quantity', 0.0)
-            avg_price = holding.get('avg_price', 0.0)
-            current_price = holding.get('current_price', 0.0)
-            total_value = holding.get('total_value', 0.0)
-
-            self.portfolio_table.setItem(i, 0, QTableWidgetItem(symbol))
-            self.portfolio_table.setItem(i, 1, QTableWidgetItem(f"{quantity:.2f}"))
-            self.portfolio_table.setItem(i, 2, QTableWidgetItem(f"${avg_price:.2f}"))
-            self.portfolio_table.setItem(i, 3, QTableWidgetItem(f"${current_price:.2f}"))
-            self.portfolio_table.setItem(i, 4, QTableWidgetItem(f"${total_value:.2f}"))
-
-            if total_value > 0:
-                pie_series.append(symbol, total_value)
+        self.holdings_model.set_rows(holdings)
+        for holding in holdings:
+            if holding.total_value > 0:
+                pie_series.append(holding.symbol, holding.total_value)
 
         self.portfolio_chart.removeAllSeries()
         self.portfolio_chart.addSeries(pie_series)
 
     def update_transactions(self, transactions):
         """Update the transactions table"""
-        self.transactions_table.setRowCount(0)
-
         if not isinstance(transactions, list):
             self.show_error("Invalid transactions data received.")
             transactions = []
 
-        for i, t in enumerate(transactions):
-            self.transactions_table.insertRow(i)
-            self.transactions_table.setItem(i, 0, QTableWidgetItem(t.get('timestamp', 'N/A')))
-            self.transactions_table.setItem(i, 1, QTableWidgetItem(t.get('stockSymbol', 'N/A')))
-            self.transactions_table.setItem(i, 2, QTableWidgetItem(t.get('transactionType', 'N/A')))
-            self.transactions_table.setItem(i, 3, QTableWidgetItem(f"{t.get('quantity', 0.0):.2f}"))
-            self.transactions_table.setItem(i, 4, QTableWidgetItem(f"${t.get('price', 0.0):.2f}"))
+        self.transactions_model.set_rows([t for t in transactions if isinstance(t, dict)])
+
+    def set_busy(self, busy):
+        """Show a loading state while portfolio requests are running"""
+        self.refresh_button.setEnabled(not busy)
+        self.refresh_button.setText("Loading..." if busy else "Refresh")
+        self.buy_button.setEnabled(not busy)
+        self.sell_button.setEnabled(not busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
 
     def on_refresh_clicked(self):
         """Emit signal to refresh portfolio"""
@@ -1,13 +1,92 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QSpacerItem, QSizePolicy
-from PySide6.QtCore import Qt, QDateTime
-from PySide6.QtGui import QFont, QPainter
-from PySide6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
+import time
+import numpy as np
+from collections import OrderedDict
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QSpacerItem, QSizePolicy, QMenu
+from PySide6.QtCore import Qt, QDate, QDateTime, QPointF, QTime, QTimer
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QCandlestickSeries, QCandlestickSet, QDateTimeAxis, QValueAxis
+from utils.decimation import min_max_decimate, ohlc_aggregate
+
+# Above this many points series animations are turned off
+ANIMATION_POINT_LIMIT = 500
+# Lower bound for the decimation width while the chart is not laid out yet
+MIN_DECIMATION_WIDTH = 200
+# Symbols whose series and point buffers are kept for switching back
+CACHED_SYMBOLS = 8
+# Chart types offered in the chart type combo
+LINE_CHART = "Line"
+CANDLESTICK_CHART = "Candlestick"
+# Narrowest candle, denser bars are merged into one candle
+MIN_CANDLE_PIXELS = 6
+
+
+def _points(x_values, y_values):
+    return [QPointF(x, y) for x, y in zip(x_values.tolist(), y_values.tolist())]
+
+
+def _chart_name(symbol, interval):
+    """Name of a symbol's chart, daily bars are the plain symbol"""
+    return symbol if interval == "1D" else f"{symbol} ({interval})"
+
+
+class _SymbolChart:
+    """
+    Line and candlestick series of one symbol with its full bar buffers
+    x in local epoch ms, bars are (open, high, low, close) rows
+    """
+    __slots__ = ("name", "series", "candles", "x_values", "bars", "rendered", "candles_rendered")
+
+    def __init__(self, name, series, candles, x_values, bars):
+        self.name = name
+        self.series = series
+        self.candles = candles
+        self.x_values = x_values
+        self.bars = bars
+        # (first x, last x) of the points loaded undecimated into the series,
+        # None when the series holds decimated or outdated points
+        self.rendered = None
+        # (first bar, last bar, candle count) loaded into the candlestick series,
+        # None when the bars changed since
+        self.candles_rendered = None
+
+    @property
+    def y_values(self):
+        """Closes, the points of the line series"""
+        return self.bars[:, 3]
+
+
+class _Overlay:
+    """Indicator line drawn over the current symbol, against the price or the secondary axis"""
+    __slots__ = ("series", "x_values", "y_values", "price_axis")
+
+    def __init__(self, series, x_values, y_values, price_axis):
+        self.series = series
+        self.x_values = x_values
+        self.y_values = y_values
+        self.price_axis = price_axis
+
 
 class StockChartView(QWidget):
     """Stock chart view component for displaying stock price charts"""
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # chart name (symbol and bar interval) -> _SymbolChart, least recently shown first
+        self._symbol_charts = OrderedDict()
+        self._current = None
+        # Series of _current in the chart, its line or its candlestick series
+        self._shown_series = None
+        self._chart_type = LINE_CHART
+        # Indicator lines by name, all of them belong to the chart named _overlay_symbol
+        self._overlays = {}
+        self._overlay_symbol = None
+
+        # Re-decimation after resize/zoom is coalesced into one pass
+        self._redecimate_timer = QTimer(self)
+        self._redecimate_timer.setSingleShot(True)
+        self._redecimate_timer.setInterval(50)
+        self._redecimate_timer.timeout.connect(self._render_visible_points)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -38,6 +117,22 @@ class StockChartView(QWidget):
         range_box.addWidget(range_label)
         range_box.addWidget(self.range_combo)
 
+        # Chart type selection
+        type_box = QHBoxLayout()
+        type_label = QLabel("Chart Type:")
+        self.chart_type_combo = QComboBox()
+        self.chart_type_combo.setStyleSheet("QComboBox { border: 2px solid #0078d7; border-radius: 4px; }")
+        self.chart_type_combo.addItems([LINE_CHART, CANDLESTICK_CHART])
+        self.chart_type_combo.setMinimumWidth(100)
+        type_box.addWidget(type_label)
+        type_box.addWidget(self.chart_type_combo)
+
+        # Indicator selection, the presenter fills in the choices
+        self.indicators_button = QPushButton("Indicators")
+        self.indicators_button.setMinimumWidth(100)
+        self.indicators_menu = QMenu(self.indicators_button)
+        self.indicators_button.setMenu(self.indicators_menu)
+
         # Refresh button
         self.refresh_button = QPushButton("Refresh")
         self.refresh_button.setMinimumWidth(80)
@@ -47,7 +142,11 @@ class StockChartView(QWidget):
         controls_layout.addLayout(symbol_box)
         controls_layout.addSpacerItem(QSpacerItem(100, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
         controls_layout.addLayout(range_box)
-        controls_layout.addSpacerItem(QSpacerItem(500, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
+        controls_layout.addSpacerItem(QSpacerItem(100, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
+        controls_layout.addLayout(type_box)
+        controls_layout.addSpacerItem(QSpacerItem(100, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
+        controls_layout.addWidget(self.indicators_button)
+        controls_layout.addSpacerItem(QSpacerItem(200, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
         controls_layout.addWidget(self.refresh_button)
 
         main_layout.addLayout(controls_layout)
@@ -58,83 +157,365 @@ class StockChartView(QWidget):
         self.chart.legend().setVisible(True)
         self.chart.legend().setAlignment(Qt.AlignBottom)
 
+        # One pair of axes for the whole lifetime, series are swapped in and out
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setFormat("MMM dd yyyy")
+        self.axis_x.setTitleText("Date")
+        self.axis_x.setVisible(False)
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.axis_y = QValueAxis()
+        self.axis_y.setLabelFormat("$%.2f")
+        self.axis_y.setTitleText("Price ($)")
+        self.axis_y.setVisible(False)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        # Oscillators (RSI, MACD, ...) have their own scale on the right
+        self.axis_y2 = QValueAxis()
+        self.axis_y2.setLabelFormat("%.1f")
+        self.axis_y2.setVisible(False)
+        self.chart.addAxis(self.axis_y2, Qt.AlignRight)
+        # Zooming (rubber band) changes the x range, re-decimate for the new range
+        self.axis_x.rangeChanged.connect(lambda *_: self._redecimate_timer.start())
+
         self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
+        # Drag to zoom into a date range, right click to zoom out
+        self.chart_view.setRubberBand(QChartView.HorizontalRubberBand)
 
         main_layout.addWidget(self.chart_view)
 
-    def update_line_chart(self, data):
-        self.chart.removeAllSeries()
-        for axis in self.chart.axes():
-            self.chart.removeAxis(axis)
-
-        if not data:
-            self.chart.setTitle("No data available")
+    def update_price_chart(self, price_series):
+        """Show a symbol's price series, merging it into the series already cached for the symbol"""
+        if price_series is None or len(price_series) == 0:
+            self.clear_chart()
             return
 
-        self.chart.setTitle(f"{self.symbol_combo.currentText()} Price Chart")
+        x_values, bars = self._build_point_buffer(price_series)
+        name = _chart_name(price_series.symbol, price_series.interval)
+        symbol_chart = self._symbol_charts.get(name)
+        if symbol_chart is None:
+            series = QLineSeries()
+            series.setName(f"{name} Price")
+            candles = QCandlestickSeries()
+            candles.setName(f"{name} OHLC")
+            candles.setIncreasingColor(QColor("#26a69a"))
+            candles.setDecreasingColor(QColor("#ef5350"))
+            symbol_chart = self._symbol_charts[name] = _SymbolChart(name, series, candles, x_values, bars)
+        else:
+            self._merge_points(symbol_chart, x_values, bars)
+        self._symbol_charts.move_to_end(name)
+        while len(self._symbol_charts) > CACHED_SYMBOLS:
+            self._symbol_charts.popitem(last=False)
 
-        series = QLineSeries()
-        series.setName(f"{self.symbol_combo.currentText()} Price")
+        self._show_symbol(symbol_chart, x_values[0], x_values[-1])
 
-        min_y = float("inf")
-        max_y = float("-inf")
-        min_x_dt = None
-        max_x_dt = None
+    def show_cached_symbol(self, symbol, range_days, interval="1D"):
+        """
+        Show the cached series of a symbol for the last range_days days right away
+        Returns False when the symbol was not loaded before with this bar interval
+        """
+        name = _chart_name(symbol, interval)
+        symbol_chart = self._symbol_charts.get(name)
+        if symbol_chart is None:
+            return False
+        self._symbol_charts.move_to_end(name)
+        start = QDateTime(QDate.currentDate().addDays(1 - max(range_days, 1)), QTime(0, 0))
+        x_min = max(float(start.toMSecsSinceEpoch()), symbol_chart.x_values[0])
+        self._show_symbol(symbol_chart, x_min, symbol_chart.x_values[-1])
+        return True
 
-        for point in data:
-            date_str = point["date"]
-            price = point["price"]
-            dt = QDateTime.fromString(date_str, Qt.ISODate)
-            if not dt.isValid():
-                print(f"Warning: Could not parse date string: {date_str}")
-                continue
+    def set_chart_type(self, chart_type):
+        """Draw prices as a line of closes or as candlesticks, the shown symbol and range are kept"""
+        if chart_type == self._chart_type:
+            return
+        self._chart_type = chart_type
+        # Indicator lines are added again after the price series, so they stay on top of the candles
+        self.clear_overlays()
+        if self._current is not None:
+            self._show_symbol(self._current, self.axis_x.min().toMSecsSinceEpoch(),
+                              self.axis_x.max().toMSecsSinceEpoch())
+
+    def _show_symbol(self, symbol_chart, x_min, x_max):
+        """Swap the symbol's series into the chart and fit the axes to x_min..x_max"""
+        candlestick = self._chart_type == CANDLESTICK_CHART
+        shown = symbol_chart.candles if candlestick else symbol_chart.series
+        if self._shown_series is not shown:
+            if self._shown_series is not None:
+                self.chart.removeSeries(self._shown_series)
+            self.chart.addSeries(shown)
+            shown.attachAxis(self.axis_x)
+            shown.attachAxis(self.axis_y)
+            self._shown_series = shown
+        self._current = symbol_chart
+        if symbol_chart.name != self._overlay_symbol:
+            self.clear_overlays()
+        self.chart.setTitle(f"{symbol_chart.name} Price Chart")
+        self.axis_x.setVisible(True)
+        self.axis_y.setVisible(True)
+
+        lo = int(np.searchsorted(symbol_chart.x_values, x_min, side="left"))
+        hi = int(np.searchsorted(symbol_chart.x_values, x_max, side="right"))
+
+        # Animating thousands of points costs more than it shows, candles are rebuilt on every zoom
+        if candlestick or hi - lo > ANIMATION_POINT_LIMIT:
+            self.chart.setAnimationOptions(QChart.NoAnimation)
+        else:
+            self.chart.setAnimationOptions(QChart.SeriesAnimations)
 
-            timestamp_ms = dt.toMSecsSinceEpoch()
-            series.append(timestamp_ms, price)
+        self.axis_x.setRange(QDateTime.fromMSecsSinceEpoch(int(x_min)), QDateTime.fromMSecsSinceEpoch(int(x_max)))
+        self._fit_value_axes()
 
-            min_y = min(min_y, price)
-            max_y = max(max_y, price)
+        self._render_visible_points()
+        # The range change above already rendered, no need for the delayed pass
+        self._redecimate_timer.stop()
 
-            if min_x_dt is None or dt < min_x_dt:
-                min_x_dt = dt
-            if max_x_dt is None or dt > max_x_dt:
-                max_x_dt = dt
+    @staticmethod
+    def _merge_points(symbol_chart, x_values, bars):
+        """
+        Merge newly loaded bars into a symbol's buffers: bars older or newer
+        than the cached ones are prepended/appended, changed prices updated
+        """
+        old_x = symbol_chart.x_values
+        old_bars = symbol_chart.bars
+        older = x_values < old_x[0]
+        newer = x_values > old_x[-1]
+        inner = ~(older | newer)
+        symbol_chart.candles_rendered = None
 
-        if series.count() == 0:
-            self.chart.setTitle("No valid data points found")
+        index = np.searchsorted(old_x, x_values[inner])
+        if not np.array_equal(old_x[np.minimum(index, len(old_x) - 1)], x_values[inner]):
+            # New dates inside the cached span, rebuild the buffers (new prices win)
+            merged_x, first = np.unique(np.concatenate((x_values, old_x)), return_index=True)
+            symbol_chart.x_values = merged_x
+            symbol_chart.bars = np.concatenate((bars, old_bars))[first]
+            symbol_chart.rendered = None
             return
 
-        self.chart.addSeries(series)
-
-        axis_x = QDateTimeAxis()
-        axis_x.setFormat("MMM dd yyyy")
-        axis_x.setTitleText("Date")
-        if min_x_dt and max_x_dt:
-            axis_x.setMin(min_x_dt)
-            axis_x.setMax(max_x_dt)
-        self.chart.addAxis(axis_x, Qt.AlignBottom)
-        series.attachAxis(axis_x)
-
-        axis_y = QValueAxis()
-        axis_y.setLabelFormat("$%.2f")
-        axis_y.setTitleText("Price ($)")
-
-        if min_y != float("inf") and max_y != float("-inf"):
-            padding_y = (max_y - min_y) * 0.1 if max_y > min_y else 1.0
-            axis_y.setMin(min_y - padding_y)
-            axis_y.setMax(max_y + padding_y)
+        changed = (old_bars[index] != bars[inner]).any(axis=1)
+        if changed.any():
+            # Usually only the last bar, while the market is open
+            if (old_bars[index[changed], 3] != bars[inner][changed, 3]).any():
+                symbol_chart.rendered = None
+            old_bars = old_bars.copy()
+            old_bars[index[changed]] = bars[inner][changed]
+        if older.any() or newer.any():
+            old_x = np.concatenate((x_values[older], old_x, x_values[newer]))
+            old_bars = np.concatenate((bars[older], old_bars, bars[newer]))
+        symbol_chart.x_values = old_x
+        symbol_chart.bars = old_bars
+
+    def _build_point_buffer(self, series):
+        """
+        Convert a PriceSeries to (x in local epoch ms, (open, high, low, close) rows) sorted by date
+        Missing opens, highs and lows are taken from the close
+        """
+        utc_ms = series.dates.astype("datetime64[ms]").astype(np.int64)
+
+        # Dates carry no time zone and are meant as local time (like Qt.ISODate),
+        # the local UTC offset is looked up once per day
+        days, day_index = np.unique(utc_ms // 86_400_000, return_inverse=True)
+        offsets = np.array([time.localtime(int(day) * 86_400 + 43_200).tm_gmtoff for day in days], dtype=np.int64)
+        x_values = (utc_ms - offsets[day_index] * 1000).astype(float)
+
+        close = series.close
+        bars = np.empty((len(close), 4))
+        for i, column in enumerate((series.open, series.high, series.low)):
+            bars[:, i] = close if column is None else np.where(np.isnan(column), close, column)
+        bars[:, 3] = close
+        return x_values, bars
+
+    def _render_visible_points(self):
+        """Load the visible part of the price series and the indicator lines"""
+        if self._chart_type == CANDLESTICK_CHART:
+            self._render_candles()
         else:
-            axis_y.setMin(0)
-            axis_y.setMax(100)
+            self._render_price_points()
+        self._render_overlays()
+
+    def _render_candles(self):
+        """Load the visible bars as candles, merged so that every candle gets MIN_CANDLE_PIXELS"""
+        symbol_chart = self._current
+        if symbol_chart is None:
+            return
+        x_min = self.axis_x.min().toMSecsSinceEpoch()
+        x_max = self.axis_x.max().toMSecsSinceEpoch()
+        lo = int(np.searchsorted(symbol_chart.x_values, x_min, side="left"))
+        hi = int(np.searchsorted(symbol_chart.x_values, x_max, side="right"))
+
+        pixel_width = max(int(self.chart.plotArea().width()), MIN_DECIMATION_WIDTH)
+        x_visible, bars = ohlc_aggregate(symbol_chart.x_values[lo:hi], symbol_chart.bars[lo:hi],
+                                         pixel_width // MIN_CANDLE_PIXELS, lo)
+        # Zooming back and forth over the same bars needs no new candles
+        rendered = (lo, hi, len(x_visible))
+        if rendered == symbol_chart.candles_rendered:
+            return
+
+        # All candles go in with one append, the series lays them out once
+        symbol_chart.candles.clear()
+        symbol_chart.candles.append([QCandlestickSet(open_price, high, low, close, x)
+                                     for x, (open_price, high, low, close) in zip(x_visible.tolist(), bars.tolist())])
+        symbol_chart.candles_rendered = rendered
+
+    def _render_price_points(self):
+        """Load the visible part of the price series, decimated to the chart's pixel width"""
+        symbol_chart = self._current
+        if symbol_chart is None:
+            return
+        x_min = self.axis_x.min().toMSecsSinceEpoch()
+        x_max = self.axis_x.max().toMSecsSinceEpoch()
+        # One point beyond each edge keeps the line running to the border
+        lo = max(int(np.searchsorted(symbol_chart.x_values, x_min, side="left")) - 1, 0)
+        hi = min(int(np.searchsorted(symbol_chart.x_values, x_max, side="right")) + 1, len(symbol_chart.x_values))
+        x_visible = symbol_chart.x_values[lo:hi]
+        y_visible = symbol_chart.y_values[lo:hi]
+
+        pixel_width = max(int(self.chart.plotArea().width()), MIN_DECIMATION_WIDTH)
+        if len(x_visible) > 2 * pixel_width:
+            x_visible, y_visible = min_max_decimate(x_visible, y_visible, pixel_width)
+            symbol_chart.series.replace(_points(x_visible, y_visible))
+            symbol_chart.rendered = None
+            return
+        if len(x_visible) == 0:
+            symbol_chart.series.clear()
+            symbol_chart.rendered = None
+            return
 
-        self.chart.addAxis(axis_y, Qt.AlignLeft)
-        series.attachAxis(axis_y)
+        # Every point is shown, when the series already holds the first of them
+        # only the newer points are appended, in one call
+        rendered = symbol_chart.rendered
+        if rendered is not None and x_visible[0] == rendered[0] and x_visible[-1] >= rendered[1]:
+            last = int(np.searchsorted(x_visible, rendered[1], side="right"))
+            if last == symbol_chart.series.count():
+                if last < len(x_visible):
+                    symbol_chart.series.append(_points(x_visible[last:], y_visible[last:]))
+                symbol_chart.rendered = (x_visible[0], x_visible[-1])
+                return
+
+        # Anything else, older points included, is loaded with a single replace
+        symbol_chart.series.replace(_points(x_visible, y_visible))
+        symbol_chart.rendered = (x_visible[0], x_visible[-1])
+
+    def set_indicator_choices(self, labels):
+        """Offer the given indicators in the indicators menu, none is selected"""
+        self.indicators_menu.clear()
+        for label in labels:
+            action = self.indicators_menu.addAction(label)
+            action.setCheckable(True)
+
+    def selected_indicators(self):
+        """Labels of the indicators checked in the menu"""
+        return [action.text() for action in self.indicators_menu.actions() if action.isChecked()]
+
+    def set_overlays(self, price_series, lines):
+        """
+        Show indicator lines over the price series they were computed from
+        `lines` are (name, values aligned with the series' bars, on the price axis) tuples,
+        lines not given any more are removed
+        """
+        x_values, _ = self._build_point_buffer(price_series)
+        names = set()
+        for name, y_values, price_axis in lines:
+            names.add(name)
+            overlay = self._overlays.get(name)
+            if overlay is None or overlay.price_axis != price_axis:
+                if overlay is not None:
+                    self.chart.removeSeries(overlay.series)
+                series = QLineSeries()
+                series.setName(name)
+                self.chart.addSeries(series)
+                series.attachAxis(self.axis_x)
+                series.attachAxis(self.axis_y if price_axis else self.axis_y2)
+                overlay = self._overlays[name] = _Overlay(series, x_values, y_values, price_axis)
+            # Bars before an indicator's first full window have no value
+            defined = ~np.isnan(y_values)
+            overlay.x_values = x_values[defined]
+            overlay.y_values = y_values[defined]
+        for name in [name for name in self._overlays if name not in names]:
+            self.chart.removeSeries(self._overlays.pop(name).series)
+        self._overlay_symbol = _chart_name(price_series.symbol, price_series.interval) if self._overlays else None
+
+        self._fit_value_axes()
+        self._render_overlays()
+
+    def clear_overlays(self):
+        """Remove all indicator lines"""
+        for overlay in self._overlays.values():
+            self.chart.removeSeries(overlay.series)
+        self._overlays.clear()
+        self._overlay_symbol = None
+        self.axis_y2.setVisible(False)
+
+    def _fit_value_axes(self):
+        """
+        Fit the price axis to the visible bars and the overlays shown on it,
+        fit the secondary axis to the oscillators
+        """
+        x_min = self.axis_x.min().toMSecsSinceEpoch()
+        x_max = self.axis_x.max().toMSecsSinceEpoch()
+        candlestick = self._chart_type == CANDLESTICK_CHART
+        symbol_chart = self._current
+        lo = int(np.searchsorted(symbol_chart.x_values, x_min, side="left"))
+        hi = int(np.searchsorted(symbol_chart.x_values, x_max, side="right"))
+        visible = symbol_chart.bars[lo:hi] if hi > lo else symbol_chart.bars
+        # Candles reach from the lowest low to the highest high, the line only spans the closes
+        price_low = float(visible[:, 2 if candlestick else 3].min())
+        price_high = float(visible[:, 1 if candlestick else 3].max())
+        low, high = np.inf, -np.inf
+        for overlay in self._overlays.values():
+            lo = int(np.searchsorted(overlay.x_values, x_min, side="left"))
+            hi = int(np.searchsorted(overlay.x_values, x_max, side="right"))
+            if hi <= lo:
+                continue
+            visible = overlay.y_values[lo:hi]
+            if overlay.price_axis:
+                price_low = min(price_low, float(visible.min()))
+                price_high = max(price_high, float(visible.max()))
+            else:
+                low = min(low, float(visible.min()))
+                high = max(high, float(visible.max()))
+        padding = (price_high - price_low) * 0.1 if price_high > price_low else 1.0
+        self.axis_y.setRange(price_low - padding, price_high + padding)
+
+        has_oscillator = any(not overlay.price_axis for overlay in self._overlays.values())
+        self.axis_y2.setVisible(has_oscillator)
+        if has_oscillator and low <= high:
+            padding = (high - low) * 0.1 if high > low else 1.0
+            self.axis_y2.setRange(low - padding, high + padding)
+
+    def _render_overlays(self):
+        """Load the visible part of every indicator line, decimated like the price series"""
+        if not self._overlays:
+            return
+        x_min = self.axis_x.min().toMSecsSinceEpoch()
+        x_max = self.axis_x.max().toMSecsSinceEpoch()
+        pixel_width = max(int(self.chart.plotArea().width()), MIN_DECIMATION_WIDTH)
+        for overlay in self._overlays.values():
+            lo = max(int(np.searchsorted(overlay.x_values, x_min, side="left")) - 1, 0)
+            hi = min(int(np.searchsorted(overlay.x_values, x_max, side="right")) + 1, len(overlay.x_values))
+            x_visible, y_visible = min_max_decimate(overlay.x_values[lo:hi], overlay.y_values[lo:hi], pixel_width)
+            overlay.series.replace(_points(x_visible, y_visible))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._redecimate_timer.start()
+
+    def set_busy(self, busy):
+        """Show a loading state while chart data is being fetched"""
+        self.refresh_button.setEnabled(not busy)
+        self.refresh_button.setText("Loading..." if busy else "Refresh")
+        if busy:
+            self.chart_view.setCursor(Qt.BusyCursor)
+        else:
+            self.chart_view.unsetCursor()
 
     def clear_chart(self):
-        self.chart.removeAllSeries()
-        for axis in self.chart.axes():
-            self.chart.removeAxis(axis)
+        """Take the shown series off the chart, cached series are kept"""
+        self.clear_overlays()
+        if self._shown_series is not None:
+            self.chart.removeSeries(self._shown_series)
+            self._shown_series = None
+            self._current = None
+        self.axis_x.setVisible(False)
+        self.axis_y.setVisible(False)
         self.chart.setTitle("No data available")
 
     def show_error(self, message):
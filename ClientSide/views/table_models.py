@@ -0,0 +1,244 @@
+import numpy as np
+from typing import Any, Callable, Dict, Hashable, List
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+# Above this share of removed rows a refresh resets the model instead of diffing
+RESET_REMOVED_RATIO = 0.5
+
+
+class TableColumn:
+    """
+    Description of one table column
+    kind is "text", "number" (2 decimals) or "money" ($ and 2 decimals)
+    """
+    __slots__ = ("key", "header", "kind", "default", "searchable")
+
+    def __init__(self, key: str, header: str, kind: str = "text", default: Any = None, searchable: bool = False):
+        self.key = key
+        self.header = header
+        self.kind = kind
+        self.default = default if default is not None else ("N/A" if kind == "text" else 0.0)
+        self.searchable = searchable
+
+    def format(self, value: Any) -> str:
+        if self.kind == "money":
+            return f"${value:.2f}"
+        if self.kind == "number":
+            return f"{value:.2f}"
+        return str(value)
+
+
+class ColumnTableModel(QAbstractTableModel):
+    """
+    Read-only table model that stores its rows as one array per column
+    (float64 for numbers, object arrays for text) and formats cells only
+    when the view asks for them.
+
+    set_rows() diffs the new rows against the current ones by row key, so
+    a refresh emits removals, changed cells and appended rows instead of
+    resetting the whole model. Sorting is done on the column arrays.
+    Rows are dicts or records (like Holding) with the column keys as attributes.
+    """
+    def __init__(self, columns: List[TableColumn], key_fn: Callable[[Dict[str, Any]], Hashable], parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._key_fn = key_fn
+        self._data = {column.key: self._empty_column(column) for column in columns}
+        self._keys: List[Hashable] = []
+        self._search: List[str] = []
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            return column.format(self._data[column.key][index.row()])
+        if role == Qt.UserRole:
+            value = self._data[column.key][index.row()]
+            return value.item() if isinstance(value, np.generic) else value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section].header
+        return section + 1
+
+    def row_matches(self, row: int, text: str) -> bool:
+        """True if any searchable column of the row contains text (lowercase)"""
+        return text in self._search[row]
+
+    def set_rows(self, rows: List[Dict[str, Any]]):
+        """Replace the table contents, emitting only the differences"""
+        keys = self._make_keys(rows)
+        new_data = self._extract_columns(rows)
+        new_search = self._search_texts(new_data, len(rows))
+        new_position = {key: i for i, key in enumerate(keys)}
+
+        removed = [i for i, key in enumerate(self._keys) if key not in new_position]
+        if not self._keys or len(removed) > len(self._keys) * RESET_REMOVED_RATIO:
+            self.beginResetModel()
+            self._data, self._keys, self._search = new_data, keys, new_search
+            self.endResetModel()
+            self._apply_sort()
+            return
+
+        self._remove_rows(removed)
+
+        # Update rows that are still present in place
+        source = np.array([new_position[key] for key in self._keys], dtype=int)
+        changed = np.zeros(len(self._keys), dtype=bool)
+        for column in self.columns:
+            new_values = new_data[column.key][source]
+            changed |= self._data[column.key] != new_values
+            self._data[column.key] = new_values
+        for row in np.flatnonzero(changed):
+            self._search[row] = new_search[source[row]]
+        for first, last in _runs(np.flatnonzero(changed)):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.columns) - 1))
+
+        # Append new rows at the end, the sort below puts them in place
+        present = set(self._keys)
+        added = np.array([i for i, key in enumerate(keys) if key not in present], dtype=int)
+        if len(added):
+            first = len(self._keys)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for column in self.columns:
+                self._data[column.key] = np.concatenate((self._data[column.key], new_data[column.key][added]))
+            self._keys.extend(keys[i] for i in added)
+            self._search.extend(new_search[i] for i in added)
+            self.endInsertRows()
+
+        if len(added) or changed.any():
+            self._apply_sort()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Sort the rows by one column"""
+        self._sort_column = column
+        self._sort_order = order
+        self._apply_sort()
+
+    def _apply_sort(self):
+        if self._sort_column < 0 or len(self._keys) < 2:
+            return
+        values = self._data[self.columns[self._sort_column].key]
+        permutation = np.argsort(values, kind="stable")
+        if self._sort_order == Qt.DescendingOrder:
+            permutation = permutation[::-1]
+        if np.array_equal(permutation, np.arange(len(permutation))):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        new_row = np.empty_like(permutation)
+        new_row[permutation] = np.arange(len(permutation))
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            old_indexes,
+            [self.index(int(new_row[index.row()]), index.column()) for index in old_indexes]
+        )
+        for column in self.columns:
+            self._data[column.key] = self._data[column.key][permutation]
+        self._keys = [self._keys[i] for i in permutation]
+        self._search = [self._search[i] for i in permutation]
+        self.layoutChanged.emit()
+
+    def _remove_rows(self, rows: List[int]):
+        """Remove rows, one contiguous block at a time from the bottom up"""
+        for first, last in reversed(_runs(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in self.columns:
+                values = self._data[column.key]
+                self._data[column.key] = np.concatenate((values[:first], values[last + 1:]))
+            del self._keys[first:last + 1]
+            del self._search[first:last + 1]
+            self.endRemoveRows()
+
+    def _make_keys(self, rows: List[Dict[str, Any]]) -> List[Hashable]:
+        """Row keys, numbering repeated keys so every key stays unique"""
+        seen: Dict[Hashable, int] = {}
+        keys = []
+        for row in rows:
+            key = self._key_fn(row)
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            keys.append((key, count))
+        return keys
+
+    def _extract_columns(self, rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        data = {}
+        for column in self.columns:
+            if rows and not isinstance(rows[0], dict):
+                # Typed records (e.g. Holding) expose the columns as attributes
+                values = [getattr(row, column.key, None) for row in rows]
+            else:
+                values = [row.get(column.key) for row in rows]
+            if column.kind == "text":
+                array = np.empty(len(values), dtype=object)
+                array[:] = [column.default if value is None else str(value) for value in values]
+            else:
+                array = np.array([column.default if value is None else value for value in values], dtype=float)
+            data[column.key] = array
+        return data
+
+    def _search_texts(self, data: Dict[str, np.ndarray], n_rows: int) -> List[str]:
+        searchable = [data[column.key] for column in self.columns if column.searchable]
+        if not searchable:
+            return [""] * n_rows
+        return ["\t".join(values).lower() for values in zip(*searchable)]
+
+    @staticmethod
+    def _empty_column(column: TableColumn) -> np.ndarray:
+        return np.empty(0, dtype=object if column.kind == "text" else float)
+
+
+class TableFilterProxyModel(QSortFilterProxyModel):
+    """
+    Proxy in front of a ColumnTableModel for the table view
+    Filters rows by a text matched against the searchable columns and
+    hands sorting to the source model, which sorts its column arrays
+    instead of comparing cells one pair at a time.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filter_text = ""
+
+    def set_filter_text(self, text: str):
+        """Only show rows whose searchable columns contain text"""
+        self._filter_text = text.strip().lower()
+        # Refilters through filterAcceptsRow below
+        self.setFilterFixedString(self._filter_text)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._filter_text:
+            return True
+        return self.sourceModel().row_matches(source_row, self._filter_text)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        # Number the visible rows, not the source rows
+        if orientation == Qt.Vertical and role == Qt.DisplayRole:
+            return section + 1
+        return super().headerData(section, orientation, role)
+
+
+def _runs(rows) -> List[tuple]:
+    """Group sorted row numbers into (first, last) runs of consecutive rows"""
+    runs = []
+    for row in rows:
+        row = int(row)
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
@@ -1,4 +1,5 @@
-﻿using Microsoft.AspNetCore.Http.HttpResults;
+﻿using Microsoft.AspNetCore.Http.Features;
+using Microsoft.AspNetCore.Http.HttpResults;
 using Microsoft.AspNetCore.Mvc;
 
 namespace GatewayController.Controllers
@@ -25,6 +26,40 @@ namespace GatewayController.Controllers
             catch (Exception ex) { return BadRequest(ex.Message); }
         }
 
+        // Relays the advisor's answer chunk by chunk while it is generated.
+        // Disconnecting the client cancels the upstream request.
+        [HttpGet("AIadvice-stream/{query}")]
+        public async Task StreamAIAdvice(string query, CancellationToken cancellationToken)
+        {
+            HttpResponseMessage upstream;
+            try
+            {
+                upstream = await _gatewayManager.GetAIAdviceStream(query, cancellationToken);
+            }
+            catch (Exception ex)
+            {
+                Response.StatusCode = StatusCodes.Status502BadGateway;
+                await Response.WriteAsync(ex.Message);
+                return;
+            }
+
+            using (upstream)
+            {
+                Response.StatusCode = (int)upstream.StatusCode;
+                Response.ContentType = "text/plain; charset=utf-8";
+                HttpContext.Features.Get<IHttpResponseBodyFeature>()?.DisableBuffering();
+
+                using var body = await upstream.Content.ReadAsStreamAsync(cancellationToken);
+                var buffer = new byte[4096];
+                int read;
+                while ((read = await body.ReadAsync(buffer, cancellationToken)) > 0)
+                {
+                    await Response.Body.WriteAsync(buffer.AsMemory(0, read), cancellationToken);
+                    await Response.Body.FlushAsync(cancellationToken);
+                }
+            }
+        }
+
         [HttpGet("based-history-advice/{stockSymbol}")]
         public async Task<IActionResult> GetBasedStockHistoryAdvice(string stockSymbol)
         {
@@ -28,6 +28,24 @@ namespace GatewayController.Controllers
             }
         }
 
+        [HttpGet("current-data")]
+        public async Task<IActionResult> GetCurrentPrices([FromQuery] string symbols)
+        {
+            try
+            {
+                if (string.IsNullOrWhiteSpace(symbols))
+                    return BadRequest("At least one symbol is required");
+
+                StockPricesBatch batch = await _gatewayManager.GetStockPrices(
+                    symbols.Split(',', StringSplitOptions.RemoveEmptyEntries));
+                return Ok(batch);
+            }
+            catch (Exception e)
+            {
+                return BadRequest(e.Message);
+            }
+        }
+
         [HttpGet("stock-history/{symbol}/{range}")]
         public async Task<IActionResult> GetStockHistory(string symbol, int range)
         {
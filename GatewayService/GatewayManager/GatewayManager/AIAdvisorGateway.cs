@@ -22,5 +22,12 @@ namespace GatewayManager
             var advice = await httpClient.GetAsync($"{ AIAdvisorURL}AI-advice/{query}");
             return await advice.Content.ReadAsStringAsync();
         }
+
+        // Returns as soon as the headers arrive, the caller reads (and disposes) the streamed body
+        internal async Task<HttpResponseMessage> GetAIAdviceStream(string query, CancellationToken cancellationToken)
+        {
+            var request = new HttpRequestMessage(HttpMethod.Get, $"{AIAdvisorURL}AI-advice-stream/{Uri.EscapeDataString(query)}");
+            return await httpClient.SendAsync(request, HttpCompletionOption.ResponseHeadersRead, cancellationToken);
+        }
     }
 }
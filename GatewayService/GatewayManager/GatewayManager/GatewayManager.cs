@@ -58,6 +58,39 @@ namespace GatewayManager
             return Task.FromResult(currentData.Close);
         }
 
+        public async Task<StockPricesBatch> GetStockPrices(IEnumerable<string> stockSymbols)
+        {
+            var symbols = stockSymbols
+                .Select(s => s.Trim().ToUpperInvariant())
+                .Where(s => s.Length > 0)
+                .Distinct()
+                .ToList();
+
+            // All symbols are looked up concurrently, a failing symbol does not fail the batch
+            var lookups = symbols.Select(async symbol =>
+            {
+                try
+                {
+                    CurrentData currentData = await marketDataGateway.GetCurrentStockData(symbol);
+                    return (Symbol: symbol, Price: (decimal?)currentData.Close, Error: (string?)null);
+                }
+                catch (Exception e)
+                {
+                    return (Symbol: symbol, Price: (decimal?)null, Error: e.Message);
+                }
+            });
+
+            var batch = new StockPricesBatch();
+            foreach (var result in await Task.WhenAll(lookups))
+            {
+                if (result.Price.HasValue)
+                    batch.Prices[result.Symbol] = result.Price.Value;
+                else
+                    batch.Errors[result.Symbol] = result.Error ?? "Stock data not found";
+            }
+            return batch;
+        }
+
         public Task<List<StockPrice>> GetStockHistory(string stockSymbol, int range)
             => marketDataGateway.GetStockHistory(stockSymbol, range);
 
@@ -80,6 +113,9 @@ namespace GatewayManager
         public async Task<string> GetAIAdvice(string query)
             => await aiAdvisorGateway.GetAIAdvice(query);
 
+        public Task<HttpResponseMessage> GetAIAdviceStream(string query, CancellationToken cancellationToken)
+            => aiAdvisorGateway.GetAIAdviceStream(query, cancellationToken);
+
         public async Task<string> GetBasedStockHistoryAdvice(string stockSymbol)
         {
             List<StockPrice> stockPrices = await GetStockHistory(stockSymbol, 99);
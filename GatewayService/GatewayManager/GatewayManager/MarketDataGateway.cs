@@ -70,7 +70,15 @@ namespace GatewayManager
                     entry.Value.TryGetValue("4. close", out string closePriceStr) &&
                     decimal.TryParse(closePriceStr, NumberStyles.Any, CultureInfo.InvariantCulture, out decimal closePrice))
                 {
-                    stockPrices.Add(new StockPrice { Date = date, ClosePrice = closePrice });
+                    stockPrices.Add(new StockPrice
+                    {
+                        Date = date,
+                        ClosePrice = closePrice,
+                        OpenPrice = ParseOptionalDecimal(entry.Value, "1. open"),
+                        HighPrice = ParseOptionalDecimal(entry.Value, "2. high"),
+                        LowPrice = ParseOptionalDecimal(entry.Value, "3. low"),
+                        Volume = ParseOptionalLong(entry.Value, "5. volume")
+                    });
                 }
                 else
                 {
@@ -81,5 +89,20 @@ namespace GatewayManager
             return stockPrices;
         }
 
+        // Open, high, low and volume are optional, a bar without them still has its close
+        private static decimal? ParseOptionalDecimal(Dictionary<string, string> values, string key)
+        {
+            return values.TryGetValue(key, out string valueStr) &&
+                decimal.TryParse(valueStr, NumberStyles.Any, CultureInfo.InvariantCulture, out decimal value)
+                ? value : null;
+        }
+
+        private static long? ParseOptionalLong(Dictionary<string, string> values, string key)
+        {
+            return values.TryGetValue(key, out string valueStr) &&
+                long.TryParse(valueStr, NumberStyles.Any, CultureInfo.InvariantCulture, out long value)
+                ? value : null;
+        }
+
     }
 }
\ No newline at end of file
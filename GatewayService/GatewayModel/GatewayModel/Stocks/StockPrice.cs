@@ -7,6 +7,10 @@ namespace GatewayModel.Stocks
     {
         public DateTime Date { get; set; }
         public decimal ClosePrice { get; set; }
+        public decimal? OpenPrice { get; set; }
+        public decimal? HighPrice { get; set; }
+        public decimal? LowPrice { get; set; }
+        public long? Volume { get; set; }
 
         public override string ToString()
         {
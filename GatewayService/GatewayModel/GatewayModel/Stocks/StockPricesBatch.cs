@@ -0,0 +1,14 @@
+﻿using System;
+using System.Collections.Generic;
+
+namespace GatewayModel.Stocks
+{
+    public class StockPricesBatch
+    {
+        // Close price per symbol for every symbol that could be priced
+        public Dictionary<string, decimal> Prices { get; set; } = new Dictionary<string, decimal>();
+
+        // Error message per symbol for every symbol that failed
+        public Dictionary<string, string> Errors { get; set; } = new Dictionary<string, string>();
+    }
+}